@@ -10,7 +10,8 @@ from flask import (
     abort,
     send_from_directory,
     send_file,
-    has_request_context
+    has_request_context,
+    Response
 )
 from flask_cors import CORS
 import os
@@ -21,13 +22,29 @@ import csv
 import io
 import re
 import json
-from functools import wraps
+import base64
+import hashlib
+import atexit
+import fcntl
+import shutil
+import mimetypes
+import time
+import threading
+import zlib
+from functools import lru_cache, wraps
+from concurrent.futures import ThreadPoolExecutor
 from itertools import count
+from collections import OrderedDict, deque
 from werkzeug.security import generate_password_hash, check_password_hash
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event as sa_event, text
+from sqlalchemy.exc import DisconnectionError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 from werkzeug.utils import secure_filename
+from werkzeug.http import http_date
+from werkzeug.security import safe_join
+from urllib.parse import quote
 from uuid import uuid4
 from io import BytesIO
 
@@ -37,15 +54,25 @@ try:
     from reportlab.lib.units import mm
     from reportlab.pdfbase import pdfmetrics
     from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+    from reportlab.pdfbase.pdfdoc import PDFDictionary, PDFName, PDFStream
     REPORTLAB_AVAILABLE = True
 except ImportError:
     REPORTLAB_AVAILABLE = False
 
+MODULE_IMPORT_STARTED = time.perf_counter()
+
 load_dotenv()
 
 app = Flask(__name__)
 CORS(app)
 
+
+@app.before_request
+def ensure_app_bootstrapped():
+    # bootstrap() を呼ばずに起動された場合も、最初のリクエストで初期化を済ませる
+    bootstrap()
+
+
 # 静的ファイルとテンプレートのパスを設定
 app.config['STATIC_FOLDER'] = 'static'
 app.config['TEMPLATES_FOLDER'] = 'templates'
@@ -56,20 +83,154 @@ PRIMARY_OWNER_PASSWORD = os.environ.get('PRIMARY_OWNER_PASSWORD', '1234')
 PRIMARY_OWNER_NAME = os.environ.get('PRIMARY_OWNER_NAME', '大田圭介')
 PRIMARY_OWNER_ROLE = os.environ.get('PRIMARY_OWNER_ROLE', 'admin')
 
-raw_database_url = os.environ['DATABASE_URL']
-parsed_url = urlparse(raw_database_url)
-query = parse_qs(parsed_url.query)
-if 'sslmode' not in query:
-    query['sslmode'] = ['require']
-parsed_url = parsed_url._replace(query=urlencode(query, doseq=True))
-DATABASE_URL = urlunparse(parsed_url)
 
-masked_netloc = parsed_url.netloc
-if parsed_url.password:
-    masked_netloc = masked_netloc.replace(parsed_url.password, '****')
-print(f"[startup] Using DATABASE_URL host={parsed_url.hostname} port={parsed_url.port} params={parsed_url.query}")
+def resolve_database_url() -> str:
+    """環境変数の DATABASE_URL に sslmode を補って返す"""
+    raw_database_url = os.environ['DATABASE_URL']
+    parsed_url = urlparse(raw_database_url)
+    query = parse_qs(parsed_url.query)
+    if 'sslmode' not in query:
+        query['sslmode'] = ['require']
+    parsed_url = parsed_url._replace(query=urlencode(query, doseq=True))
+    print(f"[startup] Using DATABASE_URL host={parsed_url.hostname} port={parsed_url.port} params={parsed_url.query}")
+    return urlunparse(parsed_url)
+
+
+# 接続プールの設定（環境変数で調整）
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '30'))
+DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', '1800'))
+# 返却からこの秒数以上経った接続だけ貸し出し前に疎通確認する（0 なら毎回確認）
+DB_PRE_PING_INTERVAL = float(os.environ.get('DB_PRE_PING_INTERVAL', '30'))
+# 0 なら statement_timeout を設定しない
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', '0'))
+
+DB_POOL_STATS = {
+    'connects': 0,
+    'checkouts': 0,
+    'pre_pings': 0,
+    'invalidated': 0,
+    'wait_seconds_total': 0.0,
+    'wait_seconds_max': 0.0,
+    'timeouts': 0,
+    'connect_errors': 0
+}
+
+
+class MeasuredQueuePool(QueuePool):
+    """貸し出しの待ち時間を計測する QueuePool"""
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_STATS['timeouts'] += 1
+            raise
+        except Exception:
+            # 新しい接続の確立・認証の失敗などは待ち時間の指標と分けて数える
+            DB_POOL_STATS['connect_errors'] += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            DB_POOL_STATS['wait_seconds_total'] += waited
+            DB_POOL_STATS['wait_seconds_max'] = max(DB_POOL_STATS['wait_seconds_max'], waited)
+
+
+def on_db_connect(dbapi_connection, connection_record):
+    DB_POOL_STATS['connects'] += 1
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f'set statement_timeout = {DB_STATEMENT_TIMEOUT_MS}')
+        finally:
+            cursor.close()
+        dbapi_connection.commit()
+
+
+def on_db_checkin(dbapi_connection, connection_record):
+    connection_record.info['checked_in_at'] = time.monotonic()
+
+
+def on_db_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_STATS['checkouts'] += 1
+    checked_in_at = connection_record.info.get('checked_in_at')
+    if checked_in_at is None or time.monotonic() - checked_in_at < DB_PRE_PING_INTERVAL:
+        return
+    DB_POOL_STATS['pre_pings'] += 1
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute('select 1')
+    except Exception as exc:
+        # プールが接続を破棄して別の接続で再試行する
+        DB_POOL_STATS['invalidated'] += 1
+        raise DisconnectionError() from exc
+    finally:
+        cursor.close()
+
+
+ENGINE_STATE = {'engine': None}
+
+
+def get_engine():
+    """SQLAlchemy エンジン（初回利用時に生成する。import 時には DB に接続しない）"""
+    engine = ENGINE_STATE['engine']
+    if engine is None:
+        engine = create_engine(
+            resolve_database_url(),
+            poolclass=MeasuredQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE
+        )
+        sa_event.listen(engine, 'connect', on_db_connect)
+        sa_event.listen(engine, 'checkin', on_db_checkin)
+        sa_event.listen(engine, 'checkout', on_db_checkout)
+        ENGINE_STATE['engine'] = engine
+    return engine
+
+
+def reset_process_state_after_fork():
+    """--preload でフォークされたワーカーが親プロセスの接続やプロセス固有値を使い回さないようにする"""
+    global DATA_VERSION_EPOCH
+    engine = ENGINE_STATE['engine']
+    if engine is not None:
+        # 親の接続は閉じずに手放す（親側の接続を壊さないため）
+        engine.dispose(close=False)
+    USER_CACHE_LISTENER['conn'] = None
+    DATA_VERSION_EPOCH = uuid4().hex[:12]
+    # 書き込みスレッドはフォーク先に引き継がれないため、子プロセスで作り直させる
+    TRAINING_PROGRESS_STATE['thread'] = None
+    FINANCE_REPORT_STATE['executor'] = None
+    FINANCE_REPORT_JOBS.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_process_state_after_fork)
+
+
+def get_db_pool_stats() -> dict:
+    pool = get_engine().pool
+    capacity = DB_POOL_SIZE + max(DB_MAX_OVERFLOW, 0)
+    checkouts = DB_POOL_STATS['checkouts']
+    return {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'checked_out': pool.checkedout(),
+        'idle': pool.checkedin(),
+        'overflow': max(pool.overflow(), 0),
+        'saturation': round(pool.checkedout() / capacity, 3) if capacity else 0,
+        'connects': DB_POOL_STATS['connects'],
+        'checkouts': checkouts,
+        'pre_pings': DB_POOL_STATS['pre_pings'],
+        'invalidated': DB_POOL_STATS['invalidated'],
+        'timeouts': DB_POOL_STATS['timeouts'],
+        'connect_errors': DB_POOL_STATS['connect_errors'],
+        'wait_ms_avg': round(DB_POOL_STATS['wait_seconds_total'] * 1000 / checkouts, 3) if checkouts else 0,
+        'wait_ms_max': round(DB_POOL_STATS['wait_seconds_max'] * 1000, 3)
+    }
 
 
 ROLE_LABELS = {
@@ -134,6 +295,16 @@ COMMENT_ID_COUNTER = count(1)
 PROJECT_VIDEO_ITEMS = {}
 PROJECT_COMMENTS = {}
 PROJECT_STATUS_HISTORY = {}
+PROJECT_STATUS_HISTORY_REVISIONS: dict[int, int] = {}
+# タスク・案件・ステータス履歴のいずれかが変わるたびに進むデータ版数（ETag の元）
+DATA_VERSION = 0
+# 版数はワーカープロセスごとに独立しているため、外部へ渡す版数・ETag にはプロセス固有の値を含める
+DATA_VERSION_EPOCH = uuid4().hex[:12]
+# 版数ごとの変更（('task' | 'project', id)）の直近分。古いものから捨てる
+DATA_CHANGE_LOG_LIMIT = 2000
+DATA_CHANGE_LOG: deque = deque()
+# この版数以降からの差分であれば変更ログから返せる
+DATA_CHANGE_LOG_FLOOR = 0
 
 MAX_PROJECT_STATUS_TIMELINE_DAYS = 180
 STATUS_HISTORY_DEFAULT_ACTOR = 'システム'
@@ -234,6 +405,215 @@ FINANCE_PAYOUTS = [
 FINANCE_INVOICE_ID_COUNTER = count(start=len(FINANCE_INVOICES) + 1)
 FINANCE_PAYOUT_ID_COUNTER = count(start=len(FINANCE_PAYOUTS) + 1)
 
+
+class FinanceLedger:
+    """請求・支払の一覧に、ステータス・月・案件・編集者ごとの累計を重ねる台帳
+
+    本体は従来どおり FINANCE_INVOICES / FINANCE_PAYOUTS に格納する。
+    追加・更新のたびに、その行が以前に寄与していた分を差し引いて新しい値を加えるため、
+    集計の読み出しは件数に依存しない。
+    """
+
+    def __init__(self, invoices: list[dict], payouts: list[dict]):
+        self.invoices = invoices
+        self.payouts = payouts
+        self.lock = threading.RLock()
+        self.version = 0
+        self._invoices_by_id: dict[int, dict] = {}
+        self._payouts_by_id: dict[int, dict] = {}
+        # 行ID → その行が累計に寄与しているキー（金額・ステータス・月・案件・編集者）
+        self._invoice_keys: dict[int, tuple] = {}
+        self._payout_keys: dict[int, tuple] = {}
+        # 行ごとの内容ハッシュの総和。プロセスや再起動をまたいでも同じ内容なら同じ値になる
+        self._row_digests: dict[tuple, int] = {}
+        self._content_digest = 0
+        self.rebuild()
+
+    @staticmethod
+    def _empty_bucket():
+        return {'count': 0, 'total': 0}
+
+    @staticmethod
+    def _apply(buckets: dict, key, amount: int, sign: int):
+        bucket = buckets.setdefault(key, FinanceLedger._empty_bucket())
+        bucket['count'] += sign
+        bucket['total'] += sign * amount
+        if bucket['count'] == 0:
+            buckets.pop(key, None)
+
+    @staticmethod
+    def _invoice_key(invoice: dict) -> tuple:
+        issue_date = str(invoice.get('issue_date') or '')
+        return (
+            invoice.get('amount', 0) or 0,
+            invoice.get('status'),
+            issue_date[:7] if len(issue_date) >= 7 else '',
+            invoice.get('project_name') or ''
+        )
+
+    @staticmethod
+    def _payout_key(payout: dict) -> tuple:
+        return (
+            payout.get('amount', 0) or 0,
+            payout.get('status'),
+            payout.get('project_name') or '',
+            payout.get('editor') or ''
+        )
+
+    def _set_row_digest(self, kind: str, row: dict):
+        row_key = (kind, row['id'])
+        payload = json.dumps(
+            [kind, row['id'], row.get('project_name'), row.get('amount'), row.get('issue_date'),
+             row.get('status'), row.get('editor')],
+            ensure_ascii=False, default=str
+        )
+        digest = int.from_bytes(hashlib.sha1(payload.encode('utf-8')).digest(), 'big')
+        self._content_digest = (self._content_digest - self._row_digests.get(row_key, 0) + digest) % (1 << 160)
+        self._row_digests[row_key] = digest
+
+    @property
+    def content_digest(self) -> str:
+        """請求・支払の内容から決まるハッシュ。行の追加・更新のたびに差分だけ更新する"""
+        with self.lock:
+            return f'{self._content_digest:040x}'
+
+    def _apply_invoice(self, key: tuple, sign: int):
+        amount, status, month, project = key
+        self.revenue += sign * amount
+        self._apply(self.invoice_by_status, status, amount, sign)
+        self._apply(self.invoice_by_month, month, amount, sign)
+        self._apply(self.invoice_by_project, project, amount, sign)
+
+    def _apply_payout(self, key: tuple, sign: int):
+        amount, status, project, editor = key
+        self.cost += sign * amount
+        self._apply(self.payout_by_status, status, amount, sign)
+        self._apply(self.payout_by_project, project, amount, sign)
+        self._apply(self.payout_by_editor, editor, amount, sign)
+
+    def rebuild(self):
+        with self.lock:
+            self.revenue = 0
+            self.cost = 0
+            self.invoice_by_status: dict = {}
+            self.invoice_by_month: dict = {}
+            self.invoice_by_project: dict = {}
+            self.payout_by_status: dict = {}
+            self.payout_by_project: dict = {}
+            self.payout_by_editor: dict = {}
+            self._invoices_by_id.clear()
+            self._payouts_by_id.clear()
+            self._invoice_keys.clear()
+            self._payout_keys.clear()
+            self._row_digests.clear()
+            self._content_digest = 0
+            for invoice in self.invoices:
+                self._invoices_by_id[invoice['id']] = invoice
+                self._invoice_keys[invoice['id']] = self._invoice_key(invoice)
+                self._apply_invoice(self._invoice_keys[invoice['id']], 1)
+                self._set_row_digest('invoice', invoice)
+            for payout in self.payouts:
+                self._payouts_by_id[payout['id']] = payout
+                self._payout_keys[payout['id']] = self._payout_key(payout)
+                self._apply_payout(self._payout_keys[payout['id']], 1)
+                self._set_row_digest('payout', payout)
+            self.version += 1
+
+    def get_invoice(self, invoice_id: int) -> dict | None:
+        return self._invoices_by_id.get(invoice_id)
+
+    def get_payout(self, payout_id: int) -> dict | None:
+        return self._payouts_by_id.get(payout_id)
+
+    def add_invoice(self, invoice: dict) -> dict:
+        with self.lock:
+            self.invoices.append(invoice)
+            self._invoices_by_id[invoice['id']] = invoice
+            self._invoice_keys[invoice['id']] = self._invoice_key(invoice)
+            self._apply_invoice(self._invoice_keys[invoice['id']], 1)
+            self._set_row_digest('invoice', invoice)
+            self.version += 1
+        return invoice
+
+    def update_invoice(self, invoice: dict, changes: dict) -> dict:
+        with self.lock:
+            self._apply_invoice(self._invoice_keys[invoice['id']], -1)
+            invoice.update(changes)
+            self._invoice_keys[invoice['id']] = self._invoice_key(invoice)
+            self._apply_invoice(self._invoice_keys[invoice['id']], 1)
+            self._set_row_digest('invoice', invoice)
+            self.version += 1
+        return invoice
+
+    def add_payout(self, payout: dict) -> dict:
+        with self.lock:
+            self.payouts.append(payout)
+            self._payouts_by_id[payout['id']] = payout
+            self._payout_keys[payout['id']] = self._payout_key(payout)
+            self._apply_payout(self._payout_keys[payout['id']], 1)
+            self._set_row_digest('payout', payout)
+            self.version += 1
+        return payout
+
+    def update_payout(self, payout: dict, changes: dict) -> dict:
+        with self.lock:
+            self._apply_payout(self._payout_keys[payout['id']], -1)
+            payout.update(changes)
+            self._payout_keys[payout['id']] = self._payout_key(payout)
+            self._apply_payout(self._payout_keys[payout['id']], 1)
+            self._set_row_digest('payout', payout)
+            self.version += 1
+        return payout
+
+    def summary(self) -> dict:
+        with self.lock:
+            revenue, cost = self.revenue, self.cost
+        profit = revenue - cost
+        return {
+            'total_revenue': revenue,
+            'total_cost': cost,
+            'profit': profit,
+            'profit_rate': round((profit / revenue * 100), 1) if revenue else 0
+        }
+
+    def status_breakdown(self, kind: str) -> dict:
+        """ステータス表示名 → 件数・合計。並びはステータス定義の順"""
+        if kind == 'invoice':
+            buckets, definitions = self.invoice_by_status, FINANCE_INVOICE_STATUS_DEFINITIONS
+        else:
+            buckets, definitions = self.payout_by_status, FINANCE_PAYOUT_STATUS_DEFINITIONS
+        with self.lock:
+            ordered = [value for value, _ in definitions if value in buckets]
+            ordered += [value for value in buckets if value not in ordered]
+            labels = dict(definitions)
+            return {labels.get(value, value): dict(buckets[value]) for value in ordered}
+
+    def breakdown(self, name: str) -> dict:
+        """invoice_by_month などの累計をキー順に複製して返す"""
+        with self.lock:
+            buckets = getattr(self, name)
+            return {key: dict(buckets[key]) for key in sorted(buckets)}
+
+    def has_attachment(self, kind: str, stored_name: str) -> bool:
+        """その保存名を添付として持つ請求・支払があるか"""
+        with self.lock:
+            rows = self.invoices if kind == 'invoice' else self.payouts
+            return any(row.get('attachment_path') == stored_name for row in rows)
+
+    def snapshot_rows(self, kind: str) -> list[dict]:
+        """現時点の行を浅く複製する。update_* は行を直接書き換えるため、参照のままでは描画中の編集が混ざる"""
+        with self.lock:
+            return [dict(row) for row in (self.invoices if kind == 'invoice' else self.payouts)]
+
+    @staticmethod
+    def iter_chunks(rows: list[dict], serialize, chunk_size: int):
+        """行を chunk_size 件ずつ serialize して返す。全件を一度に展開しない"""
+        for start in range(0, len(rows), chunk_size):
+            yield [serialize(row) for row in rows[start:start + chunk_size]]
+
+
+FINANCE_LEDGER = FinanceLedger(FINANCE_INVOICES, FINANCE_PAYOUTS)
+
 REPORT_PDF_FONT_NAME = 'HeiseiKakuGo-W5'
 REPORT_PDF_FONT_REGISTERED = False
 FINANCE_UPLOAD_BASE = os.path.join(BASE_DIR, 'uploads', 'finance')
@@ -244,6 +624,142 @@ os.makedirs(FINANCE_PAYOUT_UPLOAD_FOLDER, exist_ok=True)
 ALLOWED_FINANCE_ATTACHMENT_EXTENSIONS = {'.pdf'}
 
 
+# 内容アドレス方式のファイル置き場。同じ内容は sha256 ごとに1つだけ保存し、参照数で削除を判断する
+BLOB_STORE_FOLDER = os.path.join(BASE_DIR, 'uploads', 'blobs')
+BLOB_STORE_TMP_FOLDER = os.path.join(BLOB_STORE_FOLDER, 'tmp')
+os.makedirs(BLOB_STORE_TMP_FOLDER, exist_ok=True)
+BLOB_NAME_PATTERN = re.compile(r'^([0-9a-f]{64})(\.[0-9a-z]+)?$')
+BLOB_IO_CHUNK = 1024 * 1024
+
+
+def get_blob_path(digest: str) -> str:
+    return os.path.join(BLOB_STORE_FOLDER, digest[:2], digest)
+
+
+def parse_blob_name(name: str | None):
+    """'<sha256>.<拡張子>' 形式の保存名からダイジェストを取り出す。旧形式の名前は None"""
+    match = BLOB_NAME_PATTERN.match(name or '')
+    return match.group(1) if match else None
+
+
+def store_blob_file(tmp_path: str, digest: str, size: int, retained: bool = False) -> str:
+    """ハッシュ済みの一時ファイルを取り込み、参照数を1増やす
+
+    retained は参照元が DB に無いブロブ（収支の添付）の印で、起動時の数え直しと削除の対象から外す。
+    """
+    target = get_blob_path(digest)
+    try:
+        # 行ロックを持ったままファイルを置くことで、同時に走る release_blob との削除競合を防ぐ
+        with get_engine().begin() as conn:
+            conn.execute(
+                text(
+                    """
+                    insert into app.blobs (digest, size, refcount, retained)
+                    values (:digest, :size, 1, :retained)
+                    on conflict (digest) do update
+                    set refcount = app.blobs.refcount + 1, retained = app.blobs.retained or :retained
+                    """
+                ),
+                {'digest': digest, 'size': size, 'retained': retained}
+            )
+            if os.path.exists(target):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(tmp_path, target)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return digest
+
+
+def store_blob_stream(stream, retained: bool = False):
+    """ストリームをハッシュしながら一時ファイルへ書き出し、ブロブとして取り込む"""
+    tmp_path = os.path.join(BLOB_STORE_TMP_FOLDER, uuid4().hex)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, 'wb') as handle:
+            for block in iter(lambda: stream.read(BLOB_IO_CHUNK), b''):
+                handle.write(block)
+                digest.update(block)
+                size += len(block)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return store_blob_file(tmp_path, digest.hexdigest(), size, retained), size
+
+
+def release_blob(digest: str):
+    """参照数を1減らし、最後の参照が消えたらファイルも削除する"""
+    with get_engine().begin() as conn:
+        row = conn.execute(
+            text(
+                """
+                update app.blobs set refcount = refcount - 1
+                where digest = :digest
+                returning refcount
+                """
+            ),
+            {'digest': digest}
+        ).mappings().first()
+        if row is None or row['refcount'] > 0:
+            return
+        conn.execute(text("delete from app.blobs where digest = :digest"), {'digest': digest})
+        try:
+            os.remove(get_blob_path(digest))
+        except FileNotFoundError:
+            pass
+
+
+BLOB_ORPHAN_GRACE_HOURS = int(os.environ.get('BLOB_ORPHAN_GRACE_HOURS', '24'))
+
+
+def rebuild_blob_refcounts():
+    """参照数を保存済みの動画レコードから数え直し、参照のない古いブロブを削除する
+
+    起動時（gunicorn --preload ではワーカー起動前のマスター）に、動画の URL から数え直す。
+    収支の添付はプロセス内にしか記録が無く、他のインスタンスが参照中の場合もあるため、
+    retained のブロブは数え直さず削除もしない（収支データが永続化されるまでファイルは残す）。
+    別インスタンスが直前に保存した分を消さないよう、参照のないブロブは作成から一定時間たったものだけ削除する。
+    """
+    counts: dict[str, int] = {}
+    for row in fetch_all("select url from app.training_videos"):
+        file_path = get_training_video_file_path(row['url'])
+        digest = parse_blob_name(os.path.basename(file_path)) if file_path else None
+        if digest:
+            counts[digest] = counts.get(digest, 0) + 1
+
+    with get_engine().begin() as conn:
+        conn.execute(
+            text(
+                """
+                update app.blobs
+                set refcount = coalesce((cast(:counts as jsonb) ->> digest)::integer, 0)
+                where not retained
+                """
+            ),
+            {'counts': json.dumps(counts)}
+        )
+        orphans = conn.execute(
+            text(
+                """
+                delete from app.blobs
+                where not retained and refcount <= 0 and created_at < now() - make_interval(hours => :hours)
+                returning digest
+                """
+            ),
+            {'hours': BLOB_ORPHAN_GRACE_HOURS}
+        ).scalars().all()
+        # 行ロックを持ったまま消し、同時に走る store_blob_file が置いたファイルを消さないようにする
+        for digest in orphans:
+            try:
+                os.remove(get_blob_path(digest))
+            except FileNotFoundError:
+                pass
+
+
 def get_finance_upload_folder(kind: str):
     if kind == 'invoice':
         return FINANCE_INVOICE_UPLOAD_FOLDER
@@ -252,25 +768,30 @@ def get_finance_upload_folder(kind: str):
     return None
 
 
-def save_finance_attachment(file_storage, kind: str):
-    if not file_storage or not file_storage.filename:
-        return None, None
+def validate_finance_attachment(file_storage, kind: str) -> str | None:
+    extension = os.path.splitext(secure_filename(file_storage.filename))[1].lower()
+    if extension not in ALLOWED_FINANCE_ATTACHMENT_EXTENSIONS:
+        return 'PDFファイルのみアップロードできます。'
+    if not get_finance_upload_folder(kind):
+        return '保存先ディレクトリが見つかりません。'
+    return None
+
+
+def save_finance_attachment(file_storage):
+    """検証済みの添付をブロブとして保存する（参照が1つ増える）"""
     filename = secure_filename(file_storage.filename)
     extension = os.path.splitext(filename)[1].lower()
-    if extension not in ALLOWED_FINANCE_ATTACHMENT_EXTENSIONS:
-        raise ValueError('PDFファイルのみアップロードできます。')
-    folder = get_finance_upload_folder(kind)
-    if not folder:
-        raise ValueError('保存先ディレクトリが見つかりません。')
-    stored_name = f"{uuid4().hex}{extension}"
-    file_path = os.path.join(folder, stored_name)
-    file_storage.save(file_path)
-    return stored_name, filename
+    digest, _ = store_blob_stream(file_storage.stream, retained=True)
+    return f"{digest}{extension}", filename
 
 
 def delete_finance_attachment(kind: str, stored_name: str | None):
     if not stored_name:
         return
+    digest = parse_blob_name(stored_name)
+    if digest:
+        release_blob(digest)
+        return
     folder = get_finance_upload_folder(kind)
     if not folder:
         return
@@ -282,26 +803,60 @@ def delete_finance_attachment(kind: str, stored_name: str | None):
 EDITOR_SHARED_SETTINGS = {}
 
 
+def get_request_connection():
+    """リクエスト内で使い回す接続（自動コミット）。リクエスト外では None"""
+    if not has_request_context():
+        return None
+    conn = g.get('_db_conn')
+    if conn is None:
+        conn = get_engine().connect().execution_options(isolation_level='AUTOCOMMIT')
+        g._db_conn = conn
+    return conn
+
+
+@app.teardown_appcontext
+def release_request_connection(exc):
+    conn = g.pop('_db_conn', None)
+    if conn is not None:
+        conn.close()
+
+
 def fetch_one(query: str, **params):
-    with engine.connect() as conn:
+    conn = get_request_connection()
+    if conn is not None:
+        row = conn.execute(text(query), params).mappings().first()
+        return dict(row) if row else None
+    with get_engine().connect() as conn:
         result = conn.execute(text(query), params)
         row = result.mappings().first()
         return dict(row) if row else None
 
 
 def fetch_all(query: str, **params):
-    with engine.connect() as conn:
+    conn = get_request_connection()
+    if conn is not None:
+        return [dict(row) for row in conn.execute(text(query), params).mappings().all()]
+    with get_engine().connect() as conn:
         result = conn.execute(text(query), params)
         return [dict(row) for row in result.mappings().all()]
 
 
 def execute(query: str, **params):
-    with engine.begin() as conn:
+    conn = get_request_connection()
+    if conn is not None:
+        conn.execute(text(query), params)
+        return
+    with get_engine().begin() as conn:
         conn.execute(text(query), params)
 
 
-def ensure_tables():
-    statements = [
+SCHEMA_MIGRATION_LOCK_KEY = 727_001
+PRIMARY_OWNER_LOCK_KEY = 727_002
+TASK_REVISION_LOCK_KEY = 727_003
+# (バージョン, 名前, SQL のリスト) の順に適用する。適用済みのものは app.schema_migrations に記録される。
+# 既存環境でも安全に適用できるよう、DDL は if not exists で書くこと。
+SCHEMA_MIGRATIONS = [
+    (1, 'base tables', [
         """
         create schema if not exists app;
         """,
@@ -369,9 +924,240 @@ def ensure_tables():
         create index if not exists idx_training_video_progress_status
         on app.training_video_progress(status);
         """
-    ]
-    for statement in statements:
-        execute(statement)
+    ]),
+    (2, 'task storage', [
+        """
+        create sequence if not exists app.tasks_id_seq start with 20000;
+        """,
+        """
+        create sequence if not exists app.tasks_revision_seq;
+        """,
+        """
+        create table if not exists app.tasks (
+            id bigint primary key,
+            container_project_id integer,
+            project_id integer,
+            payload jsonb not null,
+            revision bigint not null default nextval('app.tasks_revision_seq'),
+            deleted boolean not null default false,
+            updated_at timestamp default now()
+        );
+        """,
+        """
+        create index if not exists idx_tasks_revision
+        on app.tasks(revision);
+        """,
+        """
+        create table if not exists app.task_history (
+            id bigserial primary key,
+            task_id bigint not null,
+            field varchar(100) not null,
+            old_value jsonb,
+            new_value jsonb,
+            actor varchar(255),
+            changed_at timestamp default now()
+        );
+        """,
+        """
+        create index if not exists idx_task_history_task
+        on app.task_history(task_id, id);
+        """
+    ]),
+    (3, 'default accounts and training videos', []),
+    (4, 'training video stats', [
+        """
+        create table if not exists app.training_video_stats (
+            video_id integer primary key references app.training_videos(id) on delete cascade,
+            total_viewers integer not null default 0,
+            completed_viewers integer not null default 0,
+            progress_sum bigint not null default 0,
+            progress_count integer not null default 0,
+            updated_at timestamp default now()
+        );
+        """,
+        """
+        create or replace function app.apply_training_video_stats() returns trigger
+        language plpgsql as $$
+        begin
+            -- 旧行の寄与を差し引き、新行の寄与を加算する
+            if tg_op in ('UPDATE', 'DELETE') then
+                update app.training_video_stats set
+                    total_viewers = total_viewers - (old.status <> '未視聴')::int,
+                    completed_viewers = completed_viewers - (old.status in ('視聴済', '完了'))::int,
+                    progress_sum = progress_sum - old.progress_percent,
+                    progress_count = progress_count - 1,
+                    updated_at = now()
+                where video_id = old.video_id;
+            end if;
+            if tg_op in ('INSERT', 'UPDATE') then
+                insert into app.training_video_stats as s
+                    (video_id, total_viewers, completed_viewers, progress_sum, progress_count)
+                values (
+                    new.video_id,
+                    (new.status <> '未視聴')::int,
+                    (new.status in ('視聴済', '完了'))::int,
+                    new.progress_percent,
+                    1
+                )
+                on conflict (video_id) do update set
+                    total_viewers = s.total_viewers + excluded.total_viewers,
+                    completed_viewers = s.completed_viewers + excluded.completed_viewers,
+                    progress_sum = s.progress_sum + excluded.progress_sum,
+                    progress_count = s.progress_count + excluded.progress_count,
+                    updated_at = now();
+            end if;
+            return null;
+        end;
+        $$;
+        """,
+        """
+        drop trigger if exists trg_training_video_stats on app.training_video_progress;
+        """,
+        """
+        create trigger trg_training_video_stats
+        after insert or update or delete on app.training_video_progress
+        for each row execute function app.apply_training_video_stats();
+        """,
+        """
+        insert into app.training_video_stats as s
+            (video_id, total_viewers, completed_viewers, progress_sum, progress_count)
+        select
+            video_id,
+            count(*) filter (where status <> '未視聴'),
+            count(*) filter (where status in ('視聴済', '完了')),
+            coalesce(sum(progress_percent), 0),
+            count(*)
+        from app.training_video_progress
+        group by video_id
+        on conflict (video_id) do update set
+            total_viewers = excluded.total_viewers,
+            completed_viewers = excluded.completed_viewers,
+            progress_sum = excluded.progress_sum,
+            progress_count = excluded.progress_count,
+            updated_at = now();
+        """
+    ]),
+    (5, 'training video keyset pagination', [
+        """
+        update app.training_videos set created_at = now() where created_at is null;
+        """,
+        """
+        alter table app.training_videos alter column created_at set not null;
+        """,
+        """
+        create index if not exists idx_training_videos_created
+        on app.training_videos(created_at desc, id desc);
+        """
+    ]),
+    (6, 'resumable training video uploads', [
+        """
+        create table if not exists app.training_video_uploads (
+            id varchar(32) primary key,
+            filename varchar(255) not null,
+            extension varchar(16) not null,
+            total_size bigint not null,
+            received_size bigint not null default 0,
+            sha256 varchar(64),
+            status varchar(20) not null default 'uploading',
+            video_id integer references app.training_videos(id) on delete set null,
+            created_by integer references app.users(id) on delete set null,
+            created_at timestamp default now(),
+            updated_at timestamp default now()
+        );
+        """,
+        """
+        create index if not exists idx_training_video_uploads_pending
+        on app.training_video_uploads(updated_at)
+        where status <> 'completed';
+        """
+    ]),
+    (7, 'content addressed blobs', [
+        """
+        create table if not exists app.blobs (
+            digest varchar(64) primary key,
+            size bigint not null,
+            refcount integer not null default 0,
+            created_at timestamp default now()
+        );
+        """
+    ]),
+    (8, 'retained blobs', [
+        """
+        alter table app.blobs add column if not exists retained boolean not null default false;
+        """
+    ]),
+]
+# スキーマ作成後に一度だけ流す初期データ（バージョン → 関数）
+SCHEMA_MIGRATION_SEEDS = {}
+
+
+def get_applied_schema_version(conn) -> int | None:
+    """適用済みの最新バージョン（管理テーブルが無ければ None）"""
+    exists = conn.execute(text("select to_regclass('app.schema_migrations') is not null")).scalar()
+    if not exists:
+        return None
+    return conn.execute(text("select coalesce(max(version), 0) from app.schema_migrations")).scalar()
+
+
+def run_schema_migrations() -> list[int]:
+    """未適用のマイグレーションを適用し、適用したバージョンを返す
+
+    最新なら1往復で戻る。未適用がある場合はアドバイザリロックを取り、
+    同時に起動した他のプロセスはロック解放後に再確認して何もせず戻る。
+    """
+    latest = SCHEMA_MIGRATIONS[-1][0]
+    with get_engine().connect() as conn:
+        current = get_applied_schema_version(conn)
+        conn.commit()
+        if current is not None and current >= latest:
+            return []
+
+        conn.execute(text("select pg_advisory_lock(:key)"), {'key': SCHEMA_MIGRATION_LOCK_KEY})
+        conn.commit()
+        applied = []
+        try:
+            conn.execute(text("create schema if not exists app"))
+            conn.execute(text(
+                """
+                create table if not exists app.schema_migrations (
+                    version integer primary key,
+                    name varchar(255) not null,
+                    applied_at timestamp default now()
+                )
+                """
+            ))
+            conn.commit()
+            current = get_applied_schema_version(conn) or 0
+            conn.commit()
+            for version, name, statements in SCHEMA_MIGRATIONS:
+                if version <= current:
+                    continue
+                seed = SCHEMA_MIGRATION_SEEDS.get(version)
+                record = text("insert into app.schema_migrations (version, name) values (:version, :name)")
+                with conn.begin():
+                    for statement in statements:
+                        conn.execute(text(statement))
+                    if not seed:
+                        conn.execute(record, {'version': version, 'name': name})
+                if seed:
+                    # 初期データの投入は別の接続で行うため、成功してから適用済みとして記録する。
+                    # 失敗した場合は記録されず、次回起動時に再実行される（seed は冪等にしておくこと）
+                    seed()
+                    with conn.begin():
+                        conn.execute(record, {'version': version, 'name': name})
+                applied.append(version)
+                print(f"[migrations] applied {version}: {name}")
+        finally:
+            # 失敗で中断したトランザクションを戻してから解放する。解放できなければ、
+            # セッションのロックを持ったままプールへ戻さないよう接続ごと破棄する
+            try:
+                conn.rollback()
+                conn.execute(text("select pg_advisory_unlock(:key)"), {'key': SCHEMA_MIGRATION_LOCK_KEY})
+                conn.commit()
+            except Exception:
+                app.logger.warning("Failed to release schema migration lock; discarding connection", exc_info=True)
+                conn.invalidate()
+        return applied
 
 
 def load_editor_shared_settings():
@@ -449,10 +1235,109 @@ def get_user_by_email(email: str):
     return fetch_one("select * from app.users where lower(email)=lower(:email)", email=email.strip())
 
 
+# ===== ユーザーキャッシュ =====
+# load_current_user が毎リクエスト users を引かないよう、ID単位で短時間キャッシュする。
+# 変更時は pg_notify で他ワーカーにも破棄を伝える（通知が届かない環境でも TTL で失効する）。
+USER_CACHE_TTL_SECONDS = float(os.environ.get('USER_CACHE_TTL_SECONDS', '60'))
+USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', '256'))
+USER_CACHE_CHANNEL = 'app_user_cache'
+USER_CACHE_LISTENER_RETRY_SECONDS = 30
+USER_CACHE: OrderedDict = OrderedDict()
+USER_CACHE_STATS = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0, 'notifications': 0}
+USER_CACHE_LISTENER = {'conn': None, 'pid': None, 'retry_at': 0.0}
+
+
 def get_user_by_id(user_id: int):
     if not user_id:
         return None
-    return fetch_one("select * from app.users where id=:id", id=user_id)
+    poll_user_cache_notifications()
+    now = time.monotonic()
+    cached = USER_CACHE.get(user_id)
+    if cached and cached[0] > now:
+        USER_CACHE.move_to_end(user_id)
+        USER_CACHE_STATS['hits'] += 1
+        return dict(cached[1]) if cached[1] else None
+    USER_CACHE_STATS['misses'] += 1
+    user = fetch_one("select * from app.users where id=:id", id=user_id)
+    USER_CACHE[user_id] = (now + USER_CACHE_TTL_SECONDS, user)
+    USER_CACHE.move_to_end(user_id)
+    while len(USER_CACHE) > USER_CACHE_MAX_ENTRIES:
+        USER_CACHE.popitem(last=False)
+        USER_CACHE_STATS['evictions'] += 1
+    return dict(user) if user else None
+
+
+def invalidate_user_cache(user_id: int | None = None, broadcast: bool = True):
+    """ユーザーキャッシュを破棄する（user_id 省略時は全件）。broadcast で他ワーカーにも通知"""
+    USER_CACHE_STATS['invalidations'] += 1
+    if user_id is None:
+        USER_CACHE.clear()
+    else:
+        USER_CACHE.pop(user_id, None)
+    if broadcast:
+        execute(
+            "select pg_notify(:channel, :payload)",
+            channel=USER_CACHE_CHANNEL,
+            payload='*' if user_id is None else str(user_id)
+        )
+
+
+def get_user_cache_listener():
+    """LISTEN 用の専用接続（プールから切り離し、ワーカープロセスごとに1本）"""
+    listener = USER_CACHE_LISTENER
+    if listener['conn'] is not None and listener['pid'] == os.getpid():
+        return listener['conn']
+    if time.monotonic() < listener['retry_at']:
+        return None
+    listener['conn'] = None
+    try:
+        raw = get_engine().raw_connection()
+        conn = raw.driver_connection
+        raw.detach()
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f'listen {USER_CACHE_CHANNEL}')
+    except Exception as exc:
+        print(f"[user-cache] LISTEN を開始できませんでした（TTL のみで失効します）: {exc}")
+        listener['retry_at'] = time.monotonic() + USER_CACHE_LISTENER_RETRY_SECONDS
+        return None
+    listener['conn'] = conn
+    listener['pid'] = os.getpid()
+    # 接続していなかった間の変更は分からないため、いったん全件破棄する
+    USER_CACHE.clear()
+    return conn
+
+
+def poll_user_cache_notifications():
+    """届いている破棄通知を反映する（ソケットに届いた分を読むだけで往復は発生しない）"""
+    conn = get_user_cache_listener()
+    if conn is None:
+        return
+    try:
+        conn.poll()
+    except Exception:
+        USER_CACHE_LISTENER['conn'] = None
+        USER_CACHE.clear()
+        return
+    while conn.notifies:
+        notification = conn.notifies.pop(0)
+        USER_CACHE_STATS['notifications'] += 1
+        if notification.payload == '*':
+            USER_CACHE.clear()
+        elif notification.payload.isdigit():
+            USER_CACHE.pop(int(notification.payload), None)
+
+
+def get_user_cache_stats() -> dict:
+    hits = USER_CACHE_STATS['hits']
+    misses = USER_CACHE_STATS['misses']
+    total = hits + misses
+    return {
+        **USER_CACHE_STATS,
+        'hit_rate': round(hits / total, 3) if total else 0,
+        'entries': len(USER_CACHE),
+        'listening': USER_CACHE_LISTENER['conn'] is not None
+    }
 
 
 def list_users():
@@ -471,7 +1356,10 @@ def create_user(name, email, role, password_hash, active):
         role=role,
         active=active
     )
-    return get_user_by_email(email)
+    user = get_user_by_email(email)
+    if user:
+        invalidate_user_cache(user['id'])
+    return user
 
 
 def create_editor_workspace_for_user(user):
@@ -565,8 +1453,6 @@ def ensure_default_users():
     if editor:
         create_editor_workspace_for_user(editor)
 
-    ensure_primary_owner_account()
-
 
 def ensure_primary_owner_account():
     owner_email = (PRIMARY_OWNER_EMAIL or '').strip().lower()
@@ -578,30 +1464,41 @@ def ensure_primary_owner_account():
         desired_role = 'admin'
 
     owner = get_user_by_email(owner_email)
-    password_hash_value = hash_password(PRIMARY_OWNER_PASSWORD or '1234')
+    owner_password = PRIMARY_OWNER_PASSWORD or '1234'
 
     if owner:
-        execute(
-            """
-            update app.users
-            set name = :name,
-                role = :role,
-                password_hash = :password_hash,
-                active = true
-            where id = :id
-            """,
-            name=PRIMARY_OWNER_NAME or owner.get('name') or 'オーナー',
-            role=desired_role,
-            password_hash=password_hash_value,
-            id=owner['id']
+        desired_name = PRIMARY_OWNER_NAME or owner.get('name') or 'オーナー'
+        # ハッシュ化は重いため、保存済みハッシュで照合できればそのまま使う
+        password_matches = bool(owner.get('password_hash')) and check_password_hash(owner['password_hash'], owner_password)
+        needs_update = not (
+            password_matches
+            and owner.get('name') == desired_name
+            and owner.get('role') == desired_role
+            and owner.get('active')
         )
-        owner = get_user_by_email(owner_email)
+        if needs_update:
+            execute(
+                """
+                update app.users
+                set name = :name,
+                    role = :role,
+                    password_hash = :password_hash,
+                    active = true
+                where id = :id
+                """,
+                name=desired_name,
+                role=desired_role,
+                password_hash=owner['password_hash'] if password_matches else hash_password(owner_password),
+                id=owner['id']
+            )
+            invalidate_user_cache(owner['id'])
+            owner = get_user_by_email(owner_email)
     else:
         owner = create_user(
             name=PRIMARY_OWNER_NAME or 'オーナー',
             email=owner_email,
             role=desired_role,
-            password_hash=password_hash_value,
+            password_hash=hash_password(owner_password),
             active=True
         )
 
@@ -635,7 +1532,7 @@ def ensure_default_training_videos():
     ]
 
     inserted_ids = []
-    with engine.begin() as conn:
+    with get_engine().begin() as conn:
         for video in default_videos:
             result = conn.execute(
                 text(
@@ -661,7 +1558,7 @@ def ensure_default_training_videos():
             {'status': '視聴済', 'progress_percent': 100},
             {'status': '視聴中', 'progress_percent': 45}
         ]
-        with engine.begin() as conn:
+        with get_engine().begin() as conn:
             for idx, sample in enumerate(progress_samples):
                 if idx >= len(inserted_ids):
                     break
@@ -687,10 +1584,26 @@ def ensure_default_training_videos():
                 )
 
 
-ensure_tables()
-load_editor_shared_settings()
-ensure_default_users()
-ensure_default_training_videos()
+def seed_default_data():
+    ensure_default_users()
+    ensure_default_training_videos()
+
+
+def sync_primary_owner_account():
+    """オーナーアカウントを環境変数に合わせる（同時起動した他プロセスが処理中なら任せる）"""
+    with get_engine().connect() as conn:
+        locked = conn.execute(text("select pg_try_advisory_lock(:key)"), {'key': PRIMARY_OWNER_LOCK_KEY}).scalar()
+        conn.commit()
+        if not locked:
+            return
+        try:
+            ensure_primary_owner_account()
+        finally:
+            conn.execute(text("select pg_advisory_unlock(:key)"), {'key': PRIMARY_OWNER_LOCK_KEY})
+            conn.commit()
+
+
+SCHEMA_MIGRATION_SEEDS[3] = seed_default_data
 
 # 認証/認可ユーティリティ
 
@@ -987,10 +1900,298 @@ SAMPLE_ASSETS = [
 CLIENT_FINAL_ASSET_KINDS = {'final', 'delivery', '納品', 'complete', 'final_cut'}
 CLIENT_PORTAL_PROFILES: dict[int, dict] = {}
 
-TASK_ID_COUNTER = count(20000)
 PROJECT_GANTT_TASKS: dict[int, list[dict]] = {}
 GENERAL_TASKS: list[dict] = []
-TASK_CACHE: list[dict] = []
+
+
+class ReadOnlyDict(dict):
+    """読み取り専用の dict（タスクスナップショット用）
+
+    JSON シリアライズやテンプレートからは通常の dict と同様に扱える。
+    変更が必要な場合は copy() で通常の dict を取得する。
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError('タスクのスナップショットは読み取り専用です')
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+
+    def copy(self):
+        return dict(self)
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+
+def freeze_task_value(value):
+    """dict / list を読み取り専用の ReadOnlyDict / tuple に再帰的に変換する"""
+    if isinstance(value, dict):
+        return ReadOnlyDict((key, freeze_task_value(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_task_value(item) for item in value)
+    return value
+
+
+class TaskDelta:
+    """1回の変更で挿入・更新・移動・削除されたタスクの記録"""
+
+    def __init__(self):
+        self.inserted: set[int] = set()
+        self.updated: set[int] = set()
+        self.moved: dict[int, tuple] = {}
+        self.deleted: set[int] = set()
+        self.containers: set = set()
+        self.project_ids: set[int] = set()
+
+    def __bool__(self):
+        return bool(self.inserted or self.updated or self.moved or self.deleted)
+
+    def task_ids(self) -> set[int]:
+        return self.inserted | self.updated | set(self.moved) | self.deleted
+
+
+def task_container_sort_key(container_key: int | None):
+    if container_key is None:
+        return lambda t: (t.get('due_date') or '', t.get('id'))
+    return lambda t: (t.get('order_index') or 9999, t.get('id'))
+
+
+class TaskStore:
+    """全タスクを保持し、ID・案件・担当者・ステータスの索引を維持するストア
+
+    タスク本体は従来どおり PROJECT_GANTT_TASKS（案件別リスト）と GENERAL_TASKS
+    （案件未割当リスト）に格納し、ストアはその上に索引を重ねる。
+    格納先リストのキーは案件IDで、GENERAL_TASKS は None で表す。
+    変更は TaskDelta に記録され、commit() で影響のあったリストの並び替えと
+    スナップショットの差し替えだけを行う。
+    """
+
+    def __init__(self, project_tasks: dict[int, list[dict]], general_tasks: list[dict]):
+        self.project_tasks = project_tasks
+        self.general_tasks = general_tasks
+        self._by_id: dict[int, dict] = {}
+        self._container_keys: dict[int, int | None] = {}
+        self._index_keys: dict[int, tuple] = {}
+        self._by_project: dict[int, set[int]] = {}
+        self._by_assignee: dict[str, set[int]] = {}
+        self._by_status: dict[str, set[int]] = {}
+        self._snapshots: dict[int, ReadOnlyDict] = {}
+        self._container_snapshots: dict = {}
+        self._snapshot: tuple | None = ()
+        self._pending = TaskDelta()
+        self._project_revisions: dict[int, int] = {}
+
+    def container(self, key: int | None) -> list[dict]:
+        if key is None:
+            return self.general_tasks
+        return self.project_tasks.setdefault(key, [])
+
+    def get(self, task_id: int) -> dict | None:
+        return self._by_id.get(task_id)
+
+    def get_with_container(self, task_id: int):
+        task = self._by_id.get(task_id)
+        if task is None:
+            return None, None
+        return task, self.container(self._container_keys[task_id])
+
+    def container_key(self, task_id: int) -> int | None:
+        return self._container_keys.get(task_id)
+
+    def add(self, task: dict, container_key: int | None = None) -> dict:
+        """タスクを格納先リストへ追加し索引に登録する"""
+        task_id = task['id']
+        if task_id in self._by_id:
+            self.remove(task_id)
+        self.container(container_key).append(task)
+        self._by_id[task_id] = task
+        self._container_keys[task_id] = container_key
+        self._index(task_id, self._keys_of(task))
+        delta = self._pending
+        if task_id in delta.deleted:
+            delta.deleted.discard(task_id)
+            delta.updated.add(task_id)
+        else:
+            delta.inserted.add(task_id)
+        delta.containers.add(container_key)
+        self._note_project(task.get('project_id'))
+        return task
+
+    def move(self, task: dict, container_key: int | None):
+        """タスクを別の格納先リストへ移動する"""
+        task_id = task['id']
+        if task_id not in self._by_id:
+            self.add(task, container_key)
+            return
+        current_key = self._container_keys[task_id]
+        if current_key == container_key:
+            return
+        self._detach(task_id, current_key)
+        self.container(container_key).append(task)
+        self._container_keys[task_id] = container_key
+        delta = self._pending
+        origin = delta.moved.get(task_id, (current_key, None))[0]
+        delta.moved[task_id] = (origin, container_key)
+        delta.containers.update((current_key, container_key))
+        self._note_project(current_key)
+        self._note_project(container_key)
+
+    def remove(self, task_id: int) -> dict | None:
+        task = self._by_id.get(task_id)
+        if task is None:
+            return None
+        container_key = self._container_keys.pop(task_id)
+        self._detach(task_id, container_key)
+        old_keys = self._unindex(task_id)
+        del self._by_id[task_id]
+        delta = self._pending
+        if task_id in delta.inserted:
+            delta.inserted.discard(task_id)
+        else:
+            delta.deleted.add(task_id)
+        delta.updated.discard(task_id)
+        delta.moved.pop(task_id, None)
+        delta.containers.add(container_key)
+        self._note_project(old_keys[0] if old_keys else None)
+        return task
+
+    def touch(self, task: dict):
+        """タスクの変更を記録し、案件・担当者・ステータスの索引を更新する"""
+        task_id = task['id']
+        delta = self._pending
+        if task_id not in delta.inserted:
+            delta.updated.add(task_id)
+        delta.containers.add(self._container_keys.get(task_id))
+        new_keys = self._keys_of(task)
+        self._note_project(new_keys[0])
+        if self._index_keys.get(task_id) == new_keys:
+            return
+        old_keys = self._unindex(task_id)
+        if old_keys:
+            self._note_project(old_keys[0])
+        self._index(task_id, new_keys)
+
+    def has_pending_changes(self) -> bool:
+        return bool(self._pending)
+
+    def commit(self) -> TaskDelta:
+        """記録済みの変更を反映し、その TaskDelta を返す
+
+        影響のあった格納先リストだけを並び替え、変更されたタスクだけ
+        スナップショットを作り直す。全体のスナップショットは次回の読み取りで組み立てる。
+        """
+        delta = self._pending
+        if not delta:
+            return delta
+        self._pending = TaskDelta()
+        for project_id in delta.project_ids:
+            self._project_revisions[project_id] = self._project_revisions.get(project_id, 0) + 1
+        snapshots = self._snapshots
+        for task_id in delta.deleted:
+            snapshots.pop(task_id, None)
+        for task_id in delta.inserted | delta.updated | set(delta.moved):
+            task = self._by_id.get(task_id)
+            if task is not None:
+                snapshots[task_id] = freeze_task_value(task)
+        for key in delta.containers:
+            container = self.container(key)
+            container.sort(key=task_container_sort_key(key))
+            self._container_snapshots[key] = tuple(snapshots[task['id']] for task in container)
+        self._snapshot = None
+        return delta
+
+    def project_revision(self, project_id: int) -> int:
+        """案件に属するタスクが変更されるたびに増えるリビジョン番号"""
+        return self._project_revisions.get(project_id, 0)
+
+    def tasks_for_project(self, project_id: int) -> list[dict]:
+        return [self._by_id[task_id] for task_id in self._by_project.get(project_id, ())]
+
+    def task_ids_for_project(self, project_id: int) -> set[int]:
+        return set(self._by_project.get(project_id, ()))
+
+    def general_tasks_for_project(self, project_id: int) -> list[dict]:
+        """案件IDを持つが GENERAL_TASKS に格納されているタスク"""
+        tasks = [
+            self._by_id[task_id]
+            for task_id in self._by_project.get(project_id, ())
+            if self._container_keys.get(task_id) is None
+        ]
+        return sorted(tasks, key=task_container_sort_key(None))
+
+    def tasks_for_assignee(self, assignee: str) -> list[dict]:
+        return [self._by_id[task_id] for task_id in self._by_assignee.get(assignee, ())]
+
+    def tasks_for_status(self, status: str) -> list[dict]:
+        return [self._by_id[task_id] for task_id in self._by_status.get(status, ())]
+
+    def snapshot(self) -> tuple:
+        """全タスクの読み取り専用スナップショット（案件ID順 + 未割当タスク）"""
+        if self._pending:
+            self.commit()
+        if self._snapshot is None:
+            ordered = []
+            project_keys = sorted(key for key in self._container_snapshots if key is not None)
+            for key in project_keys:
+                ordered.extend(self._container_snapshots[key])
+            ordered.extend(self._container_snapshots.get(None, ()))
+            self._snapshot = tuple(ordered)
+        return self._snapshot
+
+    def snapshot_for(self, task_id: int) -> ReadOnlyDict | None:
+        if self._pending:
+            self.commit()
+        return self._snapshots.get(task_id)
+
+    @staticmethod
+    def _keys_of(task: dict) -> tuple:
+        return (task.get('project_id'), task.get('assignee'), task.get('status'))
+
+    def _note_project(self, project_id):
+        if project_id is not None:
+            self._pending.project_ids.add(project_id)
+
+    def _detach(self, task_id: int, container_key: int | None):
+        container = self.container(container_key)
+        for position, existing in enumerate(container):
+            if existing.get('id') == task_id:
+                del container[position]
+                return
+
+    def _index(self, task_id: int, keys: tuple):
+        project_id, assignee, status = keys
+        if project_id is not None:
+            self._by_project.setdefault(project_id, set()).add(task_id)
+        if assignee:
+            self._by_assignee.setdefault(assignee, set()).add(task_id)
+        if status:
+            self._by_status.setdefault(status, set()).add(task_id)
+        self._index_keys[task_id] = keys
+
+    def _unindex(self, task_id: int) -> tuple | None:
+        keys = self._index_keys.pop(task_id, None)
+        if keys is None:
+            return None
+        for index, key in zip((self._by_project, self._by_assignee, self._by_status), keys):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.discard(task_id)
+                if not bucket:
+                    del index[key]
+        return keys
+
+
+TASK_STORE = TaskStore(PROJECT_GANTT_TASKS, GENERAL_TASKS)
 
 AUTO_STAGE_TEMPLATES = [
     {'key': 'plan', 'title': '企画・準備', 'duration': 4},
@@ -1011,6 +2212,11 @@ PROJECT_COLOR_PALETTE = [
     '#64748b',  # slate
 ]
 PROJECT_COLOR_ASSIGNMENTS: dict[int, list[str]] = {}
+AUTO_GANTT_MEMO: dict[int, tuple] = {}
+AUTO_GANTT_MEMO_STATS = {'hits': 0, 'misses': 0}
+PROJECT_SUMMARY_CACHE: dict[int, tuple] = {}
+PROJECT_SUMMARY_CACHE_STATS = {'hits': 0, 'misses': 0}
+PROJECT_SUMMARY_ASSEMBLED: dict = {}
 
 
 def ensure_client_portal_profile(user: dict | None):
@@ -1051,10 +2257,6 @@ def isoformat_date(date_obj):
     return date_obj.strftime('%Y-%m-%d')
 
 
-def next_task_id():
-    return next(TASK_ID_COUNTER)
-
-
 def ensure_project_color(company_id: int, project: dict) -> str:
     if project.get('color'):
         color = project['color']
@@ -1197,13 +2399,37 @@ def build_auto_gantt_tasks(project: dict, company_name: str, color: str):
     return auto_tasks
 
 
+def build_auto_gantt_fingerprint(project: dict, company_name: str, color: str) -> tuple:
+    """自動ガント生成結果を左右する項目の組（日付をまたぐと変わる）"""
+    return (
+        project.get('due_date'),
+        project.get('status'),
+        bool(project.get('delivered')),
+        project.get('video_axis', 'LONG'),
+        project.get('assignee', '未割当'),
+        project.get('name'),
+        color,
+        company_name,
+        datetime.now().date().isoformat()
+    )
+
+
 def initialize_project_gantt_tasks(project: dict, company_name: str, company_id: int):
     project_id = project['id']
     project.setdefault('company_id', company_id)
     project.setdefault('company_name', company_name)
     project_color = ensure_project_color(company_id, project)
     ensure_project_status_history(project)
-    project_tasks = PROJECT_GANTT_TASKS.setdefault(project_id, [])
+
+    # 生成条件が同じで、前回生成後にタスクが変更されていなければ再生成しない
+    fingerprint = build_auto_gantt_fingerprint(project, company_name, project_color)
+    memo = AUTO_GANTT_MEMO.get(project_id)
+    if memo and memo == (fingerprint, TASK_STORE.project_revision(project_id)):
+        AUTO_GANTT_MEMO_STATS['hits'] += 1
+        return
+    AUTO_GANTT_MEMO_STATS['misses'] += 1
+
+    project_tasks = TASK_STORE.container(project_id)
     existing_auto = {task.get('auto_stage'): task for task in project_tasks if task.get('task_origin') == 'auto'}
     generated = build_auto_gantt_tasks(project, company_name, project_color)
 
@@ -1232,78 +2458,374 @@ def initialize_project_gantt_tasks(project: dict, company_name: str, company_id:
                 existing['actual_end'] = auto_task['actual_end']
             existing.setdefault('task_origin', 'auto')
             existing.setdefault('history', [])
+            TASK_STORE.touch(existing)
         else:
-            project_tasks.append(auto_task)
+            TASK_STORE.add(auto_task, project_id)
 
     project_tasks[:] = sorted(project_tasks, key=lambda t: (t.get('order_index') or 9999, t.get('id')))
+    apply_task_changes()
+    AUTO_GANTT_MEMO[project_id] = (fingerprint, TASK_STORE.project_revision(project_id))
 
 
-def rebuild_task_cache():
-    global TASK_CACHE
-    tasks = []
-    for project_id in sorted(PROJECT_GANTT_TASKS.keys()):
-        for task in PROJECT_GANTT_TASKS[project_id]:
-            tasks.append(copy.deepcopy(task))
-    tasks.extend(copy.deepcopy(GENERAL_TASKS))
-    TASK_CACHE = tasks
+def invalidate_auto_gantt_memo(project_id: int | None = None):
+    if project_id is None:
+        AUTO_GANTT_MEMO.clear()
+    else:
+        AUTO_GANTT_MEMO.pop(project_id, None)
 
 
-def get_all_tasks():
-    if not TASK_CACHE:
-        rebuild_task_cache()
-    return copy.deepcopy(TASK_CACHE)
+def get_auto_gantt_memo_stats() -> dict:
+    hits = AUTO_GANTT_MEMO_STATS['hits']
+    misses = AUTO_GANTT_MEMO_STATS['misses']
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 3) if total else 0,
+        'entries': len(AUTO_GANTT_MEMO)
+    }
 
 
-def gather_project_tasks():
-    tasks = []
-    for project_id, project_tasks in PROJECT_GANTT_TASKS.items():
-        for task in project_tasks:
-            tasks.append(copy.deepcopy(task))
-    for task in GENERAL_TASKS:
-        tasks.append(copy.deepcopy(task))
-    return tasks
+def apply_task_changes(persist: bool = True) -> TaskDelta:
+    """記録済みのタスク変更をキャッシュと並び順へ反映し、DB へ書き込む
+
+    persist=False は DB から読み込んだ変更をキャッシュへ反映するときに使う。
+    """
+    delta = TASK_STORE.commit()
+    if persist:
+        persist_task_changes(delta)
+    if delta:
+        bump_data_version(task_ids=delta.task_ids(), project_ids=delta.project_ids)
+    return delta
+
+
+# ===== タスクの永続化（app.tasks / app.task_history） =====
+# 各ワーカーの TASK_STORE は app.tasks の読み取りキャッシュとして扱い、
+# 変更は revision の差分で取り込む。
+TASK_CACHE_REFRESH_SECONDS = float(os.environ.get('TASK_CACHE_REFRESH_SECONDS', '1.0'))
+TASK_PERSIST_IGNORED_FIELDS = {'history', 'auto_generated_at'}
+TASK_HISTORY_PENDING: list[tuple[int, dict]] = []
+TASK_DB_STATE = {
+    'revision': 0,
+    'synced_at': 0.0,
+    # タスクID → 最後に DB と一致していた内容の指紋（同じ内容の書き戻し・取り込みを省く）
+    'fingerprints': {}
+}
 
 
-def get_project_tasks(project_id: int):
-    tasks = PROJECT_GANTT_TASKS.get(project_id, [])
-    return copy.deepcopy(sorted(tasks, key=lambda t: (t.get('order_index') or 9999, t.get('id'))))
+def task_payload_for_db(task: dict) -> dict:
+    return {key: value for key, value in task.items() if key != 'history'}
 
 
-def find_task_with_container(task_id: int):
-    for project_id, tasks in PROJECT_GANTT_TASKS.items():
-        for task in tasks:
-            if task.get('id') == task_id:
-                return task, tasks
-    for task in GENERAL_TASKS:
-        if task.get('id') == task_id:
-            return task, GENERAL_TASKS
-    return None, None
+def task_fingerprint(payload: dict) -> str:
+    comparable = {key: value for key, value in payload.items() if key not in TASK_PERSIST_IGNORED_FIELDS}
+    return json.dumps(comparable, sort_keys=True, ensure_ascii=False, default=str)
 
 
-def initialize_all_project_tasks():
-    PROJECT_COLOR_ASSIGNMENTS.clear()
-    for company in SAMPLE_COMPANIES:
-        for project in company['projects']:
-            project.setdefault('company_id', company['id'])
-            initialize_project_gantt_tasks(project, company['name'], company['id'])
-    rebuild_task_cache()
+def persist_task_changes(delta: TaskDelta):
+    """TaskDelta の内容を app.tasks へ一括 upsert し、未保存の履歴を app.task_history へ書き込む
 
+    指紋の更新と未保存履歴の消し込みはコミット後に行い、失敗時は履歴を未保存に戻す。
+    """
+    fingerprints = TASK_DB_STATE['fingerprints']
+    saved_fingerprints = {}
+    rows = []
+    for task_id in delta.inserted | delta.updated | set(delta.moved):
+        task = TASK_STORE.get(task_id)
+        if task is None:
+            continue
+        payload = task_payload_for_db(task)
+        fingerprint = task_fingerprint(payload)
+        container_key = TASK_STORE.container_key(task_id)
+        if fingerprints.get(task_id) == (container_key, fingerprint):
+            continue
+        saved_fingerprints[task_id] = (container_key, fingerprint)
+        rows.append({
+            'id': task_id,
+            'container_project_id': container_key,
+            'project_id': task.get('project_id'),
+            'payload': payload
+        })
+    deleted_ids = sorted(delta.deleted)
+    pending_history = list(TASK_HISTORY_PENDING)
+    history_rows = [
+        {
+            'task_id': task_id,
+            'field': entry['field'],
+            'old_value': entry['old'],
+            'new_value': entry['new'],
+            'actor': entry['actor'],
+            'changed_at': entry['timestamp']
+        }
+        for task_id, entry in pending_history
+    ]
+    if not rows and not deleted_ids and not history_rows:
+        return
 
-def next_task_id():
-    return next(TASK_ID_COUNTER)
+    del TASK_HISTORY_PENDING[:len(pending_history)]
+    try:
+        write_task_changes(rows, deleted_ids, history_rows)
+    except Exception:
+        TASK_HISTORY_PENDING[:0] = pending_history
+        raise
+    fingerprints.update(saved_fingerprints)
+    for task_id in deleted_ids:
+        fingerprints.pop(task_id, None)
+
+
+def write_task_changes(rows: list[dict], deleted_ids: list[int], history_rows: list[dict]):
+    with get_engine().begin() as conn:
+        if rows or deleted_ids:
+            # revision はコミット順に振られないと、他のワーカーが
+            # 「revision > 取り込み済みの最大値」で読んだときに取りこぼす。
+            # 書き込み側をトランザクション単位のロックで直列化し、採番順とコミット順を揃える
+            conn.execute(text("select pg_advisory_xact_lock(:key)"), {'key': TASK_REVISION_LOCK_KEY})
+        if rows:
+            conn.execute(text(
+                """
+                insert into app.tasks (id, container_project_id, project_id, payload, revision, deleted, updated_at)
+                select r.id, r.container_project_id, r.project_id, r.payload,
+                       nextval('app.tasks_revision_seq'), false, now()
+                from jsonb_to_recordset(cast(:rows as jsonb))
+                    as r(id bigint, container_project_id integer, project_id integer, payload jsonb)
+                on conflict (id) do update set
+                    container_project_id = excluded.container_project_id,
+                    project_id = excluded.project_id,
+                    payload = excluded.payload,
+                    revision = excluded.revision,
+                    deleted = false,
+                    updated_at = now()
+                """
+            ), {'rows': json.dumps(rows, ensure_ascii=False, default=str)})
+        if deleted_ids:
+            conn.execute(text(
+                """
+                update app.tasks
+                set deleted = true, revision = nextval('app.tasks_revision_seq'), updated_at = now()
+                where id = any(:ids)
+                """
+            ), {'ids': deleted_ids})
+        if history_rows:
+            conn.execute(text(
+                """
+                insert into app.task_history (task_id, field, old_value, new_value, actor, changed_at)
+                select h.task_id, h.field, h.old_value, h.new_value, h.actor,
+                       to_timestamp(h.changed_at, 'YYYY-MM-DD HH24:MI')
+                from jsonb_to_recordset(cast(:rows as jsonb))
+                    as h(task_id bigint, field varchar, old_value jsonb, new_value jsonb, actor varchar, changed_at text)
+                """
+            ), {'rows': json.dumps(history_rows, ensure_ascii=False, default=str)})
 
 
-def next_asset_id():
-    return max([a['id'] for a in SAMPLE_ASSETS], default=0) + 1
+def load_task_histories(task_ids) -> dict[int, list[dict]]:
+    """タスクごとの履歴を新しい順で返す（id は古い順の連番）"""
+    task_ids = list(task_ids)
+    if not task_ids:
+        return {}
+    rows = fetch_all(
+        """
+        select task_id, field, old_value, new_value, actor, changed_at
+        from app.task_history
+        where task_id = any(:ids)
+        order by task_id, id
+        """,
+        ids=task_ids
+    )
+    histories: dict[int, list[dict]] = {}
+    for row in rows:
+        history = histories.setdefault(row['task_id'], [])
+        history.insert(0, {
+            'id': len(history) + 1,
+            'field': row['field'],
+            'old': row['old_value'],
+            'new': row['new_value'],
+            'actor': row['actor'],
+            'timestamp': serialize_datetime(row['changed_at'])
+        })
+    return histories
 
 
-def create_task_entry(
-    title: str,
-    task_type: str = 'EDIT',
-    status: str = '待機中',
-    assignee: str = 'テスト',
-    due_date: str = '',
-    priority: str = '中',
+def sync_tasks_from_db(force: bool = False):
+    """他のワーカーが書き込んだタスクの変更をキャッシュへ取り込む"""
+    now = time.monotonic()
+    if not force and now - TASK_DB_STATE['synced_at'] < TASK_CACHE_REFRESH_SECONDS:
+        return
+    TASK_DB_STATE['synced_at'] = now
+
+    rows = fetch_all(
+        """
+        select id, container_project_id, payload, revision, deleted
+        from app.tasks
+        where revision > :revision
+        order by revision
+        """,
+        revision=TASK_DB_STATE['revision']
+    )
+    if not rows:
+        return
+
+    fingerprints = TASK_DB_STATE['fingerprints']
+    changed = []
+    for row in rows:
+        TASK_DB_STATE['revision'] = max(TASK_DB_STATE['revision'], row['revision'])
+        task_id = row['id']
+        if row['deleted']:
+            fingerprints.pop(task_id, None)
+            TASK_STORE.remove(task_id)
+            continue
+        fingerprint = (row['container_project_id'], task_fingerprint(row['payload']))
+        if fingerprints.get(task_id) == fingerprint:
+            continue
+        fingerprints[task_id] = fingerprint
+        changed.append(row)
+
+    histories = load_task_histories(row['id'] for row in changed)
+    for row in changed:
+        task = TASK_STORE.get(row['id'])
+        if task is None:
+            task = dict(row['payload'])
+            task['history'] = histories.get(row['id'], [])
+            TASK_STORE.add(task, row['container_project_id'])
+            continue
+        task.clear()
+        task.update(row['payload'])
+        task['history'] = histories.get(row['id'], [])
+        if TASK_STORE.container_key(row['id']) != row['container_project_id']:
+            TASK_STORE.move(task, row['container_project_id'])
+        TASK_STORE.touch(task)
+    apply_task_changes(persist=False)
+
+
+def load_tasks_from_db():
+    """起動時に app.tasks の内容でタスクキャッシュを組み立てる"""
+    TASK_DB_STATE['revision'] = 0
+    TASK_DB_STATE['fingerprints'].clear()
+    TASK_DB_STATE['synced_at'] = 0.0
+    sync_tasks_from_db(force=True)
+
+
+@app.before_request
+def refresh_task_cache():
+    endpoint = request.endpoint or ''
+    if endpoint == 'static' or endpoint.startswith('static'):
+        return
+    # 更新系のリクエストは必ず最新の状態から始める
+    sync_tasks_from_db(force=request.method not in ('GET', 'HEAD', 'OPTIONS'))
+
+
+def bump_data_version(task_ids=(), project_ids=(), resync: bool = False) -> int:
+    """データ版数を進め、変更されたタスク・案件を変更ログへ記録する
+
+    変更対象を特定できない一括更新は resync=True とし、それ以前の版数からの差分取得を打ち切る。
+    """
+    global DATA_VERSION, DATA_CHANGE_LOG_FLOOR
+    DATA_VERSION += 1
+    if resync:
+        DATA_CHANGE_LOG.clear()
+        DATA_CHANGE_LOG_FLOOR = DATA_VERSION
+        return DATA_VERSION
+    for task_id in task_ids:
+        DATA_CHANGE_LOG.append((DATA_VERSION, 'task', task_id))
+    for project_id in project_ids:
+        DATA_CHANGE_LOG.append((DATA_VERSION, 'project', project_id))
+    while len(DATA_CHANGE_LOG) > DATA_CHANGE_LOG_LIMIT:
+        DATA_CHANGE_LOG_FLOOR = DATA_CHANGE_LOG.popleft()[0]
+    return DATA_VERSION
+
+
+def current_data_version() -> str:
+    """クライアントへ渡す版数（"<プロセス固有値>.<版数>"）"""
+    return f'{DATA_VERSION_EPOCH}.{DATA_VERSION}'
+
+
+def collect_data_changes(since_token: str):
+    """since より後の版数で変更されたタスクID・案件IDを返す（ログが足りなければ None）
+
+    別のワーカーが発行した版数や、再起動前の版数は None（再同期が必要）として扱う。
+    """
+    epoch, _, raw_version = (since_token or '').partition('.')
+    if epoch != DATA_VERSION_EPOCH or not raw_version.isdigit():
+        return None
+    since = int(raw_version)
+    if since < DATA_CHANGE_LOG_FLOOR or since > DATA_VERSION:
+        return None
+    task_ids: set[int] = set()
+    project_ids: set[int] = set()
+    for version, kind, item_id in reversed(DATA_CHANGE_LOG):
+        if version <= since:
+            break
+        if kind == 'task':
+            task_ids.add(item_id)
+        else:
+            project_ids.add(item_id)
+    return task_ids, project_ids
+
+
+def build_data_etag(*scope) -> str:
+    """現在のデータ版数と応答内容を左右する要素（ユーザー・クエリ等）から ETag を作る"""
+    raw = '|'.join(str(part) for part in (DATA_VERSION_EPOCH, DATA_VERSION, *scope))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def not_modified_response(etag: str):
+    """If-None-Match が現在の ETag と一致すれば 304 を返す（一致しなければ None）"""
+    if etag not in request.if_none_match:
+        return None
+    response = Response(status=304)
+    return with_data_etag(response, etag)
+
+
+def with_data_etag(response, etag: str):
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def get_all_tasks():
+    """全タスクの読み取り専用スナップショット（リクエスト間で共有）を返す"""
+    return TASK_STORE.snapshot()
+
+
+def gather_project_tasks():
+    return get_all_tasks()
+
+
+def get_project_tasks(project_id: int):
+    tasks = PROJECT_GANTT_TASKS.get(project_id, [])
+    return copy.deepcopy(sorted(tasks, key=lambda t: (t.get('order_index') or 9999, t.get('id'))))
+
+
+def find_task_with_container(task_id: int):
+    return TASK_STORE.get_with_container(task_id)
+
+
+def initialize_all_project_tasks():
+    PROJECT_COLOR_ASSIGNMENTS.clear()
+    invalidate_auto_gantt_memo()
+    invalidate_project_summary()
+    for company in SAMPLE_COMPANIES:
+        for project in company['projects']:
+            project.setdefault('company_id', company['id'])
+            initialize_project_gantt_tasks(project, company['name'], company['id'])
+    apply_task_changes()
+
+
+def next_task_id():
+    """タスクIDを DB のシーケンスから採番する（全ワーカーで一意）"""
+    return fetch_one("select nextval('app.tasks_id_seq') as id")['id']
+
+
+def next_asset_id():
+    return max([a['id'] for a in SAMPLE_ASSETS], default=0) + 1
+
+
+def create_task_entry(
+    title: str,
+    task_type: str = 'EDIT',
+    status: str = '待機中',
+    assignee: str = 'テスト',
+    due_date: str = '',
+    priority: str = '中',
     project=None,
     project_id: int = None,
     progress: int = 0,
@@ -1387,8 +2909,7 @@ TASK_DEPENDENCY_TYPES = {'FS', 'SS', 'FF', 'SF'}
 
 
 def find_task(task_id: int):
-    task, _ = find_task_with_container(task_id)
-    return task
+    return TASK_STORE.get(task_id)
 
 
 def record_task_history(task: dict, field: str, old_value, new_value, actor: str):
@@ -1403,6 +2924,7 @@ def record_task_history(task: dict, field: str, old_value, new_value, actor: str
         'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M')
     }
     task['history'].insert(0, entry)
+    TASK_HISTORY_PENDING.append((task['id'], entry))
 
 
 def update_task_metadata(task: dict, actor: str):
@@ -1438,6 +2960,8 @@ def record_project_status_change(project_id: int, new_status: str, actor: str =
         return
     actor = actor or STATUS_HISTORY_DEFAULT_ACTOR
     history = PROJECT_STATUS_HISTORY.setdefault(project_id, [])
+    PROJECT_STATUS_HISTORY_REVISIONS[project_id] = PROJECT_STATUS_HISTORY_REVISIONS.get(project_id, 0) + 1
+    bump_data_version(project_ids=(project_id,))
 
     if isinstance(changed_at, datetime):
         timestamp_dt = changed_at
@@ -1750,6 +3274,35 @@ def serialize_gantt_task(task: dict):
     }
 
 
+GANTT_TASK_FIELDS = (
+    'id', 'name', 'title', 'project_id', 'project_name', 'company_name', 'auto_stage',
+    'assignee', 'status', 'priority', 'type', 'progress', 'plan_start', 'plan_end',
+    'actual_start', 'actual_end', 'due_date', 'order_index', 'dependencies',
+    'dependencies_string', 'notes', 'updated_at', 'updated_by', 'created_by',
+    'history', 'task_origin'
+)
+GANTT_TASKS_DEFAULT_LIMIT = 200
+GANTT_TASKS_MAX_LIMIT = 1000
+
+
+def parse_gantt_task_fields(raw: str | None):
+    """fields パラメータを解釈する（未指定なら空タプル＝全項目、不正な項目を含む場合は None）"""
+    if not raw:
+        return ()
+    fields = [part.strip() for part in raw.split(',') if part.strip()]
+    if any(field not in GANTT_TASK_FIELDS for field in fields):
+        return None
+    if 'id' not in fields:
+        fields.insert(0, 'id')
+    return tuple(fields)
+
+
+def project_gantt_task_fields(payload: dict, fields: tuple) -> dict:
+    if not fields:
+        return payload
+    return {field: payload[field] for field in fields if field in payload}
+
+
 def filter_tasks_for_user(tasks: list, current_user: dict):
     if not current_user:
         return []
@@ -1821,8 +3374,9 @@ def collect_task_filters(tasks: list):
     }
 
 
-def summarize_projects_for_gantt() -> list[dict]:
-    summary = []
+def build_project_gantt_summary_entry(project: dict, company: dict) -> dict:
+    """案件1件分のガント用サマリ（フェーズ・期間・ステータス推移）を生成する"""
+    project_id = project['id']
 
     def normalize_date(value):
         if not value:
@@ -1832,92 +3386,156 @@ def summarize_projects_for_gantt() -> list[dict]:
         except ValueError:
             return None
 
+    color = ensure_project_color(company['id'], project)
+    tasks = PROJECT_GANTT_TASKS.get(project_id, [])
+    manual_tasks = TASK_STORE.general_tasks_for_project(project_id)
+    combined = list(tasks) + manual_tasks
+
+    entry = {
+        'project_id': project_id,
+        'project_name': project.get('name'),
+        'company_name': company['name'],
+        'color': color,
+        'assignee': project.get('assignee', ''),
+        'phases': [],
+        'range': {'plan_start': None, 'plan_end': None, 'timeline_start': None, 'timeline_end': None}
+    }
+
+    ordered = sorted(
+        enumerate(combined),
+        key=lambda item: (item[1].get('order_index') or (item[0] + 1), item[1].get('plan_start') or '')
+    )
+    for index, (_, task) in enumerate(ordered):
+        plan_start = task.get('plan_start') or task.get('actual_start') or project.get('due_date') or task.get('due_date')
+        plan_end = task.get('plan_end') or task.get('actual_end') or project.get('due_date') or plan_start
+        actual_start = task.get('actual_start')
+        actual_end = task.get('actual_end') or (project.get('delivery_date') if task.get('status') == '完了' else '')
+
+        if not plan_start:
+            plan_start = datetime.now().strftime('%Y-%m-%d')
+        if not plan_end:
+            plan_end = plan_start
+
+        entry['phases'].append({
+            'title': task.get('title'),
+            'status': task.get('status'),
+            'plan_start': plan_start,
+            'plan_end': plan_end,
+            'actual_start': actual_start,
+            'actual_end': actual_end,
+            'origin': task.get('task_origin', 'manual'),
+            'auto_stage': task.get('auto_stage'),
+            'order_index': task.get('order_index') or (index + 1)
+        })
+
+        start_dt = normalize_date(plan_start) or normalize_date(actual_start)
+        end_dt = normalize_date(plan_end) or normalize_date(actual_end) or start_dt
+        if start_dt:
+            current_start = entry['range']['plan_start']
+            if current_start is None or start_dt < current_start:
+                entry['range']['plan_start'] = start_dt
+        if end_dt:
+            current_end = entry['range']['plan_end']
+            if current_end is None or end_dt > current_end:
+                entry['range']['plan_end'] = end_dt
+
+    timeline_info = build_project_status_timeline(project)
+    entry['status_timeline'] = timeline_info['segments']
+    entry['status_days'] = timeline_info['days']
+    entry['status_history'] = timeline_info['history']
+
+    timeline_start_dt = normalize_date(timeline_info['start'])
+    timeline_end_dt = normalize_date(timeline_info['end'])
+
+    if timeline_start_dt:
+        entry['range']['timeline_start'] = timeline_start_dt
+        current_start = entry['range']['plan_start']
+        if current_start is None or timeline_start_dt < current_start:
+            entry['range']['plan_start'] = timeline_start_dt
+    if timeline_end_dt:
+        entry['range']['timeline_end'] = timeline_end_dt
+        current_end = entry['range']['plan_end']
+        if current_end is None or timeline_end_dt > current_end:
+            entry['range']['plan_end'] = timeline_end_dt
+
+    if entry['range']['plan_start'] is not None:
+        entry['range']['plan_start'] = entry['range']['plan_start'].strftime('%Y-%m-%d')
+    if entry['range']['plan_end'] is not None:
+        entry['range']['plan_end'] = entry['range']['plan_end'].strftime('%Y-%m-%d')
+    if entry['range']['timeline_start'] is not None:
+        entry['range']['timeline_start'] = entry['range']['timeline_start'].strftime('%Y-%m-%d')
+    if entry['range']['timeline_end'] is not None:
+        entry['range']['timeline_end'] = entry['range']['timeline_end'].strftime('%Y-%m-%d')
+
+    return entry
+
+
+def build_project_summary_cache_key(project: dict, company: dict) -> tuple:
+    """サマリの再計算が必要かどうかを判定するキー（タスク・ステータス履歴・日付）"""
+    project_id = project['id']
+    return (
+        TASK_STORE.project_revision(project_id),
+        PROJECT_STATUS_HISTORY_REVISIONS.get(project_id, 0),
+        project.get('name'),
+        project.get('assignee', ''),
+        project.get('color'),
+        project.get('due_date'),
+        project.get('delivery_date'),
+        project.get('status'),
+        company['name'],
+        datetime.now().date().isoformat()
+    )
+
+
+def summarize_projects_for_gantt() -> list[dict]:
+    """全案件のガント用サマリを返す（案件単位でキャッシュし、変更分だけ再計算）
+
+    返すリストと各エントリはリクエスト間で共有されるため、呼び出し側で変更しないこと。
+    """
+    entry_keys = []
     for company in SAMPLE_COMPANIES:
-        company_id = company['id']
         for project in company['projects']:
             project_id = project['id']
-            initialize_project_gantt_tasks(project, company['name'], company_id)
-            color = ensure_project_color(company_id, project)
-            tasks = PROJECT_GANTT_TASKS.get(project_id, [])
-            manual_tasks = [task for task in GENERAL_TASKS if task.get('project_id') == project_id]
-            combined = list(tasks) + manual_tasks
-
-            entry = {
-                'project_id': project_id,
-                'project_name': project.get('name'),
-                'company_name': company['name'],
-                'color': color,
-                'assignee': project.get('assignee', ''),
-                'phases': [],
-                'range': {'plan_start': None, 'plan_end': None, 'timeline_start': None, 'timeline_end': None}
-            }
+            initialize_project_gantt_tasks(project, company['name'], company['id'])
+            cache_key = build_project_summary_cache_key(project, company)
+            cached = PROJECT_SUMMARY_CACHE.get(project_id)
+            if cached and cached[0] == cache_key:
+                PROJECT_SUMMARY_CACHE_STATS['hits'] += 1
+            else:
+                PROJECT_SUMMARY_CACHE_STATS['misses'] += 1
+                entry = build_project_gantt_summary_entry(project, company)
+                # 生成中に色やステータス履歴の初期値が補完されることがあるため、キーは生成後に取り直す
+                cache_key = build_project_summary_cache_key(project, company)
+                PROJECT_SUMMARY_CACHE[project_id] = (cache_key, entry)
+            entry_keys.append((project_id, cache_key))
+
+    entry_keys = tuple(entry_keys)
+    if PROJECT_SUMMARY_ASSEMBLED.get('keys') != entry_keys:
+        summary = [PROJECT_SUMMARY_CACHE[project_id][1] for project_id, _ in entry_keys]
+        summary.sort(key=lambda item: (item.get('company_name') or '', item.get('project_name') or ''))
+        PROJECT_SUMMARY_ASSEMBLED['keys'] = entry_keys
+        PROJECT_SUMMARY_ASSEMBLED['summary'] = summary
+    return PROJECT_SUMMARY_ASSEMBLED['summary']
+
+
+def invalidate_project_summary(project_id: int | None = None):
+    if project_id is None:
+        PROJECT_SUMMARY_CACHE.clear()
+    else:
+        PROJECT_SUMMARY_CACHE.pop(project_id, None)
+    PROJECT_SUMMARY_ASSEMBLED.clear()
+
 
-            for index, task in enumerate(sorted(combined, key=lambda t: (t.get('order_index') or (index + 1), t.get('plan_start') or ''))):
-                plan_start = task.get('plan_start') or task.get('actual_start') or project.get('due_date') or task.get('due_date')
-                plan_end = task.get('plan_end') or task.get('actual_end') or project.get('due_date') or plan_start
-                actual_start = task.get('actual_start')
-                actual_end = task.get('actual_end') or (project.get('delivery_date') if task.get('status') == '完了' else '')
-
-                if not plan_start:
-                    plan_start = datetime.now().strftime('%Y-%m-%d')
-                if not plan_end:
-                    plan_end = plan_start
-
-                entry['phases'].append({
-                    'title': task.get('title'),
-                    'status': task.get('status'),
-                    'plan_start': plan_start,
-                    'plan_end': plan_end,
-                    'actual_start': actual_start,
-                    'actual_end': actual_end,
-                    'origin': task.get('task_origin', 'manual'),
-                    'auto_stage': task.get('auto_stage'),
-                    'order_index': task.get('order_index') or (index + 1)
-                })
-
-                start_dt = normalize_date(plan_start) or normalize_date(actual_start)
-                end_dt = normalize_date(plan_end) or normalize_date(actual_end) or start_dt
-                if start_dt:
-                    current_start = entry['range']['plan_start']
-                    if current_start is None or start_dt < current_start:
-                        entry['range']['plan_start'] = start_dt
-                if end_dt:
-                    current_end = entry['range']['plan_end']
-                    if current_end is None or end_dt > current_end:
-                        entry['range']['plan_end'] = end_dt
-
-            timeline_info = build_project_status_timeline(project)
-            entry['status_timeline'] = timeline_info['segments']
-            entry['status_days'] = timeline_info['days']
-            entry['status_history'] = timeline_info['history']
-
-            timeline_start_dt = normalize_date(timeline_info['start'])
-            timeline_end_dt = normalize_date(timeline_info['end'])
-
-            if timeline_start_dt:
-                entry['range']['timeline_start'] = timeline_start_dt
-                current_start = entry['range']['plan_start']
-                if current_start is None or timeline_start_dt < current_start:
-                    entry['range']['plan_start'] = timeline_start_dt
-            if timeline_end_dt:
-                entry['range']['timeline_end'] = timeline_end_dt
-                current_end = entry['range']['plan_end']
-                if current_end is None or timeline_end_dt > current_end:
-                    entry['range']['plan_end'] = timeline_end_dt
-
-            if entry['range']['plan_start'] is not None:
-                entry['range']['plan_start'] = entry['range']['plan_start'].strftime('%Y-%m-%d')
-            if entry['range']['plan_end'] is not None:
-                entry['range']['plan_end'] = entry['range']['plan_end'].strftime('%Y-%m-%d')
-            if entry['range']['timeline_start'] is not None:
-                entry['range']['timeline_start'] = entry['range']['timeline_start'].strftime('%Y-%m-%d')
-            if entry['range']['timeline_end'] is not None:
-                entry['range']['timeline_end'] = entry['range']['timeline_end'].strftime('%Y-%m-%d')
-
-            summary.append(entry)
-
-    summary.sort(key=lambda item: (item.get('company_name') or '', item.get('project_name') or ''))
-    return summary
+def get_project_summary_cache_stats() -> dict:
+    hits = PROJECT_SUMMARY_CACHE_STATS['hits']
+    misses = PROJECT_SUMMARY_CACHE_STATS['misses']
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 3) if total else 0,
+        'entries': len(PROJECT_SUMMARY_CACHE)
+    }
 
 
 def parse_date_safe(value: str | None):
@@ -2292,19 +3910,27 @@ def dashboard_stats():
 @app.route('/api/projects')
 def api_projects():
     """案件一覧API"""
+    etag = build_data_etag('projects')
+    not_modified = not_modified_response(etag)
+    if not_modified:
+        return not_modified
     all_projects = get_all_projects()
-    return jsonify({
+    return with_data_etag(jsonify({
         'status': 'success',
         'data': all_projects
-    })
+    }), etag)
 
 @app.route('/api/companies')
 def api_companies():
     """会社一覧API"""
-    return jsonify({
+    etag = build_data_etag('companies')
+    not_modified = not_modified_response(etag)
+    if not_modified:
+        return not_modified
+    return with_data_etag(jsonify({
         'status': 'success',
         'data': SAMPLE_COMPANIES
-    })
+    }), etag)
 
 @app.route('/api/companies/<int:company_id>')
 def api_company_detail(company_id):
@@ -2342,6 +3968,7 @@ def api_create_company():
     
     # サンプルデータに追加（実際の実装ではデータベースに保存）
     SAMPLE_COMPANIES.append(new_company)
+    bump_data_version()
     
     # 専用管理ページのURLを生成
     management_url = f"/companies/{new_company['id']}"
@@ -2427,16 +4054,16 @@ def api_update_project(project_id):
 
     if company:
         initialize_project_gantt_tasks(project, company['name'], company['id'])
-        rebuild_task_cache()
     
     # 案件名が変更された場合、関連するタスクの案件名も更新
     if old_project_name and new_project_name != old_project_name:
         for task in PROJECT_GANTT_TASKS.get(project_id, []):
             task['project_name'] = new_project_name
-        for manual_task in GENERAL_TASKS:
-            if manual_task.get('project_id') == project_id:
-                manual_task['project_name'] = new_project_name
-        rebuild_task_cache()
+            TASK_STORE.touch(task)
+        for manual_task in TASK_STORE.general_tasks_for_project(project_id):
+            manual_task['project_name'] = new_project_name
+            TASK_STORE.touch(manual_task)
+    apply_task_changes()
     
     # 進捗を計算（納品済みなら100%）
     if project['delivered']:
@@ -2456,6 +4083,7 @@ def api_update_project(project_id):
 
     if previous_status != project.get('status'):
         record_project_status_change(project_id, project.get('status'), actor=actor)
+    bump_data_version(project_ids=(project_id,))
     
     return jsonify({
         'status': 'success',
@@ -2513,10 +4141,11 @@ def api_create_project():
     actor = g.current_user['name'] if g.current_user and g.current_user.get('name') else STATUS_HISTORY_DEFAULT_ACTOR
     record_project_status_change(new_project['id'], new_project.get('status', '進行中'), actor=actor)
     initialize_project_gantt_tasks(new_project, company['name'], company_id)
-    rebuild_task_cache()
+    apply_task_changes()
     global SAMPLE_PROJECTS, PROJECT_NAME_TO_ID
     SAMPLE_PROJECTS = get_all_projects()
     PROJECT_NAME_TO_ID = {project['name']: project['id'] for project in SAMPLE_PROJECTS}
+    bump_data_version(project_ids=(new_project['id'],))
     
     return jsonify({
         'status': 'success',
@@ -2577,7 +4206,8 @@ def api_toggle_delivered(project_id):
 
     if company:
         initialize_project_gantt_tasks(project, company['name'], company['id'])
-        rebuild_task_cache()
+        apply_task_changes()
+    bump_data_version(project_ids=(project_id,))
     
     return jsonify({
         'status': 'success',
@@ -2660,14 +4290,13 @@ def api_add_project_task(project_id):
         project_color=project.get('color'),
         origin='manual'
     )
-    project_tasks = PROJECT_GANTT_TASKS.setdefault(project_id, [])
+    project_tasks = TASK_STORE.container(project_id)
     if company_name:
         task['company_name'] = company_name
     if not task.get('order_index'):
         task['order_index'] = len(project_tasks) + 1
-    project_tasks.append(task)
-    project_tasks.sort(key=lambda t: (t.get('order_index') or 9999, t.get('id')))
-    rebuild_task_cache()
+    TASK_STORE.add(task, project_id)
+    apply_task_changes()
 
     return jsonify({'status': 'success', 'message': 'タスクを追加しました', 'data': task})
 
@@ -2829,10 +4458,14 @@ def tasks():
 @app.route('/api/tasks')
 def api_tasks():
     """タスク一覧API"""
-    return jsonify({
+    etag = build_data_etag('tasks')
+    not_modified = not_modified_response(etag)
+    if not_modified:
+        return not_modified
+    return with_data_etag(jsonify({
         'status': 'success',
         'data': get_all_tasks()
-    })
+    }), etag)
 
 @app.route('/api/tasks/<int:task_id>')
 def api_task_detail(task_id):
@@ -2850,7 +4483,19 @@ def api_task_detail(task_id):
 @app.route('/api/gantt/tasks')
 @login_required
 def api_gantt_tasks():
+    """ガント用タスク一覧API（カーソルページング・項目指定・重いセクションは include で指定）"""
     current_user = g.current_user
+    # サマリは当日の日付にも依存するため日付もキーに含める
+    etag = build_data_etag(
+        'gantt_tasks',
+        current_user.get('id'),
+        current_user.get('role'),
+        request.query_string.decode('utf-8', 'replace'),
+        datetime.now().date().isoformat()
+    )
+    not_modified = not_modified_response(etag)
+    if not_modified:
+        return not_modified
     base_tasks = gather_project_tasks()
     user_tasks = filter_tasks_for_user(base_tasks, current_user)
 
@@ -2863,35 +4508,123 @@ def api_gantt_tasks():
         'end_date': request.args.get('end_date'),
     }
 
-    filtered_tasks = filter_tasks_by_params(user_tasks, params)
+    limit = request.args.get('limit', GANTT_TASKS_DEFAULT_LIMIT, type=int)
+    if limit is None or limit < 1:
+        return jsonify({'status': 'error', 'message': 'limit は1以上の整数で指定してください'}), 400
+    limit = min(limit, GANTT_TASKS_MAX_LIMIT)
+
+    cursor = (request.args.get('cursor') or '').strip()
+    if cursor and not cursor.isdigit():
+        return jsonify({'status': 'error', 'message': 'cursor が不正です'}), 400
+    offset = int(cursor) if cursor else 0
+
+    fields = parse_gantt_task_fields(request.args.get('fields'))
+    if fields is None:
+        return jsonify({'status': 'error', 'message': '指定できない fields が含まれています'}), 400
+
+    include = {
+        part.strip()
+        for part in (request.args.get('include') or '').split(',')
+        if part.strip()
+    }
     include_history = request.args.get('include_history') == '1'
 
+    filtered_tasks = filter_tasks_by_params(user_tasks, params)
+    page_tasks = filtered_tasks[offset:offset + limit]
+    next_offset = offset + len(page_tasks)
+    next_cursor = str(next_offset) if next_offset < len(filtered_tasks) else None
+
     def serialize(task):
         payload = serialize_gantt_task(task)
         if not include_history:
             payload.pop('history', None)
         return payload
 
-    filters = collect_task_filters(user_tasks)
+    meta = {
+        'view': request.args.get('view', 'plan'),
+        'version': current_data_version(),
+        'total': len(filtered_tasks),
+        'limit': limit,
+        'cursor': cursor or None,
+        'next_cursor': next_cursor
+    }
+    if 'filters' in include:
+        meta['filters'] = collect_task_filters(user_tasks)
+    if 'projects_summary' in include:
+        meta['projects_summary'] = summarize_projects_for_gantt()
+
+    dumps = app.json.dumps
+
+    def generate():
+        # タスクは1件ずつ直列化して送り、全体を一度にメモリへ載せない
+        # （必要な値は事前に取得済みのため、リクエストコンテキストには依存しない）
+        yield '{"status": "success", "data": ['
+        for position, task in enumerate(page_tasks):
+            yield ('' if position == 0 else ', ') + dumps(project_gantt_task_fields(serialize(task), fields))
+        yield '], "meta": '
+        yield dumps(meta)[:-1]
+        if 'all_tasks' in include:
+            yield ', "all_tasks": ['
+            for position, task in enumerate(user_tasks):
+                yield ('' if position == 0 else ', ') + dumps(project_gantt_task_fields(serialize(task), fields))
+            yield ']'
+        yield '}}'
+
+    return with_data_etag(Response(generate(), mimetype='application/json'), etag)
+
+
+@app.route('/api/gantt/changes')
+@login_required
+def api_gantt_changes():
+    """ガント用差分API（since 以降に変更・削除されたタスクと、影響を受けた案件サマリを返す）"""
+    since = (request.args.get('since') or '').strip()
+    if not since:
+        return jsonify({'status': 'error', 'message': 'since を指定してください'}), 400
+
+    current_user = g.current_user
+    summary = summarize_projects_for_gantt()
+    version = current_data_version()
+    changes = collect_data_changes(since)
+    if changes is None:
+        return jsonify({'status': 'success', 'data': {'version': version, 'resync': True}})
+
+    task_ids, project_ids = changes
+    params = {
+        'project_id': request.args.get('project_id'),
+        'assignee': request.args.get('assignee'),
+        'status': request.args.get('status'),
+        'keyword': request.args.get('keyword'),
+        'start_date': request.args.get('start_date'),
+        'end_date': request.args.get('end_date'),
+    }
+
+    changed_tasks = [task for task in (TASK_STORE.snapshot_for(task_id) for task_id in task_ids) if task]
+    visible_tasks = filter_tasks_by_params(filter_tasks_for_user(changed_tasks, current_user), params)
+    visible_ids = {task['id'] for task in visible_tasks}
+    # 削除されたもの・表示対象から外れたものはクライアント側で取り除く
+    removed_ids = sorted(task_ids - visible_ids)
 
-    all_tasks_payload = [serialize_gantt_task(task) for task in user_tasks]
-    if not include_history:
-        for entry in all_tasks_payload:
-            entry.pop('history', None)
+    tasks_payload = []
+    for task in visible_tasks:
+        payload = serialize_gantt_task(task)
+        payload.pop('history', None)
+        tasks_payload.append(payload)
 
-    project_summary = summarize_projects_for_gantt()
+    data = {
+        'version': version,
+        'resync': False,
+        'tasks': tasks_payload,
+        'removed': removed_ids
+    }
+    if task_ids:
+        # 並び替えを反映できるよう、表示中タスクの並び順をIDだけで返す
+        user_tasks = filter_tasks_for_user(get_all_tasks(), current_user)
+        data['order'] = [task['id'] for task in filter_tasks_by_params(user_tasks, params)]
 
-    return jsonify({
-        'status': 'success',
-        'data': [serialize(task) for task in filtered_tasks],
-        'meta': {
-            'filters': filters,
-            'view': request.args.get('view', 'plan'),
-            'total': len(filtered_tasks),
-            'all_tasks': all_tasks_payload,
-            'projects_summary': project_summary
-        }
-    })
+    affected_projects = project_ids | {task.get('project_id') for task in changed_tasks if task.get('project_id')}
+    data['projects_summary'] = [entry for entry in summary if entry['project_id'] in affected_projects]
+
+    return jsonify({'status': 'success', 'data': data})
 
 
 @app.route('/api/gantt/tasks/<int:task_id>/history')
@@ -2925,14 +4658,12 @@ def api_gantt_reorder():
         record_task_history(task, 'order_index', task.get('order_index'), index, actor)
         task['order_index'] = index
         update_task_metadata(task, actor)
+        TASK_STORE.touch(task)
         updated.append(task_id)
         if container is not None:
             affected_containers.add(id(container))
 
-    for project_id, tasks in PROJECT_GANTT_TASKS.items():
-        tasks.sort(key=lambda t: (t.get('order_index') or 9999, t.get('id')))
-    GENERAL_TASKS.sort(key=lambda t: (t.get('due_date') or '', t.get('id')))
-    rebuild_task_cache()
+    apply_task_changes()
 
     return jsonify({
         'status': 'success',
@@ -2940,26 +4671,80 @@ def api_gantt_reorder():
         'data': {'updated_ids': updated}
     })
 
-@app.route('/api/tasks/<int:task_id>', methods=['PUT'])
-@login_required
-@role_required('admin', 'editor')
-def api_update_task(task_id):
-    """タスク更新API"""
-    data = request.get_json() or {}
-    task, container = find_task_with_container(task_id)
-    
-    if not task:
-        return jsonify({'status': 'error', 'message': 'タスクが見つかりません'}), 404
-    
-    actor = g.current_user['name'] if g.current_user else 'システム'
+TASK_UPDATABLE_FIELDS = [
+    'title', 'type', 'status', 'assignee', 'due_date', 'priority',
+    'progress', 'plan_start', 'plan_end', 'actual_start', 'actual_end',
+    'order_index', 'notes'
+]
+TASK_BATCH_MAX_ITEMS = 500
 
-    updatable_fields = [
-        'title', 'type', 'status', 'assignee', 'due_date', 'priority',
-        'progress', 'plan_start', 'plan_end', 'actual_start', 'actual_end',
-        'order_index', 'notes'
-    ]
 
-    for field in updatable_fields:
+def normalize_task_patch(task: dict, data: dict) -> tuple[dict, str | None]:
+    """案件ID・依存関係を検証して正規化したパッチの複製を返す（適用前に呼び、適用中に失敗しないようにする）"""
+    patch = dict(data)
+    if patch.get('project_id'):
+        try:
+            patch['project_id'] = int(patch['project_id'])
+        except (TypeError, ValueError):
+            return patch, '案件IDが不正です'
+    if 'dependencies' in patch:
+        deps_payload = patch['dependencies'] or []
+        if not isinstance(deps_payload, list):
+            return patch, '依存関係はリスト形式で指定してください'
+        normalized = []
+        for dep in deps_payload:
+            if isinstance(dep, dict):
+                dep_id = dep.get('task_id')
+                dep_type = str(dep.get('type') or 'FS').upper()
+            else:
+                dep_id = dep
+                dep_type = 'FS'
+            if not dep_id:
+                continue
+            try:
+                dep_id = int(dep_id)
+            except (TypeError, ValueError):
+                return patch, '依存タスクIDが不正です'
+            if dep_id == task['id']:
+                continue
+            if dep_type not in TASK_DEPENDENCY_TYPES:
+                dep_type = 'FS'
+            normalized.append({'task_id': dep_id, 'type': dep_type})
+        patch['dependencies'] = normalized
+    return patch, None
+
+
+def resolve_task_patch_project(task: dict, data: dict):
+    """パッチの案件変更先を解決する（(案件ID, 案件名, 会社名, 色), エラーメッセージ）"""
+    if 'project_id' not in data and 'project_name' not in data:
+        return None, None
+    new_project_id = data.get('project_id', task.get('project_id'))
+    new_project_name = data.get('project_name')
+    company_name = None
+    project_color = task.get('color')
+    if new_project_id:
+        project, company = find_project_by_id(int(new_project_id))
+        if not project:
+            return None, '対象の案件が見つかりません'
+        new_project_name = project.get('name')
+        company_name = company['name'] if company else None
+        company_id = company['id'] if company else project.get('company_id')
+        if company_id:
+            project_color = ensure_project_color(company_id, project)
+    elif new_project_name:
+        new_project_id = PROJECT_NAME_TO_ID.get(new_project_name)
+        if new_project_id:
+            project, company = find_project_by_id(new_project_id)
+            company_name = company['name'] if company else None
+            company_id = company['id'] if company else project.get('company_id')
+            if company_id and project:
+                project_color = ensure_project_color(company_id, project)
+    return (new_project_id, new_project_name, company_name, project_color), None
+
+
+def apply_task_patch(task: dict, container: list, data: dict, target_project, actor: str):
+    """normalize_task_patch 済みのパッチをタスクへ適用する（並び替え・キャッシュ反映は呼び出し側で行う）"""
+    for field in TASK_UPDATABLE_FIELDS:
         if field in data:
             value = data[field]
             if field == 'progress' and value is not None:
@@ -2975,45 +4760,18 @@ def api_update_task(task_id):
             record_task_history(task, field, task.get(field), value, actor)
             task[field] = value
 
-    if 'project_id' in data or 'project_name' in data:
-        new_project_id = data.get('project_id', task.get('project_id'))
-        new_project_name = data.get('project_name')
-        project = None
-        company_name = None
-        project_color = task.get('color')
-        if new_project_id:
-            project, company = find_project_by_id(int(new_project_id))
-            if not project:
-                return jsonify({'status': 'error', 'message': '対象の案件が見つかりません'}), 404
-            new_project_name = project.get('name')
-            company_name = company['name'] if company else None
-            company_id = company['id'] if company else project.get('company_id')
-            if company_id:
-                project_color = ensure_project_color(company_id, project)
-        elif new_project_name:
-            new_project_id = PROJECT_NAME_TO_ID.get(new_project_name)
-            if new_project_id:
-                project, company = find_project_by_id(new_project_id)
-                company_name = company['name'] if company else None
-                company_id = company['id'] if company else project.get('company_id')
-                if company_id and project:
-                    project_color = ensure_project_color(company_id, project)
+    if target_project is not None:
+        new_project_id, new_project_name, company_name, project_color = target_project
         record_task_history(task, 'project_id', task.get('project_id'), new_project_id, actor)
         record_task_history(task, 'project_name', task.get('project_name'), new_project_name, actor)
 
         if container is GENERAL_TASKS and new_project_id:
-            GENERAL_TASKS.remove(task)
-            container = PROJECT_GANTT_TASKS.setdefault(new_project_id, [])
             if not task.get('order_index'):
-                task['order_index'] = len(container) + 1
-            container.append(task)
+                task['order_index'] = len(TASK_STORE.container(new_project_id)) + 1
+            TASK_STORE.move(task, new_project_id)
         elif container is not GENERAL_TASKS and new_project_id and task.get('project_id') != new_project_id:
             # move between project lists
-            if container:
-                container.remove(task)
-            destination = PROJECT_GANTT_TASKS.setdefault(new_project_id, [])
-            destination.append(task)
-            container = destination
+            TASK_STORE.move(task, new_project_id)
 
         task['project_id'] = new_project_id
         task['project_name'] = new_project_name
@@ -3023,31 +4781,38 @@ def api_update_task(task_id):
             task['color'] = project_color
 
     if 'dependencies' in data:
-        deps_payload = data['dependencies'] or []
-        normalized = []
-        for dep in deps_payload:
-            if isinstance(dep, dict):
-                dep_id = dep.get('task_id')
-                dep_type = (dep.get('type') or 'FS').upper()
-            else:
-                dep_id = dep
-                dep_type = 'FS'
-            if not dep_id or dep_id == task_id:
-                continue
-            if dep_type not in TASK_DEPENDENCY_TYPES:
-                dep_type = 'FS'
-            normalized.append({'task_id': int(dep_id), 'type': dep_type})
+        normalized = data['dependencies']
         record_task_history(task, 'dependencies', task.get('dependencies', []), normalized, actor)
         task['dependencies'] = normalized
 
     update_task_metadata(task, actor)
     if task.get('task_origin') == 'auto':
         task['user_modified'] = True
+    TASK_STORE.touch(task)
+
+
+@app.route('/api/tasks/<int:task_id>', methods=['PUT'])
+@login_required
+@role_required('admin', 'editor')
+def api_update_task(task_id):
+    """タスク更新API"""
+    data = request.get_json() or {}
+    task, container = find_task_with_container(task_id)
+    
+    if not task:
+        return jsonify({'status': 'error', 'message': 'タスクが見つかりません'}), 404
+    
+    actor = g.current_user['name'] if g.current_user else 'システム'
 
-    for project_id, tasks in PROJECT_GANTT_TASKS.items():
-        tasks.sort(key=lambda t: (t.get('order_index') or 9999, t.get('id')))
-    GENERAL_TASKS.sort(key=lambda t: (t.get('due_date') or '', t.get('id')))
-    rebuild_task_cache()
+    data, error = normalize_task_patch(task, data)
+    if error:
+        return jsonify({'status': 'error', 'message': error}), 400
+    target_project, error = resolve_task_patch_project(task, data)
+    if error:
+        return jsonify({'status': 'error', 'message': error}), 404
+
+    apply_task_patch(task, container, data, target_project, actor)
+    apply_task_changes()
     
     return jsonify({
         'status': 'success',
@@ -3055,6 +4820,77 @@ def api_update_task(task_id):
         'data': task
     })
 
+
+@app.route('/api/tasks/batch', methods=['POST'])
+@login_required
+@role_required('admin', 'editor')
+def api_batch_update_tasks():
+    """タスク一括更新API（全件を検証してから適用し、1件でも不正なら何も変更しない）"""
+    data = request.get_json() or {}
+    patches = data.get('tasks')
+    if not isinstance(patches, list) or not patches:
+        return jsonify({'status': 'error', 'message': '更新するタスクを指定してください'}), 400
+    if len(patches) > TASK_BATCH_MAX_ITEMS:
+        return jsonify({'status': 'error', 'message': f'一度に更新できるタスクは{TASK_BATCH_MAX_ITEMS}件までです'}), 400
+
+    actor = g.current_user['name'] if g.current_user else 'システム'
+
+    prepared = []
+    results = []
+    seen_ids = set()
+    has_error = False
+    for patch in patches:
+        task_id = patch.get('id') if isinstance(patch, dict) else None
+        try:
+            task_id = int(task_id)
+        except (TypeError, ValueError):
+            results.append({'id': task_id, 'status': 'error', 'message': 'タスクIDが不正です'})
+            has_error = True
+            continue
+        if task_id in seen_ids:
+            results.append({'id': task_id, 'status': 'error', 'message': '同じタスクが複数回指定されています'})
+            has_error = True
+            continue
+        seen_ids.add(task_id)
+
+        task, container = find_task_with_container(task_id)
+        if not task:
+            results.append({'id': task_id, 'status': 'error', 'message': 'タスクが見つかりません'})
+            has_error = True
+            continue
+        patch, error = normalize_task_patch(task, patch)
+        if not error:
+            target_project, error = resolve_task_patch_project(task, patch)
+        if error:
+            results.append({'id': task_id, 'status': 'error', 'message': error})
+            has_error = True
+            continue
+        prepared.append((task, container, patch, target_project))
+        results.append({'id': task_id, 'status': 'success'})
+
+    if has_error:
+        for result in results:
+            if result['status'] == 'success':
+                result['status'] = 'skipped'
+        return jsonify({
+            'status': 'error',
+            'message': '更新できないタスクが含まれているため、変更は適用していません',
+            'data': results
+        }), 400
+
+    for task, container, patch, target_project in prepared:
+        apply_task_patch(task, container, patch, target_project, actor)
+    apply_task_changes()
+
+    for result, (task, _, _, _) in zip(results, prepared):
+        result['data'] = task
+
+    return jsonify({
+        'status': 'success',
+        'message': f'{len(prepared)}件のタスクを更新しました',
+        'data': results
+    })
+
 @app.route('/api/tasks', methods=['POST'])
 @login_required
 @role_required('admin', 'editor')
@@ -3111,16 +4947,15 @@ def api_create_task():
     )
 
     if project_id:
-        project_tasks = PROJECT_GANTT_TASKS.setdefault(project_id, [])
+        project_tasks = TASK_STORE.container(project_id)
         if project and project_id and company_name:
             new_task['company_name'] = company_name
         if not new_task.get('order_index'):
             new_task['order_index'] = len(project_tasks) + 1
-        project_tasks.append(new_task)
-        project_tasks.sort(key=lambda t: (t.get('order_index') or 9999, t.get('id')))
+        TASK_STORE.add(new_task, project_id)
     else:
-        GENERAL_TASKS.append(new_task)
-    rebuild_task_cache()
+        TASK_STORE.add(new_task)
+    apply_task_changes()
     
     return jsonify({
         'status': 'success',
@@ -3184,16 +5019,7 @@ def serialize_payout(payout: dict) -> dict:
 
 
 def calculate_finance_summary():
-    total_revenue = sum(invoice.get('amount', 0) or 0 for invoice in FINANCE_INVOICES)
-    total_cost = sum(payout.get('amount', 0) or 0 for payout in FINANCE_PAYOUTS)
-    profit = total_revenue - total_cost
-    profit_rate = round((profit / total_revenue * 100), 1) if total_revenue else 0
-    return {
-        'total_revenue': total_revenue,
-        'total_cost': total_cost,
-        'profit': profit,
-        'profit_rate': profit_rate
-    }
+    return FINANCE_LEDGER.summary()
 
 
 def ensure_reportlab_font():
@@ -3204,29 +5030,7 @@ def ensure_reportlab_font():
     REPORT_PDF_FONT_REGISTERED = True
 
 
-def gather_finance_report_data():
-    summary = calculate_finance_summary()
-    invoices = [serialize_invoice(invoice) for invoice in FINANCE_INVOICES]
-    payouts = [serialize_payout(payout) for payout in FINANCE_PAYOUTS]
-
-    invoice_by_status = {}
-    for invoice in invoices:
-        invoice_by_status.setdefault(invoice['status_label'], {
-            'count': 0,
-            'total': 0
-        })
-        invoice_by_status[invoice['status_label']]['count'] += 1
-        invoice_by_status[invoice['status_label']]['total'] += invoice['amount']
-
-    payout_by_status = {}
-    for payout in payouts:
-        payout_by_status.setdefault(payout['status_label'], {
-            'count': 0,
-            'total': 0
-        })
-        payout_by_status[payout['status_label']]['count'] += 1
-        payout_by_status[payout['status_label']]['total'] += payout['amount']
-
+def summarize_companies_for_report() -> list[dict]:
     companies_summary = []
     for company in SAMPLE_COMPANIES:
         projects = company.get('projects', [])
@@ -3238,13 +5042,32 @@ def gather_finance_report_data():
             'completed_count': completed,
             'in_progress_count': in_progress
         })
+    return companies_summary
+
+
+def gather_finance_report_data(ledger: FinanceLedger | None = None, companies_summary: list[dict] | None = None):
+    """レポート用の集計値と行の複製を取得する。serialize は描画時にチャンク単位で行う"""
+    ledger = ledger or FINANCE_LEDGER
+    if companies_summary is None:
+        companies_summary = summarize_companies_for_report()
+    with ledger.lock:
+        summary = ledger.summary()
+        invoice_rows = ledger.snapshot_rows('invoice')
+        payout_rows = ledger.snapshot_rows('payout')
+        invoice_by_status = ledger.status_breakdown('invoice')
+        payout_by_status = ledger.status_breakdown('payout')
+        breakdowns = {
+            name: ledger.breakdown(name)
+            for name in ('invoice_by_month', 'invoice_by_project', 'payout_by_project', 'payout_by_editor')
+        }
 
     return {
         'summary': summary,
-        'invoices': invoices,
-        'payouts': payouts,
+        'invoice_rows': invoice_rows,
+        'payout_rows': payout_rows,
         'invoice_by_status': invoice_by_status,
         'payout_by_status': payout_by_status,
+        **breakdowns,
         'companies_summary': companies_summary
     }
 
@@ -3255,108 +5078,270 @@ def format_currency(value: int | float | None) -> str:
     return f"¥{int(value):,}"
 
 
-def build_finance_report_pdf(report_data, generated_by: str | None = None) -> BytesIO:
+@lru_cache(maxsize=4096)
+def fit_report_text(text: str, width: float, size: float) -> tuple[str, float]:
+    """列幅に収まるよう末尾を省略した文字列と、その描画幅を返す"""
+    text_width = pdfmetrics.stringWidth(text, REPORT_PDF_FONT_NAME, size)
+    if text_width <= width:
+        return text, text_width
+    while text and text_width > width:
+        text = text[:-1]
+        text_width = pdfmetrics.stringWidth(text + '…', REPORT_PDF_FONT_NAME, size)
+    return text + '…', text_width
+
+
+class FinanceReportWriter:
+    """収支レポートのページ送り・見出し・表をまとめて描画する
+
+    表の行はチャンク単位で受け取り、その場でページに書き出す。
+    改ページ時は見出しと列ヘッダを繰り返し、各ページの下部にページ番号を入れる。
+    """
+
+    body_size = 11
+    table_size = 8.5
+
+    def __init__(self, output):
+        self.margin_x = 15 * mm
+        self.margin_top = 18 * mm
+        self.margin_bottom = 16 * mm
+        self.line_height = 7 * mm
+        self.row_height = 5.5 * mm
+        self.canvas = canvas.Canvas(output, pagesize=A4, pageCompression=1)
+        self.canvas.setTitle('収支レポート')
+        self.width, self.height = A4
+        self.page_number = 1
+        self.current_y = self.height - self.margin_top
+
+    def finish_page(self):
+        c = self.canvas
+        c.setFont(REPORT_PDF_FONT_NAME, 8)
+        c.drawCentredString(self.width / 2, self.margin_bottom / 2, f'- {self.page_number} -')
+        c.showPage()
+        self._compress_last_page()
+        self.page_number += 1
+        self.current_y = self.height - self.margin_top
+
+    def _compress_last_page(self):
+        # reportlab は保存時までページ内容を平文のまま持つため、確定したページはその場で圧縮しておく。
+        # canvas._doc.Pages.pages / PDFPage.stream は reportlab 4.0.x の内部属性なので、
+        # 見つからない版では何もせず保存時の通常の圧縮に任せる
+        pages = getattr(getattr(getattr(self.canvas, '_doc', None), 'Pages', None), 'pages', None)
+        if not pages:
+            return
+        page = pages[-1]
+        stream = getattr(page, 'stream', None)
+        if getattr(page, 'Contents', None) or not isinstance(stream, str) or not stream:
+            return
+        content = zlib.compress(stream.encode('utf-8'))
+        page.Contents = PDFStream(PDFDictionary({'Filter': PDFName('FlateDecode')}), content)
+        page.stream = None
+
+    def ensure_space(self, needed: float) -> bool:
+        """残りの高さが足りなければ改ページし、改ページしたかを返す"""
+        if self.current_y - needed < self.margin_bottom:
+            self.finish_page()
+            return True
+        return False
+
+    def heading(self, text: str, size: int = 14):
+        self.ensure_space(self.line_height * 2)
+        self.canvas.setFont(REPORT_PDF_FONT_NAME, size)
+        self.canvas.drawString(self.margin_x, self.current_y, text)
+        self.current_y -= self.line_height
+
+    def body(self, text: str, size: int | None = None):
+        self.ensure_space(self.line_height)
+        self.canvas.setFont(REPORT_PDF_FONT_NAME, size or self.body_size)
+        self.canvas.drawString(self.margin_x, self.current_y, text)
+        self.current_y -= self.line_height
+
+    def gap(self):
+        self.current_y -= self.line_height / 2
+
+    def _draw_cells(self, columns, values):
+        # セルごとに drawString すると毎回テキストオブジェクトが作られるため、1行を1つにまとめる
+        text_object = self.canvas.beginText()
+        text_object.setFont(REPORT_PDF_FONT_NAME, self.table_size)
+        x = self.margin_x
+        for (_, width_mm, align, _), value in zip(columns, values):
+            width = width_mm * mm
+            text, text_width = fit_report_text(value, width - 2 * mm, self.table_size)
+            offset = width - 1 * mm - text_width if align == 'right' else 1 * mm
+            text_object.setTextOrigin(x + offset, self.current_y)
+            text_object.textOut(text)
+            x += width
+        self.canvas.drawText(text_object)
+        self.current_y -= self.row_height
+
+    def _draw_table_header(self, columns):
+        c = self.canvas
+        total_width = sum(column[1] for column in columns) * mm
+        c.setFillGray(0.9)
+        c.rect(self.margin_x, self.current_y - 1.6 * mm, total_width, self.row_height, stroke=0, fill=1)
+        c.setFillGray(0)
+        c.setFont(REPORT_PDF_FONT_NAME, self.table_size)
+        self._draw_cells(columns, [column[0] for column in columns])
+
+    def table(self, title: str, columns, chunks, on_chunk=None):
+        """columns は (見出し, 幅mm, 'left'|'right', 値を取り出す関数) の並び。chunks は行のリストを順に返す"""
+        self.heading(title)
+        self.ensure_space(self.row_height * 2)
+        self._draw_table_header(columns)
+        drawn = 0
+        for chunk in chunks:
+            for row in chunk:
+                if self.ensure_space(self.row_height):
+                    self.heading(f'{title}（続き）', size=11)
+                    self._draw_table_header(columns)
+                self._draw_cells(columns, [getter(row) for _, _, _, getter in columns])
+                drawn += 1
+            if on_chunk:
+                on_chunk(len(chunk))
+        if not drawn:
+            self.canvas.setFont(REPORT_PDF_FONT_NAME, self.table_size)
+            self._draw_cells(columns[:1], ['データがありません。'])
+        self.gap()
+
+    def save(self):
+        self.finish_page()
+        self.canvas.save()
+
+
+FINANCE_REPORT_CHUNK_SIZE = int(os.environ.get('FINANCE_REPORT_CHUNK_SIZE', '500'))
+
+FINANCE_REPORT_INVOICE_COLUMNS = (
+    ('ID', 14, 'right', lambda row: str(row['id'])),
+    ('案件', 76, 'left', lambda row: row['project_name'] or '---'),
+    ('金額', 32, 'right', lambda row: format_currency(row['amount'])),
+    ('発行日', 26, 'left', lambda row: row['issue_date'] or '---'),
+    ('状態', 32, 'left', lambda row: row['status_label'])
+)
+FINANCE_REPORT_PAYOUT_COLUMNS = (
+    ('ID', 14, 'right', lambda row: str(row['id'])),
+    ('編集者', 40, 'left', lambda row: row['editor'] or '---'),
+    ('案件', 62, 'left', lambda row: row['project_name'] or '---'),
+    ('金額', 32, 'right', lambda row: format_currency(row['amount'])),
+    ('状態', 32, 'left', lambda row: row['status_label'])
+)
+
+
+def build_finance_report_pdf(report_data, generated_by: str | None = None, progress=None, output=None):
+    """収支レポートPDFを作る。請求・支払は全件をチャンク単位で描画する
+
+    output にファイルパスを渡すとそこへ直接書き出す。省略時は BytesIO を返す。
+    progress には描画済みの行数に応じて 0〜1 の進捗が渡される。
+    """
     ensure_reportlab_font()
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-    margin_x = 20 * mm
-    margin_y = 20 * mm
-    line_height = 7 * mm
-
-    def draw_heading(text, size=16, offset=0):
-        nonlocal current_y
-        c.setFont(REPORT_PDF_FONT_NAME, size)
-        c.drawString(margin_x, current_y + offset, text)
-
-    def draw_body(text, size=11):
-        nonlocal current_y
-        if current_y < margin_y:
-            c.showPage()
-            current_y = height - margin_y
-            c.setFont(REPORT_PDF_FONT_NAME, 11)
-        c.setFont(REPORT_PDF_FONT_NAME, size)
-        c.drawString(margin_x, current_y, text)
-        current_y -= line_height
-
-    current_y = height - margin_y
+    target = output if output is not None else BytesIO()
+    writer = FinanceReportWriter(target)
+    invoice_rows = report_data['invoice_rows']
+    payout_rows = report_data['payout_rows']
+    total_rows = len(invoice_rows) + len(payout_rows)
+    rendered = 0
+
+    def advance(count_rendered):
+        nonlocal rendered
+        rendered += count_rendered
+        if progress and total_rows:
+            progress(0.05 + 0.95 * rendered / total_rows)
 
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M')
-    draw_heading("案件管理システム 収支レポート", size=18)
-    current_y -= line_height
-    draw_body(f"作成日時: {timestamp}")
+    writer.heading("案件管理システム 収支レポート", size=18)
+    writer.current_y -= writer.line_height / 2
+    writer.body(f"作成日時: {timestamp}")
     if generated_by:
-        draw_body(f"作成者: {generated_by}")
-    current_y -= line_height / 2
+        writer.body(f"作成者: {generated_by}")
+    writer.gap()
 
     summary = report_data['summary']
-    draw_heading("サマリ", size=14)
-    current_y -= line_height
-    draw_body(f"総売上: {format_currency(summary['total_revenue'])}")
-    draw_body(f"総コスト: {format_currency(summary['total_cost'])}")
-    draw_body(f"粗利: {format_currency(summary['profit'])}")
-    draw_body(f"粗利率: {summary['profit_rate']}%")
-
-    current_y -= line_height / 2
-    draw_heading("請求ステータス別集計", size=14)
-    current_y -= line_height
-    invoice_stats = report_data['invoice_by_status']
-    if invoice_stats:
-        for label, stats in invoice_stats.items():
-            draw_body(f"{label}: 件数 {stats['count']}件 / 金額 {format_currency(stats['total'])}")
-    else:
-        draw_body("データがありません。")
-
-    current_y -= line_height / 2
-    draw_heading("支払ステータス別集計", size=14)
-    current_y -= line_height
-    payout_stats = report_data['payout_by_status']
-    if payout_stats:
-        for label, stats in payout_stats.items():
-            draw_body(f"{label}: 件数 {stats['count']}件 / 金額 {format_currency(stats['total'])}")
-    else:
-        draw_body("データがありません。")
+    writer.heading("サマリ")
+    writer.body(f"総売上: {format_currency(summary['total_revenue'])}")
+    writer.body(f"総コスト: {format_currency(summary['total_cost'])}")
+    writer.body(f"粗利: {format_currency(summary['profit'])}")
+    writer.body(f"粗利率: {summary['profit_rate']}%")
+    writer.body(f"請求 {len(invoice_rows):,}件 / 支払 {len(payout_rows):,}件")
+    writer.gap()
+
+    for title, key in (("請求ステータス別集計", 'invoice_by_status'), ("支払ステータス別集計", 'payout_by_status')):
+        writer.heading(title)
+        stats = report_data[key]
+        if stats:
+            for label, bucket in stats.items():
+                writer.body(f"{label}: 件数 {bucket['count']:,}件 / 金額 {format_currency(bucket['total'])}")
+        else:
+            writer.body("データがありません。")
+        writer.gap()
 
-    current_y -= line_height / 2
-    draw_heading("会社別案件サマリ", size=14)
-    current_y -= line_height
+    writer.heading("会社別案件サマリ")
     companies = report_data['companies_summary']
     if companies:
         for company in companies:
-            draw_body(
+            writer.body(
                 f"{company['name']}: 案件数 {company['project_count']}件 / 進行中 {company['in_progress_count']}件 / 完了 {company['completed_count']}件"
             )
     else:
-        draw_body("データがありません。")
-
-    current_y -= line_height / 2
-    draw_heading("最新請求一覧 (最大10件)", size=14)
-    current_y -= line_height
-    invoices = report_data['invoices'][:10]
-    if invoices:
-        for invoice in invoices:
-            draw_body(
-                f"{invoice['project_name']} | {format_currency(invoice['amount'])} | 発行日: {invoice['issue_date'] or '---'} | 状態: {invoice['status_label']}"
-            )
-    else:
-        draw_body("データがありません。")
-
-    current_y -= line_height / 2
-    draw_heading("最新支払一覧 (最大10件)", size=14)
-    current_y -= line_height
-    payouts = report_data['payouts'][:10]
-    if payouts:
-        for payout in payouts:
-            draw_body(
-                f"{payout['editor']} / {payout['project_name']} | {format_currency(payout['amount'])} | 状態: {payout['status_label']}"
-            )
-    else:
-        draw_body("データがありません。")
+        writer.body("データがありません。")
+    writer.gap()
+    if progress:
+        progress(0.05)
+
+    writer.table(
+        "月別請求",
+        (
+            ('月', 40, 'left', lambda item: item[0] or '日付なし'),
+            ('件数', 30, 'right', lambda item: f"{item[1]['count']:,}"),
+            ('請求額', 40, 'right', lambda item: format_currency(item[1]['total']))
+        ),
+        [list(report_data['invoice_by_month'].items())]
+    )
 
-    c.showPage()
-    c.save()
-    buffer.seek(0)
-    return buffer
+    invoice_by_project = report_data['invoice_by_project']
+    payout_by_project = report_data['payout_by_project']
+    empty_bucket = {'count': 0, 'total': 0}
+    project_rows = [
+        (name, invoice_by_project.get(name, empty_bucket)['total'], payout_by_project.get(name, empty_bucket)['total'])
+        for name in sorted(set(invoice_by_project) | set(payout_by_project))
+    ]
+    writer.table(
+        "案件別収支",
+        (
+            ('案件', 84, 'left', lambda item: item[0] or '---'),
+            ('請求額', 32, 'right', lambda item: format_currency(item[1])),
+            ('支払額', 32, 'right', lambda item: format_currency(item[2])),
+            ('粗利', 32, 'right', lambda item: format_currency(item[1] - item[2]))
+        ),
+        [project_rows]
+    )
+
+    writer.table(
+        "編集者別支払",
+        (
+            ('編集者', 84, 'left', lambda item: item[0] or '---'),
+            ('件数', 30, 'right', lambda item: f"{item[1]['count']:,}"),
+            ('支払額', 40, 'right', lambda item: format_currency(item[1]['total']))
+        ),
+        [list(report_data['payout_by_editor'].items())]
+    )
+
+    writer.table(
+        f"請求一覧（全{len(invoice_rows):,}件）",
+        FINANCE_REPORT_INVOICE_COLUMNS,
+        FinanceLedger.iter_chunks(invoice_rows, serialize_invoice, FINANCE_REPORT_CHUNK_SIZE),
+        on_chunk=advance
+    )
+    writer.table(
+        f"支払一覧（全{len(payout_rows):,}件）",
+        FINANCE_REPORT_PAYOUT_COLUMNS,
+        FinanceLedger.iter_chunks(payout_rows, serialize_payout, FINANCE_REPORT_CHUNK_SIZE),
+        on_chunk=advance
+    )
+
+    writer.save()
+    if progress:
+        progress(1)
+    if output is None:
+        target.seek(0)
+    return target
 
 
 def normalize_amount(value, field_label: str) -> int:
@@ -3456,6 +5441,23 @@ def is_multipart_request() -> bool:
     return 'multipart/form-data' in content_type
 
 
+def store_finance_attachment_payload(payload: dict, file_storage, existing: dict | None):
+    """検証が通った添付を保存して payload に反映する。古い添付の参照はレコード更新後に呼び出し側で外す"""
+    stored_name, original_name = save_finance_attachment(file_storage)
+    if existing and existing.get('attachment_path') == stored_name:
+        # 同じ内容の再アップロードは参照が二重になるので、今回増えた分を戻す
+        release_blob(parse_blob_name(stored_name))
+    payload['attachment_path'] = stored_name
+    payload['attachment_name'] = original_name
+    payload['input_source'] = 'pdf'
+
+
+def release_replaced_finance_attachment(kind: str, old_name: str | None, record: dict):
+    """更新で差し替わった古い添付の参照を外す"""
+    if old_name and record.get('attachment_path') != old_name:
+        delete_finance_attachment(kind, old_name)
+
+
 def extract_invoice_submission(existing_invoice: dict | None = None):
     if is_multipart_request():
         raw_data = request.form.to_dict()
@@ -3469,27 +5471,17 @@ def extract_invoice_submission(existing_invoice: dict | None = None):
     payload['attachment_path'] = existing_invoice.get('attachment_path', '') if existing_invoice else ''
     payload['attachment_name'] = existing_invoice.get('attachment_name', '') if existing_invoice else ''
 
+    # 添付の保存名はこのリクエストで保存したものか既存の値だけを使い、クライアントから受け取らない
     if is_multipart_request():
         file_storage = request.files.get('attachment')
         if file_storage and file_storage.filename:
-            try:
-                stored_name, original_name = save_finance_attachment(file_storage, 'invoice')
-                if existing_invoice and existing_invoice.get('attachment_path'):
-                    delete_finance_attachment('invoice', existing_invoice['attachment_path'])
-                payload['attachment_path'] = stored_name or ''
-                payload['attachment_name'] = original_name or ''
-                payload['input_source'] = 'pdf'
-            except ValueError as exc:
-                errors.append(str(exc))
+            attachment_error = validate_finance_attachment(file_storage, 'invoice')
+            if attachment_error:
+                errors.append(attachment_error)
+            elif not errors:
+                store_finance_attachment_payload(payload, file_storage, existing_invoice)
         elif not existing_invoice:
             errors.append('PDFファイルを選択してください。')
-    else:
-        attachment_path = raw_data.get('attachment_path')
-        attachment_name = raw_data.get('attachment_name')
-        if attachment_path:
-            payload['attachment_path'] = attachment_path
-        if attachment_name:
-            payload['attachment_name'] = attachment_name
     return payload, errors
 
 
@@ -3506,36 +5498,26 @@ def extract_payout_submission(existing_payout: dict | None = None):
     payload['attachment_path'] = existing_payout.get('attachment_path', '') if existing_payout else ''
     payload['attachment_name'] = existing_payout.get('attachment_name', '') if existing_payout else ''
 
+    # 添付の保存名はこのリクエストで保存したものか既存の値だけを使い、クライアントから受け取らない
     if is_multipart_request():
         file_storage = request.files.get('attachment')
         if file_storage and file_storage.filename:
-            try:
-                stored_name, original_name = save_finance_attachment(file_storage, 'payout')
-                if existing_payout and existing_payout.get('attachment_path'):
-                    delete_finance_attachment('payout', existing_payout['attachment_path'])
-                payload['attachment_path'] = stored_name or ''
-                payload['attachment_name'] = original_name or ''
-                payload['input_source'] = 'pdf'
-            except ValueError as exc:
-                errors.append(str(exc))
+            attachment_error = validate_finance_attachment(file_storage, 'payout')
+            if attachment_error:
+                errors.append(attachment_error)
+            elif not errors:
+                store_finance_attachment_payload(payload, file_storage, existing_payout)
         elif not existing_payout:
             errors.append('PDFファイルを選択してください。')
-    else:
-        attachment_path = raw_data.get('attachment_path')
-        attachment_name = raw_data.get('attachment_name')
-        if attachment_path:
-            payload['attachment_path'] = attachment_path
-        if attachment_name:
-            payload['attachment_name'] = attachment_name
     return payload, errors
 
 
 def get_invoice_by_id(invoice_id: int) -> dict | None:
-    return next((invoice for invoice in FINANCE_INVOICES if invoice['id'] == invoice_id), None)
+    return FINANCE_LEDGER.get_invoice(invoice_id)
 
 
 def get_payout_by_id(payout_id: int) -> dict | None:
-    return next((payout for payout in FINANCE_PAYOUTS if payout['id'] == payout_id), None)
+    return FINANCE_LEDGER.get_payout(payout_id)
 
 
 @app.route('/finance')
@@ -3562,8 +5544,11 @@ def finance():
 @role_required('admin')
 def download_finance_attachment(kind, filename):
     folder = get_finance_upload_folder(kind)
-    if not folder:
+    if not folder or not FINANCE_LEDGER.has_attachment(kind, filename):
         abort(404)
+    digest = parse_blob_name(filename)
+    if digest and os.path.isfile(get_blob_path(digest)):
+        return send_file(get_blob_path(digest), as_attachment=True, download_name=filename, mimetype='application/pdf')
     return send_from_directory(folder, filename, as_attachment=True)
 
 
@@ -3579,7 +5564,7 @@ def api_create_invoice():
         'id': get_next_invoice_id(),
         **payload
     }
-    FINANCE_INVOICES.append(invoice)
+    FINANCE_LEDGER.add_invoice(invoice)
     summary = calculate_finance_summary()
     return jsonify({
         'status': 'success',
@@ -3603,7 +5588,9 @@ def api_update_invoice(invoice_id):
     if errors:
         return jsonify({'status': 'error', 'message': ' / '.join(errors)}), 400
 
-    invoice.update(payload)
+    old_attachment = invoice.get('attachment_path')
+    FINANCE_LEDGER.update_invoice(invoice, payload)
+    release_replaced_finance_attachment('invoice', old_attachment, invoice)
     summary = calculate_finance_summary()
     return jsonify({
         'status': 'success',
@@ -3627,7 +5614,7 @@ def api_create_payout():
         'id': get_next_payout_id(),
         **payload
     }
-    FINANCE_PAYOUTS.append(payout)
+    FINANCE_LEDGER.add_payout(payout)
     summary = calculate_finance_summary()
     return jsonify({
         'status': 'success',
@@ -3651,7 +5638,9 @@ def api_update_payout(payout_id):
     if errors:
         return jsonify({'status': 'error', 'message': ' / '.join(errors)}), 400
 
-    payout.update(payload)
+    old_attachment = payout.get('attachment_path')
+    FINANCE_LEDGER.update_payout(payout, payload)
+    release_replaced_finance_attachment('payout', old_attachment, payout)
     summary = calculate_finance_summary()
     return jsonify({
         'status': 'success',
@@ -3663,6 +5652,255 @@ def api_update_payout(payout_id):
     })
 
 
+# 収支レポートPDFの非同期生成。生成済みPDFは収支データの内容ごとにディスクへ保存して使い回す
+FINANCE_REPORT_CACHE_FOLDER = os.path.join(BASE_DIR, 'uploads', 'reports', 'finance')
+os.makedirs(FINANCE_REPORT_CACHE_FOLDER, exist_ok=True)
+FINANCE_REPORT_CACHE_MAX_FILES = int(os.environ.get('FINANCE_REPORT_CACHE_MAX_FILES', '20'))
+FINANCE_REPORT_WORKERS = int(os.environ.get('FINANCE_REPORT_WORKERS', '1'))
+FINANCE_REPORT_JOB_TTL_SECONDS = int(os.environ.get('FINANCE_REPORT_JOB_TTL_SECONDS', '600'))
+FINANCE_REPORT_JOBS = {}
+FINANCE_REPORT_LOCK = threading.Lock()
+FINANCE_REPORT_STATE = {'executor': None}
+
+
+def get_finance_report_cache_key(generated_by: str | None, companies_summary: list[dict]) -> str:
+    """収支データの内容・会社別サマリ・作成者名から、キャッシュのキーを作る
+
+    タスク編集やプロセスごとに変わる値は含めないため、内容が同じならワーカーや再起動をまたいで同じキーになる。
+    描画データと食い違わないよう、FINANCE_LEDGER.lock を持ったまま呼ぶこと。
+    """
+    companies = json.dumps(companies_summary, ensure_ascii=False, sort_keys=True)
+    seed = f"{FINANCE_LEDGER.content_digest}:{companies}:{generated_by or ''}"
+    return hashlib.sha1(seed.encode('utf-8')).hexdigest()
+
+
+def get_finance_report_cache_path(cache_key: str) -> str:
+    return os.path.join(FINANCE_REPORT_CACHE_FOLDER, f'{cache_key}.pdf')
+
+
+def get_finance_report_status_path(cache_key: str) -> str:
+    return os.path.join(FINANCE_REPORT_CACHE_FOLDER, f'{cache_key}.json')
+
+
+def write_finance_report_status(job: dict):
+    """生成中・失敗したジョブの状態をキャッシュの隣に書き、別のワーカーに届いたポーリングにも返せるようにする"""
+    path = get_finance_report_status_path(job['id'])
+    tmp_path = f'{path}.{uuid4().hex}.tmp'
+    payload = {key: value.isoformat() if isinstance(value, datetime) else value for key, value in job.items()}
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(payload, handle, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        app.logger.warning("Failed to write finance report status: %s", job['id'])
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_finance_report_status(cache_key: str) -> dict | None:
+    path = get_finance_report_status_path(cache_key)
+    try:
+        updated_at = os.path.getmtime(path)
+        with open(path, encoding='utf-8') as handle:
+            job = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    # ワーカーが止まるなどして更新が途絶えた生成中のジョブは、無いものとして扱う
+    if job.get('status') in {'queued', 'running'} and time.time() - updated_at > FINANCE_REPORT_JOB_TTL_SECONDS:
+        return None
+    for key in ('created_at', 'started_at', 'finished_at'):
+        if job.get(key):
+            job[key] = datetime.fromisoformat(job[key])
+    return job
+
+
+def remove_finance_report_status(cache_key: str):
+    try:
+        os.remove(get_finance_report_status_path(cache_key))
+    except FileNotFoundError:
+        pass
+
+
+def prune_finance_report_cache():
+    """古いキャッシュから削除し、最大件数を超えないようにする"""
+    try:
+        entries = [
+            entry for entry in os.scandir(FINANCE_REPORT_CACHE_FOLDER)
+            if entry.is_file() and entry.name.endswith('.pdf')
+        ]
+    except FileNotFoundError:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in entries[FINANCE_REPORT_CACHE_MAX_FILES:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+    prune_finance_report_jobs()
+
+
+def prune_finance_report_jobs():
+    """終了したジョブを破棄する。完了分はキャッシュファイルから復元できる。失敗分は確認用に一定時間だけ残す"""
+    expires_before = datetime.now() - timedelta(seconds=FINANCE_REPORT_JOB_TTL_SECONDS)
+    with FINANCE_REPORT_LOCK:
+        for job_id, job in list(FINANCE_REPORT_JOBS.items()):
+            if job['status'] == 'done' or (
+                job['status'] == 'error' and job['finished_at'] and job['finished_at'] < expires_before
+            ):
+                FINANCE_REPORT_JOBS.pop(job_id, None)
+    # 状態ファイルも同じ期限で消す。生成中のものは進捗のたびに更新されるため対象にならない
+    try:
+        entries = [
+            entry for entry in os.scandir(FINANCE_REPORT_CACHE_FOLDER)
+            if entry.is_file() and entry.name.endswith('.json')
+        ]
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        try:
+            if datetime.fromtimestamp(entry.stat().st_mtime) < expires_before:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def write_finance_report_cache(cache_key: str, report_data, generated_by: str | None, progress=None) -> str:
+    """PDFを一時ファイルへ直接書き出してからキャッシュに置き、そのパスを返す"""
+    path = get_finance_report_cache_path(cache_key)
+    tmp_path = f'{path}.{uuid4().hex}.tmp'
+    try:
+        build_finance_report_pdf(report_data, generated_by=generated_by, progress=progress, output=tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    prune_finance_report_cache()
+    return path
+
+
+def get_finance_report_executor():
+    executor = FINANCE_REPORT_STATE['executor']
+    if executor is None:
+        with FINANCE_REPORT_LOCK:
+            executor = FINANCE_REPORT_STATE['executor']
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=FINANCE_REPORT_WORKERS, thread_name_prefix='finance-report')
+                FINANCE_REPORT_STATE['executor'] = executor
+    return executor
+
+
+def run_finance_report_job(job: dict, report_data, generated_by: str | None):
+    def report_progress(fraction):
+        progress = max(job['progress'], min(99, int(fraction * 100)))
+        if progress != job['progress']:
+            job['progress'] = progress
+            write_finance_report_status(job)
+
+    job['status'] = 'running'
+    job['started_at'] = datetime.now()
+    write_finance_report_status(job)
+    try:
+        write_finance_report_cache(job['id'], report_data, generated_by, progress=report_progress)
+    except Exception as exc:
+        app.logger.exception("Finance report generation failed: %s", job['id'])
+        job['status'] = 'error'
+        job['error'] = str(exc)
+    else:
+        job['status'] = 'done'
+        job['progress'] = 100
+    job['finished_at'] = datetime.now()
+    if job['status'] == 'done':
+        # 完了はキャッシュファイルの有無で判定できるため、状態ファイルは残さない
+        remove_finance_report_status(job['id'])
+    else:
+        write_finance_report_status(job)
+
+
+def submit_finance_report_job(generated_by: str | None) -> dict:
+    """レポート生成を登録する。キャッシュ済み・生成中なら既存のジョブを返す"""
+    # キーと描画データは同じ台帳ロックの中で取り、新しい内容のPDFを古いキーで保存しないようにする
+    with FINANCE_LEDGER.lock:
+        companies_summary = summarize_companies_for_report()
+        cache_key = get_finance_report_cache_key(generated_by, companies_summary)
+        with FINANCE_REPORT_LOCK:
+            job = FINANCE_REPORT_JOBS.get(cache_key)
+            if job and job['status'] in {'queued', 'running'}:
+                return job
+            if os.path.exists(get_finance_report_cache_path(cache_key)):
+                job = build_cached_finance_report_job(cache_key)
+                FINANCE_REPORT_JOBS[cache_key] = job
+                return job
+            # 別のワーカーで生成中なら、同じ内容を二重に生成しない
+            shared = read_finance_report_status(cache_key)
+            if shared and shared['status'] in {'queued', 'running'}:
+                return shared
+            job = {
+                'id': cache_key,
+                'status': 'queued',
+                'progress': 0,
+                'error': None,
+                'created_at': datetime.now(),
+                'started_at': None,
+                'finished_at': None
+            }
+            FINANCE_REPORT_JOBS[cache_key] = job
+            write_finance_report_status(job)
+        # 集計値と行はリクエスト時点の複製を渡し、生成中の追加・編集の影響を受けないようにする
+        report_data = gather_finance_report_data(companies_summary=companies_summary)
+    get_finance_report_executor().submit(run_finance_report_job, job, report_data, generated_by)
+    return job
+
+
+def build_cached_finance_report_job(cache_key: str) -> dict:
+    finished_at = datetime.fromtimestamp(os.path.getmtime(get_finance_report_cache_path(cache_key)))
+    return {
+        'id': cache_key,
+        'status': 'done',
+        'progress': 100,
+        'error': None,
+        'created_at': finished_at,
+        'started_at': finished_at,
+        'finished_at': finished_at
+    }
+
+
+def get_finance_report_job(job_id: str) -> dict | None:
+    if not re.fullmatch(r'[0-9a-f]{40}', job_id or ''):
+        return None
+    with FINANCE_REPORT_LOCK:
+        job = FINANCE_REPORT_JOBS.get(job_id)
+    if job:
+        return job
+    # 別のワーカーで生成されたジョブでも、キャッシュがあれば完了として扱い、生成中・失敗なら状態ファイルを返す
+    if os.path.exists(get_finance_report_cache_path(job_id)):
+        return build_cached_finance_report_job(job_id)
+    return read_finance_report_status(job_id)
+
+
+def serialize_finance_report_job(job: dict) -> dict:
+    payload = {
+        'id': job['id'],
+        'status': job['status'],
+        'progress': job['progress'],
+        'error': job['error'],
+        'created_at': serialize_datetime(job['created_at']),
+        'finished_at': serialize_datetime(job['finished_at']),
+        'status_url': url_for('api_finance_report_job_status', job_id=job['id']),
+        'download_url': None
+    }
+    if job['status'] == 'done':
+        payload['download_url'] = url_for('download_cached_finance_report', job_id=job['id'])
+    return payload
+
+
+def send_finance_report_file(path: str):
+    filename = f"finance_report_{datetime.fromtimestamp(os.path.getmtime(path)).strftime('%Y%m%d_%H%M')}.pdf"
+    resp = send_file(path, mimetype='application/pdf', as_attachment=True, download_name=filename)
+    resp.headers['Cache-Control'] = 'private, no-cache'
+    return resp
+
+
 @app.route('/reports')
 def reports():
     """レポート"""
@@ -3679,21 +5917,62 @@ def download_finance_report():
             'message': 'PDF生成ライブラリが利用できません。requirements.txt から reportlab をインストールしてください。'
         }), 503
 
-    report_data = gather_finance_report_data()
     current_user = g.current_user
     generated_by = current_user['name'] if current_user and current_user.get('name') else None
-    pdf_buffer = build_finance_report_pdf(report_data, generated_by=generated_by)
-    filename = f"finance_report_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
-    return send_file(
-        pdf_buffer,
-        mimetype='application/pdf',
-        as_attachment=True,
-        download_name=filename
-    )
+    report_data = None
+    with FINANCE_LEDGER.lock:
+        companies_summary = summarize_companies_for_report()
+        cache_key = get_finance_report_cache_key(generated_by, companies_summary)
+        cache_path = get_finance_report_cache_path(cache_key)
+        if not os.path.exists(cache_path):
+            report_data = gather_finance_report_data(companies_summary=companies_summary)
+    if report_data is not None:
+        # キャッシュがなければ従来どおりその場で生成し、次回以降のためにキャッシュへ残す
+        cache_path = write_finance_report_cache(cache_key, report_data, generated_by)
+    return send_finance_report_file(cache_path)
+
+
+@app.route('/api/reports/finance/jobs', methods=['POST'])
+@login_required
+@role_required('admin')
+def api_create_finance_report_job():
+    """収支レポートPDFの生成をバックグラウンドで開始する"""
+    if not REPORTLAB_AVAILABLE:
+        return jsonify({
+            'status': 'error',
+            'message': 'PDF生成ライブラリが利用できません。requirements.txt から reportlab をインストールしてください。'
+        }), 503
+
+    current_user = g.current_user
+    generated_by = current_user['name'] if current_user and current_user.get('name') else None
+    job = submit_finance_report_job(generated_by)
+    return jsonify({
+        'status': 'success',
+        'message': 'レポートを作成済みです' if job['status'] == 'done' else 'レポートの作成を開始しました',
+        'data': serialize_finance_report_job(job)
+    }), 200 if job['status'] == 'done' else 202
+
+
+@app.route('/api/reports/finance/jobs/<job_id>', methods=['GET'])
+@login_required
+@role_required('admin')
+def api_finance_report_job_status(job_id):
+    """収支レポート生成ジョブの進捗"""
+    job = get_finance_report_job(job_id)
+    if not job:
+        return jsonify({'status': 'error', 'message': 'レポート作成ジョブが見つかりません'}), 404
+    return jsonify({'status': 'success', 'data': serialize_finance_report_job(job)})
 
 
-# ===== 初期化フック =====
-initialize_all_project_tasks()
+@app.route('/reports/download/finance/<job_id>')
+@login_required
+@role_required('admin')
+def download_cached_finance_report(job_id):
+    job = get_finance_report_job(job_id)
+    if not job or job['status'] != 'done':
+        abort(404)
+    return send_finance_report_file(get_finance_report_cache_path(job_id))
+
 
 @app.route('/settings')
 @login_required
@@ -3947,17 +6226,19 @@ def editor_input_videos():
     """編集インプット動画一覧"""
     current_user = g.current_user
     include_watchers = current_user.get('role') == 'admin'
-    videos = get_training_videos_for_portal(current_user, include_watchers=include_watchers)
+    cursor = (request.args.get('cursor') or '').strip() or None
+    try:
+        videos, next_cursor = get_training_videos_for_portal(
+            current_user,
+            include_watchers=include_watchers,
+            cursor=cursor,
+            limit=TRAINING_VIDEO_PAGE_SIZE
+        )
+    except ValueError:
+        return redirect(url_for('editor_input_videos'))
 
-    summary = {
-        'total_videos': len(videos),
-        'completed_count': len([v for v in videos if v['user_progress'] >= 100 or v['user_status'] == '視聴済']),
-        'in_progress_count': len([v for v in videos if 0 < v['user_progress'] < 100 and v['user_status'] != '視聴済']),
-        'not_started_count': len([v for v in videos if v['user_progress'] == 0 and v['user_status'] == '未視聴'])
-    }
-    overall_completion = 0
-    if videos:
-        overall_completion = int(round(sum(v['avg_progress'] for v in videos) / len(videos)))
+    totals = get_training_video_summary(current_user)
+    summary = {'total_videos': totals['total_videos'], **totals['by_user']}
 
     return render_template(
         'editor/training_videos.html',
@@ -3965,7 +6246,9 @@ def editor_input_videos():
         include_watchers=include_watchers,
         status_options=TRAINING_STATUS_OPTIONS,
         summary=summary,
-        overall_completion=overall_completion
+        overall_completion=totals['overall_completion'],
+        cursor=cursor,
+        next_cursor=next_cursor
     )
 
 
@@ -3999,7 +6282,8 @@ def editor_gantt():
         selected_filters=params,
         project_choices=filter_options.get('projects', []),
         dependency_types=sorted(TASK_DEPENDENCY_TYPES),
-        current_view='plan'
+        current_view='plan',
+        data_version=current_data_version()
     )
 
 
@@ -4303,6 +6587,8 @@ def import_csv():
                 skipped_count += 1
                 continue
         
+        if imported_count:
+            bump_data_version(resync=True)
         return jsonify({
             'status': 'success',
             'message': f'CSVインポートが完了しました',
@@ -4422,9 +6708,135 @@ def admin_users():
         form_data=form_data
     )
 
-def get_training_videos_for_portal(user, include_watchers=False):
+TRAINING_VIDEO_PAGE_SIZE = int(os.environ.get('TRAINING_VIDEO_PAGE_SIZE', '20'))
+TRAINING_VIDEO_PAGE_SIZE_MAX = 100
+TRAINING_WATCHER_PAGE_SIZE = int(os.environ.get('TRAINING_WATCHER_PAGE_SIZE', '20'))
+TRAINING_WATCHER_PAGE_SIZE_MAX = 200
+
+
+def encode_keyset_cursor(*values):
+    """キーセットページングの位置を不透明な文字列にする"""
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_keyset_cursor(cursor: str, types: tuple):
+    """encode_keyset_cursor の逆変換。要素の数と型を types と照合し、不正な値は ValueError"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError('cursor が不正です') from exc
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError('cursor が不正です')
+    for value, expected in zip(values, types):
+        # JSON の true/false は int として通さない
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise ValueError('cursor が不正です')
+    return values
+
+
+def parse_page_limit(value, default: int, maximum: int):
+    """limit クエリを検証して上限内に丸める。不正な値は ValueError"""
+    if value in (None, ''):
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError('limit は1以上の整数で指定してください') from exc
+    if limit < 1:
+        raise ValueError('limit は1以上の整数で指定してください')
+    return min(limit, maximum)
+
+
+def serialize_training_watcher(row):
+    return {
+        'user_id': row['user_id'],
+        'name': row['name'],
+        'email': row['email'],
+        'status': row['status'],
+        'progress_percent': row['progress_percent'],
+        'last_viewed_at': serialize_datetime(row['last_viewed_at'])
+    }
+
+
+def get_training_video_watchers(video_id: int, cursor=None, limit=None, search=''):
+    """動画1本分の視聴者を氏名順にキーセットページングで返す"""
+    limit = limit or TRAINING_WATCHER_PAGE_SIZE
+    conditions = ['p.video_id = :video_id']
+    params = {'video_id': video_id}
+    search = (search or '').strip()
+    if search:
+        escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        conditions.append("(u.name ilike :pattern or u.email ilike :pattern)")
+        params['pattern'] = f'%{escaped}%'
+
+    total = fetch_one(
+        f"""
+        select count(*) as total
+        from app.training_video_progress p
+        join app.users u on u.id = p.user_id
+        where {' and '.join(conditions)}
+        """,
+        **params
+    )['total']
+
+    if cursor:
+        after_name, after_user_id = decode_keyset_cursor(cursor, (str, int))
+        conditions.append('(u.name, u.id) > (:after_name, :after_user_id)')
+        params.update(after_name=after_name, after_user_id=after_user_id)
+
+    rows = fetch_all(
+        f"""
+        select
+            u.id as user_id,
+            u.name,
+            u.email,
+            p.status,
+            p.progress_percent,
+            p.last_viewed_at
+        from app.training_video_progress p
+        join app.users u on u.id = p.user_id
+        where {' and '.join(conditions)}
+        order by u.name, u.id
+        limit :limit
+        """,
+        limit=limit + 1,
+        **params
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_keyset_cursor(rows[-1]['name'], rows[-1]['user_id'])
+    return [serialize_training_watcher(row) for row in rows], next_cursor, total
+
+
+def get_training_videos_for_portal(user, include_watchers=False, video_id=None, cursor=None, limit=None):
+    """研修動画を新しい順に返す。
+
+    video_id 指定時はその1本だけ、limit 指定時は cursor 以降の1ページ分を取得する。
+    視聴者は各動画の先頭ページのみ含める（続きは get_training_video_watchers）。
+    """
+    conditions = []
+    params = {}
+    if video_id is not None:
+        conditions.append('tv.id = :video_id')
+        params['video_id'] = video_id
+    if cursor:
+        after_created_at, after_id = decode_keyset_cursor(cursor, (str, int))
+        try:
+            after_created_at = datetime.fromisoformat(after_created_at)
+        except ValueError as exc:
+            raise ValueError('cursor が不正です') from exc
+        conditions.append('(tv.created_at, tv.id) < (:after_created_at, :after_id)')
+        params.update(after_created_at=after_created_at, after_id=after_id)
+    limit_clause = ''
+    if limit is not None:
+        limit_clause = 'limit :limit'
+        params['limit'] = limit + 1
+
     videos = fetch_all(
-        """
+        f"""
         select
             tv.id,
             tv.title,
@@ -4436,21 +6848,28 @@ def get_training_videos_for_portal(user, include_watchers=False):
             creator.name as created_by_name,
             coalesce(stats.total_viewers, 0) as total_viewers,
             coalesce(stats.completed_viewers, 0) as completed_viewers,
-            coalesce(stats.avg_progress, 0) as avg_progress
+            coalesce(stats.progress_count, 0) as watcher_count,
+            case
+                when stats.progress_count > 0 then stats.progress_sum::numeric / stats.progress_count
+                else 0
+            end as avg_progress
         from app.training_videos tv
         left join app.users creator on creator.id = tv.created_by
-        left join (
-            select
-                video_id,
-                count(*) filter (where status <> '未視聴') as total_viewers,
-                count(*) filter (where status in ('視聴済', '完了')) as completed_viewers,
-                avg(progress_percent) as avg_progress
-            from app.training_video_progress
-            group by video_id
-        ) stats on stats.video_id = tv.id
-        order by tv.created_at desc
-        """
+        -- 集計値はトリガーで維持される training_video_stats から読む
+        left join app.training_video_stats stats on stats.video_id = tv.id
+        {'where ' + ' and '.join(conditions) if conditions else ''}
+        order by tv.created_at desc, tv.id desc
+        {limit_clause}
+        """,
+        **params
     )
+    next_cursor = None
+    if limit is not None and len(videos) > limit:
+        videos = videos[:limit]
+        next_cursor = encode_keyset_cursor(videos[-1]['created_at'], videos[-1]['id'])
+    if not videos:
+        return [], None
+    video_ids = [video['id'] for video in videos]
 
     user_progress_map = {}
     if user:
@@ -4459,36 +6878,45 @@ def get_training_videos_for_portal(user, include_watchers=False):
             select video_id, status, progress_percent, last_viewed_at, notes
             from app.training_video_progress
             where user_id = :user_id
+              and video_id = any(:video_ids)
             """,
-            user_id=user['id']
+            user_id=user['id'],
+            video_ids=video_ids
         )
         for row in progress_rows:
             user_progress_map[row['video_id']] = row
+        # バッファ中の自分の進捗を優先して、保存直後の値を返す
+        user_progress_map.update(get_pending_training_progress(user['id'], set(video_ids)))
 
     watchers_map = {}
     if include_watchers:
+        # 動画ごとに先頭ページ分だけを lateral で取り出す
         watcher_rows = fetch_all(
             """
-            select
-                p.video_id,
-                u.name,
-                u.email,
-                p.status,
-                p.progress_percent,
-                p.last_viewed_at
-            from app.training_video_progress p
-            join app.users u on u.id = p.user_id
-            order by p.video_id, u.name
-            """
+            select w.*
+            from unnest(cast(:video_ids as integer[])) as v(video_id)
+            cross join lateral (
+                select
+                    p.video_id,
+                    u.id as user_id,
+                    u.name,
+                    u.email,
+                    p.status,
+                    p.progress_percent,
+                    p.last_viewed_at
+                from app.training_video_progress p
+                join app.users u on u.id = p.user_id
+                where p.video_id = v.video_id
+                order by u.name, u.id
+                limit :watcher_limit
+            ) w
+            order by w.video_id, w.name, w.user_id
+            """,
+            video_ids=video_ids,
+            watcher_limit=TRAINING_WATCHER_PAGE_SIZE + 1
         )
         for row in watcher_rows:
-            watchers_map.setdefault(row['video_id'], []).append({
-                'name': row['name'],
-                'email': row['email'],
-                'status': row['status'],
-                'progress_percent': row['progress_percent'],
-                'last_viewed_at': serialize_datetime(row['last_viewed_at'])
-            })
+            watchers_map.setdefault(row['video_id'], []).append(serialize_training_watcher(row))
 
     results = []
     for video in videos:
@@ -4510,26 +6938,131 @@ def get_training_videos_for_portal(user, include_watchers=False):
             'user_notes': progress.get('notes') if progress else ''
         }
         if include_watchers:
-            video_context['watchers'] = watchers_map.get(video['id'], [])
+            watchers = watchers_map.get(video['id'], [])
+            watchers_next_cursor = None
+            if len(watchers) > TRAINING_WATCHER_PAGE_SIZE:
+                watchers = watchers[:TRAINING_WATCHER_PAGE_SIZE]
+                watchers_next_cursor = encode_keyset_cursor(watchers[-1]['name'], watchers[-1]['user_id'])
+            video_context['watchers'] = watchers
+            video_context['watcher_count'] = video.get('watcher_count', 0)
+            video_context['watchers_next_cursor'] = watchers_next_cursor
         results.append(video_context)
 
-    return results
+    return results, next_cursor
+
+
+def get_training_video_summary(user):
+    """一覧ページ上部の集計値を動画全体から求める（ページングの影響を受けない）"""
+    row = fetch_one(
+        """
+        with per_video as (
+            select
+                round(case
+                    when s.progress_count > 0 then s.progress_sum::numeric / s.progress_count
+                    else 0
+                end) as avg_progress,
+                coalesce(p.progress_percent, 0) as user_progress,
+                coalesce(p.status, '未視聴') as user_status
+            from app.training_videos tv
+            left join app.training_video_stats s on s.video_id = tv.id
+            left join app.training_video_progress p on p.video_id = tv.id and p.user_id = :user_id
+        )
+        select
+            count(*) as total_videos,
+            count(*) filter (where avg_progress >= 99) as avg_completed_count,
+            count(*) filter (where avg_progress > 0 and avg_progress < 99) as avg_in_progress_count,
+            count(*) filter (where avg_progress = 0) as avg_not_started_count,
+            count(*) filter (where user_progress >= 100 or user_status = '視聴済') as user_completed_count,
+            count(*) filter (
+                where user_progress > 0 and user_progress < 100 and user_status <> '視聴済'
+            ) as user_in_progress_count,
+            count(*) filter (where user_progress = 0 and user_status = '未視聴') as user_not_started_count,
+            avg(avg_progress) as overall_completion
+        from per_video
+        """,
+        user_id=user['id'] if user else None
+    )
+    return {
+        'total_videos': row['total_videos'],
+        'overall_completion': normalize_percent(row['overall_completion']),
+        'by_average': {
+            'completed_count': row['avg_completed_count'],
+            'in_progress_count': row['avg_in_progress_count'],
+            'not_started_count': row['avg_not_started_count']
+        },
+        'by_user': {
+            'completed_count': row['user_completed_count'],
+            'in_progress_count': row['user_in_progress_count'],
+            'not_started_count': row['user_not_started_count']
+        }
+    }
+
+
+TRAINING_VIDEO_ID_CACHE_SECONDS = float(os.environ.get('TRAINING_VIDEO_ID_CACHE_SECONDS', '30'))
+TRAINING_VIDEO_ID_CACHE = {'ids': set(), 'loaded_at': 0.0}
+
+
+def training_video_exists(video_id: int) -> bool:
+    """動画IDの存在を、一定時間保持する ID 一覧で確認する。一覧にない ID のときだけ読み直す
+
+    他のワーカーで削除された動画は最大で保持時間ぶん受け付けるが、その進捗は書き込み時に捨てられる。
+    """
+    cache = TRAINING_VIDEO_ID_CACHE
+    fresh = time.monotonic() - cache['loaded_at'] < TRAINING_VIDEO_ID_CACHE_SECONDS
+    if fresh and video_id in cache['ids']:
+        return True
+    rows = fetch_all("select id from app.training_videos")
+    cache['ids'] = {row['id'] for row in rows}
+    cache['loaded_at'] = time.monotonic()
+    return video_id in cache['ids']
 
 
 def get_training_video_context(video_id: int, user, include_watchers=False):
-    videos = get_training_videos_for_portal(user, include_watchers=include_watchers)
-    return next((video for video in videos if video['id'] == video_id), None)
+    videos, _ = get_training_videos_for_portal(user, include_watchers=include_watchers, video_id=video_id)
+    return videos[0] if videos else None
 
 
-def upsert_training_progress(video_id: int, user_id: int, status: str, progress_percent: int, notes: str = ''):
-    status = status if status in TRAINING_STATUS_OPTIONS else '視聴中'
-    progress_percent = max(0, min(100, progress_percent))
-    with engine.begin() as conn:
+# 視聴進捗の書き込みバッファ。同じ (video_id, user_id) への更新は短い間隔でまとめて1回の upsert にする
+TRAINING_PROGRESS_FLUSH_SECONDS = float(os.environ.get('TRAINING_PROGRESS_FLUSH_SECONDS', '2'))
+TRAINING_PROGRESS_MAX_PENDING = int(os.environ.get('TRAINING_PROGRESS_MAX_PENDING', '500'))
+TRAINING_PROGRESS_BUFFER = {}
+TRAINING_PROGRESS_INFLIGHT = {}
+TRAINING_PROGRESS_LOCK = threading.Lock()
+TRAINING_PROGRESS_FLUSH_LOCK = threading.Lock()
+TRAINING_PROGRESS_WAKEUP = threading.Event()
+TRAINING_PROGRESS_STATE = {'thread': None}
+TRAINING_PROGRESS_STATS = {'queued': 0, 'merged': 0, 'batches': 0, 'rows': 0, 'errors': 0}
+
+
+def build_training_progress_entry(status: str, progress_percent: int, notes: str = ''):
+    return {
+        'status': status if status in TRAINING_STATUS_OPTIONS else '視聴中',
+        'progress_percent': max(0, min(100, progress_percent)),
+        'notes': notes,
+        'last_viewed_at': datetime.now()
+    }
+
+
+def write_training_progress_rows(entries: dict):
+    """(video_id, user_id) → 進捗 の辞書を1文の複数行 upsert で書き込む"""
+    if not entries:
+        return
+    rows = [
+        {'video_id': video_id, 'user_id': user_id, **entry}
+        for (video_id, user_id), entry in entries.items()
+    ]
+    with get_engine().begin() as conn:
         conn.execute(
             text(
                 """
                 insert into app.training_video_progress (video_id, user_id, status, progress_percent, last_viewed_at, notes)
-                values (:video_id, :user_id, :status, :progress_percent, :last_viewed_at, :notes)
+                select r.video_id, r.user_id, r.status, r.progress_percent, r.last_viewed_at, r.notes
+                from jsonb_to_recordset(cast(:rows as jsonb))
+                    as r(video_id integer, user_id integer, status varchar, progress_percent integer,
+                         last_viewed_at timestamp, notes text)
+                -- バッファ中に削除された動画・ユーザーの分は捨てる
+                where exists (select 1 from app.training_videos v where v.id = r.video_id)
+                  and exists (select 1 from app.users u where u.id = r.user_id)
                 on conflict (video_id, user_id) do update set
                     status = excluded.status,
                     progress_percent = excluded.progress_percent,
@@ -4537,21 +7070,178 @@ def upsert_training_progress(video_id: int, user_id: int, status: str, progress_
                     notes = excluded.notes
                 """
             ),
-            video_id=video_id,
-            user_id=user_id,
-            status=status,
-            progress_percent=progress_percent,
-            last_viewed_at=datetime.now(),
-            notes=notes
+            {'rows': json.dumps(rows, ensure_ascii=False, default=str)}
+        )
+
+
+def upsert_training_progress(video_id: int, user_id: int, status: str, progress_percent: int, notes: str = ''):
+    """進捗を即時に書き込む（バッファを経由しない）"""
+    entry = build_training_progress_entry(status, progress_percent, notes)
+    with TRAINING_PROGRESS_LOCK:
+        # 古い値が後から書き戻されないよう、同じキーのバッファを捨てる
+        TRAINING_PROGRESS_BUFFER.pop((video_id, user_id), None)
+    write_training_progress_rows({(video_id, user_id): entry})
+    return entry
+
+
+def queue_training_progress(video_id: int, user_id: int, status: str, progress_percent: int, notes: str = ''):
+    """進捗をバッファに積み、マージ後の値を返す。書き込みは flush_training_progress が行う"""
+    if TRAINING_PROGRESS_FLUSH_SECONDS <= 0:
+        return upsert_training_progress(video_id, user_id, status, progress_percent, notes)
+    entry = build_training_progress_entry(status, progress_percent, notes)
+    with TRAINING_PROGRESS_LOCK:
+        if (video_id, user_id) in TRAINING_PROGRESS_BUFFER:
+            TRAINING_PROGRESS_STATS['merged'] += 1
+        TRAINING_PROGRESS_BUFFER[(video_id, user_id)] = entry
+        TRAINING_PROGRESS_STATS['queued'] += 1
+        pending = len(TRAINING_PROGRESS_BUFFER)
+    ensure_training_progress_flusher()
+    if pending >= TRAINING_PROGRESS_MAX_PENDING:
+        TRAINING_PROGRESS_WAKEUP.set()
+    return entry
+
+
+def get_pending_training_progress(user_id: int, video_ids=None) -> dict:
+    """まだ書き込まれていないユーザーの進捗（video_id → 進捗）"""
+    with TRAINING_PROGRESS_LOCK:
+        # 書き込み中の分の上に、未書き込みの新しい分を重ねる
+        return {
+            video_id: dict(entry)
+            for source in (TRAINING_PROGRESS_INFLIGHT, TRAINING_PROGRESS_BUFFER)
+            for (video_id, pending_user_id), entry in source.items()
+            if pending_user_id == user_id and (video_ids is None or video_id in video_ids)
+        }
+
+
+def flush_training_progress():
+    """バッファの内容をまとめて書き込む。失敗した分は新しい更新を上書きしないよう戻す"""
+    with TRAINING_PROGRESS_FLUSH_LOCK:
+        with TRAINING_PROGRESS_LOCK:
+            if not TRAINING_PROGRESS_BUFFER:
+                return 0
+            batch = dict(TRAINING_PROGRESS_BUFFER)
+            TRAINING_PROGRESS_BUFFER.clear()
+            TRAINING_PROGRESS_INFLIGHT.update(batch)
+        try:
+            write_training_progress_rows(batch)
+        except Exception:
+            app.logger.exception("Failed to flush %d training progress rows", len(batch))
+            with TRAINING_PROGRESS_LOCK:
+                TRAINING_PROGRESS_INFLIGHT.clear()
+                TRAINING_PROGRESS_STATS['errors'] += 1
+                for key, entry in batch.items():
+                    TRAINING_PROGRESS_BUFFER.setdefault(key, entry)
+            return 0
+        with TRAINING_PROGRESS_LOCK:
+            TRAINING_PROGRESS_INFLIGHT.clear()
+            TRAINING_PROGRESS_STATS['batches'] += 1
+            TRAINING_PROGRESS_STATS['rows'] += len(batch)
+        return len(batch)
+
+
+def run_training_progress_flusher():
+    while True:
+        TRAINING_PROGRESS_WAKEUP.wait(TRAINING_PROGRESS_FLUSH_SECONDS)
+        TRAINING_PROGRESS_WAKEUP.clear()
+        flush_training_progress()
+
+
+def ensure_training_progress_flusher():
+    thread = TRAINING_PROGRESS_STATE['thread']
+    if thread is not None and thread.is_alive():
+        return
+    with TRAINING_PROGRESS_LOCK:
+        thread = TRAINING_PROGRESS_STATE['thread']
+        if thread is not None and thread.is_alive():
+            return
+        thread = threading.Thread(target=run_training_progress_flusher, name='training-progress-flusher', daemon=True)
+        TRAINING_PROGRESS_STATE['thread'] = thread
+        thread.start()
+
+
+def get_training_progress_stats() -> dict:
+    with TRAINING_PROGRESS_LOCK:
+        return {
+            'pending': len(TRAINING_PROGRESS_BUFFER),
+            'flush_seconds': TRAINING_PROGRESS_FLUSH_SECONDS,
+            **TRAINING_PROGRESS_STATS
+        }
+
+
+# 終了時に未書き込みの進捗を落とさない
+atexit.register(flush_training_progress)
+
+
+@app.route('/api/editor/training-videos', methods=['GET'])
+@login_required
+@role_required('admin', 'editor')
+def api_list_training_videos():
+    """編集インプット動画をキーセットページングで返す"""
+    include_watchers = g.current_user.get('role') == 'admin'
+    cursor = (request.args.get('cursor') or '').strip() or None
+    try:
+        limit = parse_page_limit(request.args.get('limit'), TRAINING_VIDEO_PAGE_SIZE, TRAINING_VIDEO_PAGE_SIZE_MAX)
+        videos, next_cursor = get_training_videos_for_portal(
+            g.current_user,
+            include_watchers=include_watchers,
+            cursor=cursor,
+            limit=limit
+        )
+    except ValueError as exc:
+        return jsonify({'status': 'error', 'message': str(exc)}), 400
+
+    return jsonify({
+        'status': 'success',
+        'data': videos,
+        'meta': {
+            'limit': limit,
+            'cursor': cursor,
+            'next_cursor': next_cursor
+        }
+    })
+
+
+@app.route('/api/admin/training-videos/<int:video_id>/watchers', methods=['GET'])
+@login_required
+@role_required('admin')
+def api_training_video_watchers(video_id):
+    """動画1本分の視聴者一覧（氏名・メールで絞り込み可）"""
+    video = fetch_one("select id from app.training_videos where id = :video_id", video_id=video_id)
+    if not video:
+        return jsonify({'status': 'error', 'message': '動画が見つかりません'}), 404
+
+    cursor = (request.args.get('cursor') or '').strip() or None
+    search = (request.args.get('q') or '').strip()
+    try:
+        limit = parse_page_limit(request.args.get('limit'), TRAINING_WATCHER_PAGE_SIZE, TRAINING_WATCHER_PAGE_SIZE_MAX)
+        watchers, next_cursor, total = get_training_video_watchers(
+            video_id,
+            cursor=cursor,
+            limit=limit,
+            search=search
         )
+    except ValueError as exc:
+        return jsonify({'status': 'error', 'message': str(exc)}), 400
+
+    return jsonify({
+        'status': 'success',
+        'data': watchers,
+        'meta': {
+            'total': total,
+            'limit': limit,
+            'q': search,
+            'cursor': cursor,
+            'next_cursor': next_cursor
+        }
+    })
+
 
 @app.route('/api/editor/training-videos/<int:video_id>/progress', methods=['POST'])
 @login_required
 @role_required('admin', 'editor')
 def api_update_training_video_progress(video_id):
     """編集インプット動画の進捗更新"""
-    video = fetch_one("select id from app.training_videos where id = :video_id", video_id=video_id)
-    if not video:
+    if not training_video_exists(video_id):
         return jsonify({'status': 'error', 'message': '動画が見つかりません'}), 404
 
     data = request.get_json() or {}
@@ -4563,7 +7253,7 @@ def api_update_training_video_progress(video_id):
     except (TypeError, ValueError):
         return jsonify({'status': 'error', 'message': '進捗は0〜100の範囲で入力してください'}), 400
 
-    upsert_training_progress(
+    entry = queue_training_progress(
         video_id=video_id,
         user_id=g.current_user['id'],
         status=status,
@@ -4571,15 +7261,17 @@ def api_update_training_video_progress(video_id):
         notes=notes
     )
 
-    video_context = get_training_video_context(
-        video_id,
-        g.current_user,
-        include_watchers=g.current_user.get('role') == 'admin'
-    )
+    # 視聴のたびに送られるため、一覧の読み直しはせずバッファに積んだ値だけを返す
     return jsonify({
         'status': 'success',
         'message': '進捗を更新しました',
-        'data': video_context
+        'data': {
+            'id': video_id,
+            'user_status': entry['status'],
+            'user_progress': entry['progress_percent'],
+            'user_last_viewed': serialize_datetime(entry['last_viewed_at']),
+            'user_notes': entry['notes']
+        }
     })
 
 
@@ -4601,20 +7293,16 @@ def api_admin_create_training_video():
     if not title:
         errors.append('タイトルは必須です')
 
+    has_upload = bool(uploaded_file and uploaded_file.filename)
     video_url = None
-    if uploaded_file and uploaded_file.filename:
-        filename = uploaded_file.filename
-        if not allowed_training_video_filename(filename):
-            errors.append('対応していない動画形式です (mp4, mov, avi, mkv, wmv, m4v)')
-        else:
-            extension = filename.rsplit('.', 1)[1].lower()
-            unique_name = f"{uuid4().hex}.{extension}"
-            safe_name = secure_filename(unique_name)
-            save_path = os.path.join(TRAINING_VIDEO_UPLOAD_FOLDER, safe_name)
-            uploaded_file.save(save_path)
-            video_url = url_for('serve_training_video', filename=safe_name)
+    if has_upload:
+        upload_error = validate_training_video_upload(uploaded_file)
+        if upload_error:
+            errors.append(upload_error)
     elif url_value:
         video_url = url_value
+        if get_training_video_file_path(url_value):
+            errors.append(TRAINING_VIDEO_LOCAL_URL_ERROR)
     else:
         errors.append('動画URLまたは動画ファイルのいずれかを指定してください')
 
@@ -4630,24 +7318,412 @@ def api_admin_create_training_video():
     if errors:
         return jsonify({'status': 'error', 'message': ' / '.join(errors)}), 400
 
-    with engine.begin() as conn:
-        result = conn.execute(
-            text(
-                """
-                insert into app.training_videos (title, description, url, duration_minutes, created_by)
-                values (:title, :description, :url, :duration_minutes, :created_by)
-                returning id
-                """
-            ),
-            {
-                'title': title,
-                'description': description,
-                'url': video_url,
-                'duration_minutes': duration_minutes,
-                'created_by': g.current_user['id']
-            }
+    # 検証がすべて通ってから保存し、以降の失敗では増やした参照を戻す
+    if has_upload:
+        video_url = save_training_video_upload(uploaded_file)
+    try:
+        with get_engine().begin() as conn:
+            result = conn.execute(
+                text(
+                    """
+                    insert into app.training_videos (title, description, url, duration_minutes, created_by)
+                    values (:title, :description, :url, :duration_minutes, :created_by)
+                    returning id
+                    """
+                ),
+                {
+                    'title': title,
+                    'description': description,
+                    'url': video_url,
+                    'duration_minutes': duration_minutes,
+                    'created_by': g.current_user['id']
+                }
+            )
+            new_id = result.scalar()
+    except Exception:
+        if has_upload:
+            remove_training_video_file(video_url)
+        raise
+
+    video_context = get_training_video_context(new_id, g.current_user, include_watchers=True)
+    return jsonify({
+        'status': 'success',
+        'message': '動画を登録しました',
+        'data': video_context
+    })
+
+
+# 分割・再開可能なアップロード（init → PUT チャンク → complete）
+TRAINING_UPLOAD_PARTIAL_FOLDER = os.path.join(TRAINING_VIDEO_UPLOAD_FOLDER, '.partial')
+os.makedirs(TRAINING_UPLOAD_PARTIAL_FOLDER, exist_ok=True)
+TRAINING_UPLOAD_CHUNK_MAX_BYTES = int(os.environ.get('TRAINING_UPLOAD_CHUNK_MAX_BYTES', str(64 * 1024 * 1024)))
+TRAINING_UPLOAD_MAX_BYTES = int(os.environ.get('TRAINING_UPLOAD_MAX_BYTES', str(20 * 1024 * 1024 * 1024)))
+TRAINING_UPLOAD_EXPIRE_HOURS = int(os.environ.get('TRAINING_UPLOAD_EXPIRE_HOURS', '24'))
+TRAINING_UPLOAD_IO_CHUNK = 1024 * 1024
+
+
+def get_training_upload_part_path(upload_id: str) -> str:
+    return os.path.join(TRAINING_UPLOAD_PARTIAL_FOLDER, f'{upload_id}.part')
+
+
+def get_training_upload(upload_id: str):
+    if not re.fullmatch(r'[0-9a-f]{32}', upload_id or ''):
+        return None
+    return fetch_one("select * from app.training_video_uploads where id = :id", id=upload_id)
+
+
+def serialize_training_upload(upload, offset=None):
+    return {
+        'upload_id': upload['id'],
+        'filename': upload['filename'],
+        'size': upload['total_size'],
+        'offset': upload['received_size'] if offset is None else offset,
+        'status': upload['status'],
+        'video_id': upload.get('video_id'),
+        'chunk_max_bytes': TRAINING_UPLOAD_CHUNK_MAX_BYTES
+    }
+
+
+def parse_sha256_header(value: str | None):
+    """'sha256=<hex|base64>' 形式のチェックサムを16進文字列にする"""
+    if not value:
+        return None
+    algorithm, _, digest = value.strip().partition('=')
+    if algorithm.strip().lower() != 'sha256' or not digest:
+        raise ValueError('チェックサムは sha256=<値> の形式で指定してください')
+    digest = digest.strip()
+    if re.fullmatch(r'[0-9a-fA-F]{64}', digest):
+        return digest.lower()
+    try:
+        raw = base64.b64decode(digest, validate=True)
+    except ValueError as exc:
+        raise ValueError('チェックサムの形式が不正です') from exc
+    if len(raw) != 32:
+        raise ValueError('チェックサムの形式が不正です')
+    return raw.hex()
+
+
+def sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(TRAINING_UPLOAD_IO_CHUNK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def release_training_upload_claim(upload_id: str):
+    execute(
+        "update app.training_video_uploads set status = 'uploading', updated_at = now() where id = :id and status = 'finalizing'",
+        id=upload_id
+    )
+
+
+def purge_expired_training_uploads():
+    """期限切れの未完了アップロードと途中ファイルを削除する"""
+    expired = fetch_all(
+        """
+        delete from app.training_video_uploads
+        where status in ('uploading', 'finalizing')
+          and updated_at < now() - make_interval(hours => :hours)
+        returning id
+        """,
+        hours=TRAINING_UPLOAD_EXPIRE_HOURS
+    )
+    for row in expired:
+        try:
+            os.remove(get_training_upload_part_path(row['id']))
+        except FileNotFoundError:
+            pass
+        except OSError:
+            app.logger.warning("Failed to remove partial upload: %s", row['id'])
+
+
+@app.route('/api/admin/training-videos/uploads', methods=['POST'])
+@login_required
+@role_required('admin')
+def api_admin_init_training_upload():
+    """管理者: 分割アップロードを開始する"""
+    data = request.get_json() or {}
+    filename = (data.get('filename') or '').strip()
+    if not filename or not allowed_training_video_filename(filename):
+        return jsonify({'status': 'error', 'message': '対応していない動画形式です (mp4, mov, avi, mkv, wmv, m4v)'}), 400
+    try:
+        total_size = int(data.get('size'))
+        if total_size < 1:
+            raise ValueError
+    except (TypeError, ValueError):
+        return jsonify({'status': 'error', 'message': 'size はファイルのバイト数で指定してください'}), 400
+    if total_size > TRAINING_UPLOAD_MAX_BYTES:
+        return jsonify({'status': 'error', 'message': 'ファイルサイズが上限を超えています'}), 413
+    try:
+        checksum = parse_sha256_header(f"sha256={data['sha256']}") if data.get('sha256') else None
+    except ValueError as exc:
+        return jsonify({'status': 'error', 'message': str(exc)}), 400
+
+    purge_expired_training_uploads()
+
+    upload_id = uuid4().hex
+    # 途中ファイルを先に作っておき、チャンクは常にこのファイルへ追記する
+    open(get_training_upload_part_path(upload_id), 'wb').close()
+    upload = fetch_one(
+        """
+        insert into app.training_video_uploads (id, filename, extension, total_size, sha256, created_by)
+        values (:id, :filename, :extension, :total_size, :sha256, :created_by)
+        returning *
+        """,
+        id=upload_id,
+        filename=filename,
+        extension=filename.rsplit('.', 1)[1].lower(),
+        total_size=total_size,
+        sha256=checksum,
+        created_by=g.current_user['id']
+    )
+    return jsonify({
+        'status': 'success',
+        'message': 'アップロードを開始しました',
+        'data': serialize_training_upload(upload)
+    }), 201
+
+
+@app.route('/api/admin/training-videos/uploads/<upload_id>', methods=['GET'])
+@login_required
+@role_required('admin')
+def api_admin_training_upload_status(upload_id):
+    """管理者: 再開位置（受信済みバイト数）を返す"""
+    upload = get_training_upload(upload_id)
+    if not upload:
+        return jsonify({'status': 'error', 'message': 'アップロードが見つかりません'}), 404
+    offset = upload['received_size']
+    if upload['status'] == 'uploading':
+        # DB 更新前に落ちた場合もあるため、途中ファイルの実サイズを正とする
+        try:
+            offset = os.path.getsize(get_training_upload_part_path(upload_id))
+        except OSError:
+            offset = 0
+    return jsonify({'status': 'success', 'data': serialize_training_upload(upload, offset)})
+
+
+@app.route('/api/admin/training-videos/uploads/<upload_id>', methods=['PUT'])
+@login_required
+@role_required('admin')
+def api_admin_put_training_upload_chunk(upload_id):
+    """管理者: Upload-Offset の位置にチャンクを追記する"""
+    upload = get_training_upload(upload_id)
+    if not upload:
+        return jsonify({'status': 'error', 'message': 'アップロードが見つかりません'}), 404
+    if upload['status'] != 'uploading':
+        return jsonify({'status': 'error', 'message': 'このアップロードは既に完了しています'}), 409
+
+    try:
+        offset = int(request.headers.get('Upload-Offset', request.args.get('offset', '')))
+        if offset < 0:
+            raise ValueError
+    except (TypeError, ValueError):
+        return jsonify({'status': 'error', 'message': 'Upload-Offset を0以上の整数で指定してください'}), 400
+    try:
+        chunk_checksum = parse_sha256_header(request.headers.get('Upload-Checksum'))
+    except ValueError as exc:
+        return jsonify({'status': 'error', 'message': str(exc)}), 400
+    length = request.content_length
+    if length is None:
+        return jsonify({'status': 'error', 'message': 'Content-Length を指定してください'}), 411
+    if length > TRAINING_UPLOAD_CHUNK_MAX_BYTES:
+        return jsonify({'status': 'error', 'message': 'チャンクサイズが上限を超えています'}), 413
+    if offset + length > upload['total_size']:
+        return jsonify({'status': 'error', 'message': 'ファイルサイズを超えるデータが送信されました'}), 400
+
+    part_path = get_training_upload_part_path(upload_id)
+    try:
+        handle = open(part_path, 'r+b')
+    except FileNotFoundError:
+        return jsonify({'status': 'error', 'message': 'アップロードが見つかりません'}), 404
+    with handle:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return jsonify({'status': 'error', 'message': '同じアップロードに別のチャンクを書き込み中です'}), 409
+        current = os.fstat(handle.fileno()).st_size
+        if offset != current:
+            resp = jsonify({'status': 'error', 'message': 'オフセットが一致しません', 'data': {'offset': current}})
+            resp.headers['Upload-Offset'] = str(current)
+            return resp, 409
+
+        # 受信したそばからディスクへ追記し、チャンク全体をメモリに溜めない
+        handle.seek(current)
+        digest = hashlib.sha256()
+        received = 0
+        while received < length:
+            block = request.stream.read(min(TRAINING_UPLOAD_IO_CHUNK, length - received))
+            if not block:
+                break
+            handle.write(block)
+            digest.update(block)
+            received += len(block)
+        if received != length or (chunk_checksum and digest.hexdigest() != chunk_checksum):
+            # 途中で切れたチャンクや壊れたチャンクは書き込み前の位置まで巻き戻す
+            handle.truncate(current)
+            message = 'チャンクのチェックサムが一致しません' if received == length else 'チャンクの受信が途中で終了しました'
+            resp = jsonify({'status': 'error', 'message': message, 'data': {'offset': current}})
+            resp.headers['Upload-Offset'] = str(current)
+            return resp, 400 if received == length else 408
+        handle.flush()
+        os.fsync(handle.fileno())
+        new_offset = current + received
+
+    execute(
+        "update app.training_video_uploads set received_size = :offset, updated_at = now() where id = :id",
+        offset=new_offset,
+        id=upload_id
+    )
+    resp = jsonify({'status': 'success', 'data': {'upload_id': upload_id, 'offset': new_offset}})
+    resp.headers['Upload-Offset'] = str(new_offset)
+    return resp
+
+
+@app.route('/api/admin/training-videos/uploads/<upload_id>', methods=['DELETE'])
+@login_required
+@role_required('admin')
+def api_admin_abort_training_upload(upload_id):
+    """管理者: 未完了のアップロードを破棄する"""
+    upload = get_training_upload(upload_id)
+    if not upload or upload['status'] != 'uploading':
+        return jsonify({'status': 'error', 'message': 'アップロードが見つかりません'}), 404
+    execute("delete from app.training_video_uploads where id = :id", id=upload_id)
+    try:
+        os.remove(get_training_upload_part_path(upload_id))
+    except FileNotFoundError:
+        pass
+    return jsonify({'status': 'success', 'message': 'アップロードを破棄しました'})
+
+
+@app.route('/api/admin/training-videos/uploads/<upload_id>/complete', methods=['POST'])
+@login_required
+@role_required('admin')
+def api_admin_complete_training_upload(upload_id):
+    """管理者: 受信済みファイルを検証し、動画として登録する"""
+    upload = get_training_upload(upload_id)
+    if not upload:
+        return jsonify({'status': 'error', 'message': 'アップロードが見つかりません'}), 404
+    if upload['status'] == 'completed':
+        # 応答を受け取れずに再送された場合も同じ結果を返す
+        if upload.get('video_id') is None:
+            return jsonify({'status': 'error', 'message': '登録済みの動画は削除されています'}), 410
+        video_context = get_training_video_context(upload['video_id'], g.current_user, include_watchers=True)
+        return jsonify({'status': 'success', 'message': '動画を登録しました', 'data': video_context})
+
+    data = request.get_json() or {}
+    title = (data.get('title') or '').strip()
+    description = (data.get('description') or '').strip()
+    duration_value = data.get('duration_minutes', data.get('duration'))
+
+    errors = []
+    if not title:
+        errors.append('タイトルは必須です')
+    duration_minutes = None
+    if duration_value not in (None, ''):
+        try:
+            duration_minutes = int(duration_value)
+            if duration_minutes < 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            errors.append('想定視聴時間は0以上の数値で入力してください')
+    try:
+        expected_checksum = parse_sha256_header(f"sha256={data['sha256']}") if data.get('sha256') else upload.get('sha256')
+    except ValueError as exc:
+        errors.append(str(exc))
+    if errors:
+        return jsonify({'status': 'error', 'message': ' / '.join(errors)}), 400
+
+    part_path = get_training_upload_part_path(upload_id)
+    try:
+        handle = open(part_path, 'rb')
+    except FileNotFoundError:
+        return jsonify({'status': 'error', 'message': 'アップロードが見つかりません'}), 404
+    with handle:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return jsonify({'status': 'error', 'message': 'チャンクの書き込み中です'}), 409
+        # 同時に complete が届いても登録が一度だけになるよう、状態を先に確保する
+        claimed = fetch_one(
+            """
+            update app.training_video_uploads set status = 'finalizing', updated_at = now()
+            where id = :id and status = 'uploading'
+            returning id
+            """,
+            id=upload_id
         )
-        new_id = result.scalar()
+        if not claimed:
+            return jsonify({'status': 'error', 'message': 'このアップロードは処理中または完了済みです'}), 409
+        size = os.fstat(handle.fileno()).st_size
+        if size != upload['total_size']:
+            release_training_upload_claim(upload_id)
+            resp = jsonify({
+                'status': 'error',
+                'message': 'ファイルの受信が完了していません',
+                'data': {'offset': size, 'size': upload['total_size']}
+            })
+            resp.headers['Upload-Offset'] = str(size)
+            return resp, 409
+        checksum = sha256_file(part_path)
+        if expected_checksum and checksum != expected_checksum:
+            release_training_upload_claim(upload_id)
+            return jsonify({'status': 'error', 'message': 'ファイルのチェックサムが一致しません'}), 422
+
+        # 登録に失敗しても再試行できるよう、途中ファイルは残したままハードリンクをブロブへ取り込む。
+        # リンクできない（別ファイルシステムなど）場合は複製を取り込み、途中ファイルは渡さない
+        blob_tmp_path = os.path.join(BLOB_STORE_TMP_FOLDER, uuid4().hex)
+        try:
+            try:
+                os.link(part_path, blob_tmp_path)
+            except OSError:
+                shutil.copyfile(part_path, blob_tmp_path)
+            store_blob_file(blob_tmp_path, checksum, size)
+        except Exception:
+            if os.path.exists(blob_tmp_path):
+                os.remove(blob_tmp_path)
+            release_training_upload_claim(upload_id)
+            raise
+        safe_name = f"{checksum}.{upload['extension']}"
+
+    video_url = url_for('serve_training_video', filename=safe_name)
+    try:
+        with get_engine().begin() as conn:
+            new_id = conn.execute(
+                text(
+                    """
+                    insert into app.training_videos (title, description, url, duration_minutes, created_by)
+                    values (:title, :description, :url, :duration_minutes, :created_by)
+                    returning id
+                    """
+                ),
+                {
+                    'title': title,
+                    'description': description,
+                    'url': video_url,
+                    'duration_minutes': duration_minutes,
+                    'created_by': g.current_user['id']
+                }
+            ).scalar()
+            conn.execute(
+                text(
+                    """
+                    update app.training_video_uploads
+                    set status = 'completed', received_size = total_size, sha256 = :sha256,
+                        video_id = :video_id, updated_at = now()
+                    where id = :id
+                    """
+                ),
+                {'sha256': checksum, 'video_id': new_id, 'id': upload_id}
+            )
+    except Exception:
+        release_blob(checksum)
+        release_training_upload_claim(upload_id)
+        raise
+    try:
+        os.remove(part_path)
+    except FileNotFoundError:
+        pass
 
     video_context = get_training_video_context(new_id, g.current_user, include_watchers=True)
     return jsonify({
@@ -4657,6 +7733,103 @@ def api_admin_create_training_video():
     })
 
 
+# 動画配信の設定。MEDIA_OFFLOAD_MODE=x-accel / x-sendfile でバイト送出を前段プロキシへ任せる
+MEDIA_CACHE_MAX_AGE = int(os.environ.get('MEDIA_CACHE_MAX_AGE', str(60 * 60 * 24 * 30)))
+MEDIA_STREAM_CHUNK_SIZE = 256 * 1024
+MEDIA_OFFLOAD_MODE = (os.environ.get('MEDIA_OFFLOAD_MODE') or '').strip().lower()
+MEDIA_ACCEL_REDIRECT_PREFIX = os.environ.get('MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+
+
+def build_media_etag(stat_result) -> str:
+    """ファイルの i-node・サイズ・更新時刻から強い ETag を作る"""
+    seed = f"{stat_result.st_ino}-{stat_result.st_size}-{stat_result.st_mtime_ns}"
+    return hashlib.sha1(seed.encode('utf-8')).hexdigest()
+
+
+def iter_file_range(path: str, start: int, length: int):
+    """ファイルの指定範囲を一定サイズずつ読み出す"""
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = handle.read(min(MEDIA_STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def send_media_file(path: str | None, filename: str, offload_location: str, etag: str | None = None):
+    """Range・条件付きリクエストに対応してメディアファイルを返す。
+
+    複数範囲の Range は 416 で拒否する。オフロード設定時は本体を返さず
+    X-Accel-Redirect（offload_location）/ X-Sendfile で前段にファイル送出を任せる。
+    """
+    if not path or not os.path.isfile(path):
+        abort(404)
+    stat_result = os.stat(path)
+    size = stat_result.st_size
+    etag = etag or build_media_etag(stat_result)
+    last_modified = datetime.fromtimestamp(int(stat_result.st_mtime), tz=pytz.utc)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    def finalize(resp):
+        resp.set_etag(etag)
+        resp.headers['Last-Modified'] = http_date(last_modified)
+        resp.headers['Cache-Control'] = f'private, max-age={MEDIA_CACHE_MAX_AGE}'
+        resp.headers['Accept-Ranges'] = 'bytes'
+        return resp
+
+    if MEDIA_OFFLOAD_MODE in {'x-accel', 'x-sendfile'}:
+        resp = Response(status=200, mimetype=mimetype)
+        if MEDIA_OFFLOAD_MODE == 'x-accel':
+            resp.headers['X-Accel-Redirect'] = f"{MEDIA_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{quote(offload_location.lstrip('/'))}"
+        else:
+            resp.headers['X-Sendfile'] = path
+        # Range や条件付きの判定は前段のプロキシが行う
+        resp.headers['Cache-Control'] = f'private, max-age={MEDIA_CACHE_MAX_AGE}'
+        return resp
+
+    # If-None-Match があれば If-Modified-Since より優先する
+    if request.if_none_match:
+        if request.if_none_match.contains_weak(etag):
+            return finalize(Response(status=304))
+    elif request.if_modified_since and request.if_modified_since >= last_modified:
+        return finalize(Response(status=304))
+
+    byte_range = request.range
+    if byte_range is not None and 'If-Range' in request.headers:
+        if_range = request.if_range
+        # If-Range が一致しない場合は Range を無視して全体を返す（弱い ETag は一致扱いにしない）
+        if if_range.etag is not None:
+            if if_range.etag != etag:
+                byte_range = None
+        elif if_range.date is None or if_range.date != last_modified:
+            byte_range = None
+
+    if byte_range is None or byte_range.units != 'bytes':
+        resp = Response(iter_file_range(path, 0, size), status=200, mimetype=mimetype, direct_passthrough=True)
+        resp.content_length = size
+        return finalize(resp)
+
+    # 複数範囲（multipart/byteranges）には対応せず、満たせない範囲と同様に 416 を返す
+    span = byte_range.range_for_length(size) if len(byte_range.ranges) == 1 else None
+    if span is None:
+        resp = Response(status=416)
+        resp.headers['Content-Range'] = f'bytes */{size}'
+        return finalize(resp)
+
+    start, stop = span
+    resp = Response(iter_file_range(path, start, stop - start), status=206, mimetype=mimetype, direct_passthrough=True)
+    resp.content_length = stop - start
+    resp.headers['Content-Range'] = f'bytes {start}-{stop - 1}/{size}'
+    return finalize(resp)
+
+
+# 保存済みファイルの URL は参照数を持たないため、フォームからの指定は受け付けない
+TRAINING_VIDEO_LOCAL_URL_ERROR = 'アップロード済みファイルのURLは指定できません。動画ファイルをアップロードしてください'
+
+
 def get_training_video_file_path(video_url: str) -> str | None:
     """保存済み動画URLからローカルファイルパスを取得"""
     if not video_url:
@@ -4674,8 +7847,12 @@ def get_training_video_file_path(video_url: str) -> str | None:
 
 
 def remove_training_video_file(video_url: str):
-    """ローカルに保存している動画ファイルを削除"""
+    """ローカルに保存している動画ファイルの参照を外す（ブロブは最後の参照で削除）"""
     file_path = get_training_video_file_path(video_url)
+    digest = parse_blob_name(os.path.basename(file_path)) if file_path else None
+    if digest:
+        release_blob(digest)
+        return
     if file_path and os.path.exists(file_path):
         try:
             os.remove(file_path)
@@ -4683,21 +7860,20 @@ def remove_training_video_file(video_url: str):
             app.logger.warning("Failed to remove training video file: %s", file_path)
 
 
-def save_training_video_upload(uploaded_file):
-    """アップロードされた動画ファイルを保存しURLを返す"""
+def validate_training_video_upload(uploaded_file) -> str | None:
+    """アップロードされた動画ファイルを検証し、問題があればエラーメッセージを返す"""
     if not uploaded_file or not uploaded_file.filename:
-        return None, '動画ファイルが選択されていません'
+        return '動画ファイルが選択されていません'
+    if not allowed_training_video_filename(uploaded_file.filename):
+        return '対応していない動画形式です (mp4, mov, avi, mkv, wmv, m4v)'
+    return None
 
-    filename = uploaded_file.filename
-    if not allowed_training_video_filename(filename):
-        return None, '対応していない動画形式です (mp4, mov, avi, mkv, wmv, m4v)'
 
-    extension = filename.rsplit('.', 1)[1].lower()
-    unique_name = f"{uuid4().hex}.{extension}"
-    safe_name = secure_filename(unique_name)
-    save_path = os.path.join(TRAINING_VIDEO_UPLOAD_FOLDER, safe_name)
-    uploaded_file.save(save_path)
-    return url_for('serve_training_video', filename=safe_name), None
+def save_training_video_upload(uploaded_file) -> str:
+    """検証済みの動画ファイルをブロブとして保存しURLを返す（参照が1つ増える）"""
+    extension = uploaded_file.filename.rsplit('.', 1)[1].lower()
+    digest, _ = store_blob_stream(uploaded_file.stream)
+    return url_for('serve_training_video', filename=f"{digest}.{extension}")
 
 
 @app.route('/api/admin/training-videos/<int:video_id>', methods=['PUT'])
@@ -4727,17 +7903,16 @@ def api_admin_update_training_video(video_id):
 
     video_url = existing['url']
     old_url_to_remove = None
+    has_upload = bool(uploaded_file and uploaded_file.filename)
 
-    if uploaded_file and uploaded_file.filename:
-        saved_url, upload_error = save_training_video_upload(uploaded_file)
+    if has_upload:
+        upload_error = validate_training_video_upload(uploaded_file)
         if upload_error:
             errors.append(upload_error)
-        else:
-            if video_url != saved_url and get_training_video_file_path(video_url):
-                old_url_to_remove = video_url
-            video_url = saved_url
-    elif url_value:
-        if url_value != video_url and get_training_video_file_path(video_url):
+    elif url_value and url_value != video_url:
+        if get_training_video_file_path(url_value):
+            errors.append(TRAINING_VIDEO_LOCAL_URL_ERROR)
+        elif get_training_video_file_path(video_url):
             old_url_to_remove = video_url
         video_url = url_value
 
@@ -4750,32 +7925,48 @@ def api_admin_update_training_video(video_id):
         except (TypeError, ValueError):
             errors.append('想定視聴時間は0以上の数値で入力してください')
 
-    if not video_url:
+    if not video_url and not has_upload:
         errors.append('動画URLまたは動画ファイルのいずれかを指定してください')
 
     if errors:
         return jsonify({'status': 'error', 'message': ' / '.join(errors)}), 400
 
-    with engine.begin() as conn:
-        conn.execute(
-            text(
-                """
-                update app.training_videos
-                set title = :title,
-                    description = :description,
-                    url = :url,
-                    duration_minutes = :duration_minutes
-                where id = :video_id
-                """
-            ),
-            {
-                'video_id': video_id,
-                'title': title,
-                'description': description,
-                'url': video_url,
-                'duration_minutes': duration_minutes
-            }
-        )
+    # 検証がすべて通ってから保存し、以降の失敗では増やした参照を戻す
+    new_url = None
+    if has_upload:
+        saved_url = save_training_video_upload(uploaded_file)
+        if saved_url == video_url:
+            # 同じ内容の再アップロードは参照が二重になるので、今回増えた分を戻す
+            remove_training_video_file(saved_url)
+        else:
+            if get_training_video_file_path(video_url):
+                old_url_to_remove = video_url
+            video_url = new_url = saved_url
+    try:
+        with get_engine().begin() as conn:
+            conn.execute(
+                text(
+                    """
+                    update app.training_videos
+                    set title = :title,
+                        description = :description,
+                        url = :url,
+                        duration_minutes = :duration_minutes
+                    where id = :video_id
+                    """
+                ),
+                {
+                    'video_id': video_id,
+                    'title': title,
+                    'description': description,
+                    'url': video_url,
+                    'duration_minutes': duration_minutes
+                }
+            )
+    except Exception:
+        if new_url:
+            remove_training_video_file(new_url)
+        raise
 
     if old_url_to_remove:
         remove_training_video_file(old_url_to_remove)
@@ -4800,11 +7991,12 @@ def api_admin_delete_training_video(video_id):
     if not existing:
         return jsonify({'status': 'error', 'message': '動画が見つかりません'}), 404
 
-    with engine.begin() as conn:
+    with get_engine().begin() as conn:
         conn.execute(
             text("delete from app.training_videos where id = :video_id"),
             {'video_id': video_id}
         )
+    TRAINING_VIDEO_ID_CACHE['ids'].discard(video_id)
 
     remove_training_video_file(existing['url'])
 
@@ -4818,20 +8010,27 @@ def api_admin_delete_training_video(video_id):
 @role_required('admin')
 def admin_training_videos():
     """管理者向け編集インプット動画管理"""
-    videos = get_training_videos_for_portal(g.current_user, include_watchers=True)
-    summary = {
-        'total_videos': len(videos),
-        'completed_count': len([v for v in videos if v['avg_progress'] >= 99]),
-        'in_progress_count': len([v for v in videos if 0 < v['avg_progress'] < 99]),
-        'not_started_count': len([v for v in videos if v['avg_progress'] == 0])
-    }
-    overall_completion = int(round(sum(v['avg_progress'] for v in videos) / len(videos))) if videos else 0
+    cursor = (request.args.get('cursor') or '').strip() or None
+    try:
+        videos, next_cursor = get_training_videos_for_portal(
+            g.current_user,
+            include_watchers=True,
+            cursor=cursor,
+            limit=TRAINING_VIDEO_PAGE_SIZE
+        )
+    except ValueError:
+        return redirect(url_for('admin_training_videos'))
+
+    totals = get_training_video_summary(g.current_user)
+    summary = {'total_videos': totals['total_videos'], **totals['by_average']}
     return render_template(
         'admin/training_videos.html',
         videos=videos,
         status_options=TRAINING_STATUS_OPTIONS,
         summary=summary,
-        overall_completion=overall_completion
+        overall_completion=totals['overall_completion'],
+        cursor=cursor,
+        next_cursor=next_cursor
     )
 
 
@@ -4866,11 +8065,74 @@ def admin_gantt():
         selected_filters=params,
         project_choices=filter_options.get('projects', []),
         dependency_types=sorted(TASK_DEPENDENCY_TYPES),
-        current_view='plan'
+        current_view='plan',
+        data_version=current_data_version()
     )
 
 
+@app.route('/api/admin/metrics')
+@login_required
+@role_required('admin')
+def api_admin_metrics():
+    """管理者: キャッシュ等の稼働指標"""
+    return jsonify({
+        'status': 'success',
+        'data': {
+            'auto_gantt': get_auto_gantt_memo_stats(),
+            'project_summary': get_project_summary_cache_stats(),
+            'db_pool': get_db_pool_stats(),
+            'user_cache': get_user_cache_stats(),
+            'startup': STARTUP_TIMINGS,
+            'training_progress': get_training_progress_stats()
+        }
+    })
+
+
+# ===== 起動処理 =====
+MODULE_IMPORT_MS = round((time.perf_counter() - MODULE_IMPORT_STARTED) * 1000, 1)
+# DB の準備や初期データの投入は import 時には行わず、bootstrap()（gunicorn --preload ではマスターで一度）
+# か最初のリクエストでまとめて実行する。フォーク後のワーカーは読み込み済みの状態を共有する。
+# ルートはモジュールの app に登録しているため、設定の異なるアプリを作り分けることはできない。
+BOOTSTRAP_STEPS = [
+    ('schema_migrations', run_schema_migrations),
+    ('editor_shared_settings', load_editor_shared_settings),
+    ('primary_owner_account', sync_primary_owner_account),
+    ('blob_refcounts', rebuild_blob_refcounts),
+    ('report_font', ensure_reportlab_font),
+    ('task_cache', load_tasks_from_db),
+    ('project_gantt_tasks', initialize_all_project_tasks),
+]
+BOOTSTRAP_STATE = {'done': False}
+BOOTSTRAP_LOCK = threading.Lock()
+STARTUP_TIMINGS = {'import_ms': MODULE_IMPORT_MS, 'steps': [], 'total_ms': None, 'pid': None}
+
+
+def bootstrap():
+    """起動時の初期化を一度だけ実行し、手順ごとの所要時間を記録する"""
+    if BOOTSTRAP_STATE['done']:
+        return
+    with BOOTSTRAP_LOCK:
+        if BOOTSTRAP_STATE['done']:
+            return
+        steps = []
+        started = time.perf_counter()
+        for name, step in BOOTSTRAP_STEPS:
+            step_started = time.perf_counter()
+            step()
+            steps.append({'step': name, 'ms': round((time.perf_counter() - step_started) * 1000, 1)})
+        STARTUP_TIMINGS['steps'] = steps
+        STARTUP_TIMINGS['total_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        STARTUP_TIMINGS['pid'] = os.getpid()
+        BOOTSTRAP_STATE['done'] = True
+        breakdown = ' '.join(f"{entry['step']}={entry['ms']}ms" for entry in steps)
+        print(
+            f"[startup] pid={os.getpid()} import={STARTUP_TIMINGS['import_ms']}ms "
+            f"bootstrap={STARTUP_TIMINGS['total_ms']}ms {breakdown}"
+        )
+
+
 if __name__ == '__main__':
+    bootstrap()
     app.run(debug=True, host='127.0.0.1', port=5001)
 
 
@@ -4878,5 +8140,18 @@ if __name__ == '__main__':
 @login_required
 @role_required('admin', 'editor')
 def serve_training_video(filename):
-    return send_from_directory(TRAINING_VIDEO_UPLOAD_FOLDER, filename)
+    digest = parse_blob_name(filename)
+    if digest and os.path.isfile(get_blob_path(digest)):
+        # 内容のダイジェストがそのまま強い ETag になる
+        return send_media_file(
+            get_blob_path(digest),
+            filename,
+            offload_location=f"blobs/{digest[:2]}/{digest}",
+            etag=digest
+        )
+    return send_media_file(
+        safe_join(TRAINING_VIDEO_UPLOAD_FOLDER, filename),
+        filename,
+        offload_location=f"training_videos/{filename}"
+    )
 
@@ -0,0 +1,105 @@
+"""収支レポートPDF生成のベンチマーク.
+
+合成した請求・支払を持つ台帳からレポートを書き出し、件数ごとの
+ページ数・ページ/秒・行/秒・ピークメモリ（tracemalloc）を表示します。
+ピークメモリは時間計測とは別の描画で測ります。
+
+    python bench_finance_report.py --rows 1000 10000 50000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import app as report_app
+
+STATUSES_INVOICE = [value for value, _ in report_app.FINANCE_INVOICE_STATUS_DEFINITIONS]
+STATUSES_PAYOUT = [value for value, _ in report_app.FINANCE_PAYOUT_STATUS_DEFINITIONS]
+
+
+def build_ledger(rows: int) -> report_app.FinanceLedger:
+    """請求・支払を rows 件ずつ持つ台帳を作る"""
+    invoices = [
+        {
+            'id': index + 1,
+            'project_name': f'案件{index % 400:03d} プロモーション動画制作',
+            'amount': 50000 + (index * 7919) % 450000,
+            'issue_date': f'2024-{index % 12 + 1:02d}-{index % 28 + 1:02d}',
+            'status': STATUSES_INVOICE[index % len(STATUSES_INVOICE)]
+        }
+        for index in range(rows)
+    ]
+    payouts = [
+        {
+            'id': index + 1,
+            'editor': f'編集者{index % 60:02d}',
+            'project_name': f'案件{index % 400:03d} プロモーション動画制作',
+            'amount': 20000 + (index * 6271) % 200000,
+            'status': STATUSES_PAYOUT[index % len(STATUSES_PAYOUT)]
+        }
+        for index in range(rows)
+    ]
+    return report_app.FinanceLedger(invoices, payouts)
+
+
+def render(report_data, path: str) -> float:
+    started = time.perf_counter()
+    report_app.build_finance_report_pdf(report_data, generated_by='bench', output=path)
+    return time.perf_counter() - started
+
+
+def run(rows: int, output_dir: str, measure_memory: bool) -> dict:
+    ledger = build_ledger(rows)
+    report_data = report_app.gather_finance_report_data(ledger)
+    path = os.path.join(output_dir, f'finance_{rows}.pdf')
+
+    elapsed = render(report_data, path)
+    peak = None
+    if measure_memory:
+        # tracemalloc は描画を数倍遅くするため、時間計測とは別に回す
+        tracemalloc.start()
+        render(report_data, path)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    with open(path, 'rb') as handle:
+        pages = handle.read().count(b'/Type /Page\n')
+    return {
+        'rows': rows * 2,
+        'pages': pages,
+        'seconds': elapsed,
+        'peak_mb': peak / 1024 / 1024 if peak is not None else None,
+        'size_mb': os.path.getsize(path) / 1024 / 1024
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 50000],
+                        help='請求・支払それぞれの件数')
+    parser.add_argument('--no-memory', action='store_true', help='ピークメモリの計測を省く')
+    args = parser.parse_args()
+
+    if not report_app.REPORTLAB_AVAILABLE:
+        raise SystemExit('reportlab がインストールされていません')
+    report_app.ensure_reportlab_font()
+
+    print(f"{'rows':>8} {'pages':>6} {'sec':>8} {'pages/s':>8} {'rows/s':>9} {'peak MB':>8} {'KB/page':>8} {'file MB':>8}")
+    with tempfile.TemporaryDirectory() as output_dir:
+        for rows in args.rows:
+            result = run(rows, output_dir, measure_memory=not args.no_memory)
+            if result['peak_mb'] is None:
+                memory = f"{'-':>8} {'-':>8}"
+            else:
+                memory = f"{result['peak_mb']:>8.1f} {result['peak_mb'] * 1024 / result['pages']:>8.1f}"
+            print(
+                f"{result['rows']:>8} {result['pages']:>6} {result['seconds']:>8.2f} "
+                f"{result['pages'] / result['seconds']:>8.1f} {result['rows'] / result['seconds']:>9.0f} "
+                f"{memory} {result['size_mb']:>8.2f}"
+            )
+
+
+if __name__ == '__main__':
+    main()
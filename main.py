@@ -1,12 +1,16 @@
 """Gunicorn エントリーポイント.
 
 Railway 側の起動コマンドが `gunicorn main:app` を想定しているため、
-既存の `app.py` で定義された Flask アプリを公開する薄いラッパーです。
+`app.py` で定義された Flask アプリを初期化してから公開する薄いラッパーです。
+`--preload` 付きで起動すると初期化はマスタープロセスで一度だけ行われ、
+各ワーカーはフォーク時の状態をそのまま共有します。
 """
 
 import os
 
-from app import app
+from app import app, bootstrap
+
+bootstrap()
 
 
 if __name__ == "__main__":
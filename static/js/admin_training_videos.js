@@ -1,3 +1,108 @@
+// 分割アップロード（/api/admin/training-videos/uploads）。同じファイルを再選択すると途中から再開する
+const TRAINING_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024;
+const TRAINING_UPLOAD_RETRY_LIMIT = 5;
+
+const trainingUploadStorageKey = (file) => `trainingUpload:${file.name}:${file.size}:${file.lastModified}`;
+
+const toHex = (buffer) => Array.from(new Uint8Array(buffer)).map(byte => byte.toString(16).padStart(2, '0')).join('');
+
+async function digestChunk(blob) {
+    if (!window.crypto || !window.crypto.subtle) return null;
+    const buffer = await blob.arrayBuffer();
+    return toHex(await window.crypto.subtle.digest('SHA-256', buffer));
+}
+
+async function readJson(response) {
+    try {
+        return await response.json();
+    } catch (error) {
+        return {};
+    }
+}
+
+async function startOrResumeTrainingUpload(file) {
+    const storageKey = trainingUploadStorageKey(file);
+    const savedId = window.localStorage.getItem(storageKey);
+    if (savedId) {
+        const response = await fetch(`/api/admin/training-videos/uploads/${savedId}`);
+        const result = await readJson(response);
+        if (response.ok && result.status === 'success' && result.data.status === 'uploading') {
+            return result.data;
+        }
+        window.localStorage.removeItem(storageKey);
+    }
+
+    const response = await fetch('/api/admin/training-videos/uploads', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ filename: file.name, size: file.size })
+    });
+    const result = await readJson(response);
+    if (!response.ok || result.status !== 'success') {
+        throw new Error(result.message || 'アップロードを開始できませんでした。');
+    }
+    window.localStorage.setItem(storageKey, result.data.upload_id);
+    return result.data;
+}
+
+async function uploadTrainingVideoFile(file, fields, onProgress) {
+    const upload = await startOrResumeTrainingUpload(file);
+    const chunkSize = Math.min(TRAINING_UPLOAD_CHUNK_SIZE, upload.chunk_max_bytes || TRAINING_UPLOAD_CHUNK_SIZE);
+    let offset = upload.offset || 0;
+    let failures = 0;
+
+    while (offset < file.size) {
+        if (onProgress) onProgress(offset / file.size);
+        const chunk = file.slice(offset, Math.min(offset + chunkSize, file.size));
+        const headers = { 'Upload-Offset': String(offset), 'Content-Type': 'application/octet-stream' };
+        const checksum = await digestChunk(chunk);
+        if (checksum) headers['Upload-Checksum'] = `sha256=${checksum}`;
+
+        let response;
+        try {
+            response = await fetch(`/api/admin/training-videos/uploads/${upload.upload_id}`, {
+                method: 'PUT',
+                headers,
+                body: chunk
+            });
+        } catch (error) {
+            response = null;
+        }
+
+        const serverOffset = response ? response.headers.get('Upload-Offset') : null;
+        if (response && response.ok) {
+            offset = Number(serverOffset);
+            failures = 0;
+            continue;
+        }
+        if (response && response.status === 409 && serverOffset !== null) {
+            // 別タブ等で進んでいた場合はサーバー側の位置に合わせる
+            offset = Number(serverOffset);
+            continue;
+        }
+        failures += 1;
+        if (failures > TRAINING_UPLOAD_RETRY_LIMIT || (response && response.status < 500 && response.status !== 408)) {
+            const result = response ? await readJson(response) : {};
+            throw new Error(result.message || 'アップロードが中断されました。もう一度登録すると続きから再開します。');
+        }
+        await new Promise(resolve => setTimeout(resolve, 1000 * failures));
+        if (serverOffset !== null) offset = Number(serverOffset);
+    }
+    if (onProgress) onProgress(1);
+
+    const response = await fetch(`/api/admin/training-videos/uploads/${upload.upload_id}/complete`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(fields)
+    });
+    const result = await readJson(response);
+    if (!response.ok || result.status !== 'success') {
+        throw new Error(result.message || '登録に失敗しました。');
+    }
+    window.localStorage.removeItem(trainingUploadStorageKey(file));
+    return result;
+}
+
 document.addEventListener('DOMContentLoaded', () => {
     const form = document.getElementById('adminTrainingForm');
     const message = document.getElementById('adminTrainingMessage');
@@ -90,15 +195,28 @@ document.addEventListener('DOMContentLoaded', () => {
                     message.classList.remove('error');
                 }
 
-                const response = await fetch('/api/admin/training-videos', {
-                    method: 'POST',
-                    body: formData
-                });
+                const videoFile = formData.get('video_file');
+                if (videoFile && videoFile.size > 0) {
+                    await uploadTrainingVideoFile(videoFile, {
+                        title,
+                        description: (formData.get('description') || '').trim(),
+                        duration_minutes: formData.get('duration_minutes') || null
+                    }, (ratio) => {
+                        if (message) {
+                            message.textContent = `アップロード中... ${Math.floor(ratio * 100)}%`;
+                        }
+                    });
+                } else {
+                    const response = await fetch('/api/admin/training-videos', {
+                        method: 'POST',
+                        body: formData
+                    });
 
-                const result = await response.json();
-                if (!response.ok || result.status !== 'success') {
-                    const errorMessage = result && result.message ? result.message : '登録に失敗しました。';
-                    throw new Error(errorMessage);
+                    const result = await response.json();
+                    if (!response.ok || result.status !== 'success') {
+                        const errorMessage = result && result.message ? result.message : '登録に失敗しました。';
+                        throw new Error(errorMessage);
+                    }
                 }
 
                 if (message) {
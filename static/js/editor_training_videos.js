@@ -66,7 +66,8 @@ function updateTrainingCard(card, data) {
         lastViewed.textContent = data.user_last_viewed || '---';
     }
 
-    if (window.trainingVideoPage && window.trainingVideoPage.includeWatchers) {
+    // 進捗保存の応答は自分の進捗だけを返すため、集計・視聴者一覧は含まれているときだけ更新する
+    if (window.trainingVideoPage && window.trainingVideoPage.includeWatchers && 'total_viewers' in data) {
         const summary = card.querySelector('.training-stats');
         if (summary) {
             summary.querySelectorAll('span')[2].textContent = `視聴者: ${data.total_viewers}名 / 完了 ${data.completed_viewers}名`;
@@ -83,6 +84,7 @@ function updateTrainingCard(card, data) {
             if (emptyMessage) {
                 emptyMessage.remove();
             }
+            const moreButton = watchersPanel.querySelector('.watchers-more');
             if (data.watchers && data.watchers.length > 0) {
                 const table = document.createElement('table');
                 table.className = 'watchers-table';
@@ -106,13 +108,19 @@ function updateTrainingCard(card, data) {
                         `).join('')}
                     </tbody>
                 `;
-                watchersPanel.appendChild(table);
+                watchersPanel.insertBefore(table, moreButton);
             } else {
                 const empty = document.createElement('p');
                 empty.className = 'empty';
                 empty.textContent = 'まだ視聴したメンバーはいません。';
                 watchersPanel.appendChild(empty);
             }
+
+            // 保存後は先頭ページに戻るため、続き読み込みの位置と検索条件もリセットする
+            watchersPanel.dataset.nextCursor = data.watchers_next_cursor || '';
+            if (moreButton) moreButton.hidden = !data.watchers_next_cursor;
+            const searchInput = watchersPanel.querySelector('.watchers-search');
+            if (searchInput) searchInput.value = '';
         }
     }
 }
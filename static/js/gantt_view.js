@@ -5,6 +5,7 @@
         taskMap: new Map(),
         selectedTaskId: null,
         projectSummary: [],
+        version: null,
         dependenciesBuffer: [],
         view: (window.GANTT_CURRENT_VIEW || 'plan'),
         role: window.GANTT_USER_ROLE || 'editor',
@@ -95,6 +96,7 @@
         state.projectSummary = Array.isArray(window.GANTT_PROJECT_SUMMARY)
             ? window.GANTT_PROJECT_SUMMARY
             : [];
+        state.version = window.GANTT_DATA_VERSION || null;
         syncTaskMap(state.allTasks);
         state.filteredTasks = [...state.allTasks];
         renderGantt();
@@ -157,7 +159,7 @@
 
     function bindEvents() {
         if (refs.addButton) refs.addButton.addEventListener('click', openTaskModal);
-        if (refs.refreshButton) refs.refreshButton.addEventListener('click', () => refreshTasks());
+        if (refs.refreshButton) refs.refreshButton.addEventListener('click', () => refreshTasks({ full: true }));
 
         if (refs.filterKeyword) {
             refs.filterKeyword.addEventListener('keydown', (event) => {
@@ -427,7 +429,7 @@
             start_date: refs.filterStart ? refs.filterStart.value : '',
             end_date: refs.filterEnd ? refs.filterEnd.value : ''
         };
-        refreshTasks({ showLoading: true });
+        refreshTasks({ showLoading: true, full: true });
     }
 
     function resetFilters() {
@@ -438,11 +440,151 @@
         if (refs.filterKeyword) refs.filterKeyword.value = '';
         if (refs.filterStart) refs.filterStart.value = '';
         if (refs.filterEnd) refs.filterEnd.value = '';
-        refreshTasks({ showLoading: true });
+        refreshTasks({ showLoading: true, full: true });
     }
 
-    function refreshTasks() {
-        window.location.reload();
+    const GANTT_FETCH_FIELDS = [
+        'id', 'name', 'title', 'project_id', 'project_name', 'company_name', 'assignee',
+        'status', 'priority', 'type', 'progress', 'plan_start', 'plan_end', 'actual_start',
+        'actual_end', 'due_date', 'order_index', 'dependencies', 'dependencies_string',
+        'notes', 'updated_at', 'updated_by', 'created_by', 'task_origin'
+    ];
+    const GANTT_PAGE_SIZE = 500;
+
+    function buildFilterParams() {
+        const params = new URLSearchParams();
+        Object.entries(state.filters).forEach(([key, value]) => {
+            if (value) params.set(key, value);
+        });
+        return params;
+    }
+
+    function buildTaskQuery(cursor, includeSummary) {
+        const params = buildFilterParams();
+        params.set('view', state.view);
+        params.set('limit', String(GANTT_PAGE_SIZE));
+        params.set('fields', GANTT_FETCH_FIELDS.join(','));
+        if (cursor) params.set('cursor', cursor);
+        if (includeSummary) params.set('include', 'projects_summary');
+        return `/api/gantt/tasks?${params.toString()}`;
+    }
+
+    function fetchTaskPages() {
+        const collected = [];
+        let summary = null;
+        let version = null;
+
+        const fetchPage = (cursor) => fetch(buildTaskQuery(cursor, !cursor))
+            .then(res => res.json())
+            .then(json => {
+                if (json.status !== 'success') {
+                    throw new Error(json.message || 'タスクの取得に失敗しました');
+                }
+                collected.push(...(json.data || []));
+                const meta = json.meta || {};
+                if (!cursor) {
+                    summary = Array.isArray(meta.projects_summary) ? meta.projects_summary : [];
+                    version = meta.version || null;
+                }
+                if (meta.next_cursor) {
+                    return fetchPage(meta.next_cursor);
+                }
+                return { tasks: collected, summary, version };
+            });
+
+        return fetchPage(null);
+    }
+
+    function applyChanges(changes) {
+        const removed = new Set((changes.removed || []).map(Number));
+        const byId = new Map(state.allTasks.filter(task => !removed.has(task.id)).map(task => [task.id, task]));
+        (changes.tasks || []).forEach(task => {
+            const normalized = normalizeTask(task);
+            byId.set(normalized.id, normalized);
+        });
+
+        if (Array.isArray(changes.order)) {
+            state.allTasks = changes.order.map(id => byId.get(Number(id))).filter(Boolean);
+        } else {
+            state.allTasks = Array.from(byId.values());
+        }
+
+        (changes.projects_summary || []).forEach(entry => {
+            const index = state.projectSummary.findIndex(project => project.project_id === entry.project_id);
+            if (index !== -1) {
+                state.projectSummary[index] = entry;
+            } else {
+                state.projectSummary.push(entry);
+            }
+        });
+        state.projectSummary.sort((a, b) => {
+            const companyA = a.company_name || '';
+            const companyB = b.company_name || '';
+            if (companyA !== companyB) return companyA < companyB ? -1 : 1;
+            const nameA = a.project_name || '';
+            const nameB = b.project_name || '';
+            if (nameA === nameB) return 0;
+            return nameA < nameB ? -1 : 1;
+        });
+    }
+
+    function fetchChanges() {
+        const params = buildFilterParams();
+        params.set('since', String(state.version));
+        return fetch(`/api/gantt/changes?${params.toString()}`)
+            .then(res => res.json())
+            .then(json => {
+                if (json.status !== 'success') {
+                    throw new Error(json.message || '差分の取得に失敗しました');
+                }
+                return json.data || {};
+            });
+    }
+
+    function refreshTasks(options = {}) {
+        const { showLoading = false, keepSelection = false, full = false } = options;
+        if (showLoading && refs.container) {
+            refs.container.style.visibility = 'hidden';
+        }
+
+        const afterRender = () => {
+            if (keepSelection && state.selectedTaskId != null && state.taskMap.has(state.selectedTaskId)) {
+                openSidePanel(state.selectedTaskId);
+            } else if (!keepSelection) {
+                closeSidePanel();
+            }
+        };
+
+        const fullRefresh = () => fetchTaskPages().then(({ tasks, summary, version }) => {
+            state.allTasks = normalizeTasks(tasks);
+            state.projectSummary = summary;
+            state.version = version;
+        });
+
+        // 保存後などは差分だけ取り込み、変更ログが途切れていれば全件を取り直す
+        const load = (full || state.version == null)
+            ? fullRefresh()
+            : fetchChanges().then(changes => {
+                if (changes.resync) {
+                    return fullRefresh();
+                }
+                applyChanges(changes);
+                state.version = changes.version;
+                return null;
+            });
+
+        return load
+            .then(() => {
+                state.filteredTasks = [...state.allTasks];
+                syncTaskMap(state.allTasks);
+                renderGantt();
+                afterRender();
+            })
+            .catch(error => {
+                console.error(error);
+                // 取得に失敗した場合はページ全体を読み直す
+                window.location.reload();
+            });
     }
 
     function openSidePanel(taskId) {
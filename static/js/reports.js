@@ -0,0 +1,58 @@
+// 収支レポートはバックグラウンドで作成し、完了後にダウンロードする
+const REPORT_POLL_INTERVAL = 1000;
+const REPORT_POLL_TIMEOUT = 10 * 60 * 1000;
+
+async function requestReportJob(link, statusElement) {
+    const setStatus = (message, isError = false) => {
+        if (!statusElement) return;
+        statusElement.textContent = message;
+        statusElement.classList.toggle('error', isError);
+    };
+
+    link.classList.add('disabled');
+    try {
+        let response = await fetch(link.dataset.reportJobUrl, { method: 'POST' });
+        let result = await response.json();
+        if (!response.ok || result.status !== 'success') {
+            throw new Error(result.message || 'レポートの作成に失敗しました。');
+        }
+        let job = result.data;
+        const deadline = Date.now() + REPORT_POLL_TIMEOUT;
+        while (['queued', 'running'].includes(job.status)) {
+            if (Date.now() > deadline) {
+                throw new Error('レポートの作成がタイムアウトしました。時間をおいて再度お試しください。');
+            }
+            setStatus(`レポートを作成中... ${job.progress}%`);
+            await new Promise(resolve => setTimeout(resolve, REPORT_POLL_INTERVAL));
+            response = await fetch(job.status_url);
+            // 別のワーカーに届いて状態がまだ見えない場合は、作成中として待ち続ける
+            if (response.status === 404) continue;
+            result = await response.json();
+            if (!response.ok || result.status !== 'success') {
+                throw new Error(result.message || 'レポートの作成に失敗しました。');
+            }
+            job = result.data;
+        }
+        if (job.status !== 'done') {
+            throw new Error(job.error || 'レポートの作成に失敗しました。');
+        }
+        setStatus('');
+        window.location.href = job.download_url;
+    } catch (error) {
+        console.error(error);
+        setStatus(error.message || 'レポートの作成に失敗しました。', true);
+    } finally {
+        link.classList.remove('disabled');
+    }
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('[data-report-job-url]').forEach(link => {
+        link.addEventListener('click', (event) => {
+            event.preventDefault();
+            if (link.classList.contains('disabled')) return;
+            const statusElement = link.parentElement.querySelector('[data-role="report-status"]');
+            requestReportJob(link, statusElement);
+        });
+    });
+});
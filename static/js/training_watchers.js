@@ -0,0 +1,73 @@
+// 視聴者一覧の検索・追加読み込み（動画ごとに /api/admin/training-videos/<id>/watchers を呼ぶ）
+function buildWatcherRow(watcher) {
+    const row = document.createElement('tr');
+    [
+        watcher.name,
+        watcher.status,
+        `${watcher.progress_percent}%`,
+        watcher.last_viewed_at || '---'
+    ].forEach(value => {
+        const cell = document.createElement('td');
+        cell.textContent = value;
+        row.appendChild(cell);
+    });
+    return row;
+}
+
+async function loadWatcherPage(panel, { reset = false } = {}) {
+    const videoId = panel.getAttribute('data-video-id');
+    const tbody = panel.querySelector('.watchers-table tbody');
+    const moreButton = panel.querySelector('.watchers-more');
+    const searchInput = panel.querySelector('.watchers-search');
+    if (!videoId || !tbody) return;
+
+    const params = new URLSearchParams();
+    const cursor = reset ? '' : (panel.dataset.nextCursor || '');
+    const query = searchInput ? searchInput.value.trim() : '';
+    if (cursor) params.set('cursor', cursor);
+    if (query) params.set('q', query);
+
+    // 入力中に古い応答が返ってきても上書きしないよう、要求ごとに番号を振る
+    const requestId = String((Number(panel.dataset.requestId) || 0) + 1);
+    panel.dataset.requestId = requestId;
+
+    try {
+        if (moreButton) moreButton.disabled = true;
+        const response = await fetch(`/api/admin/training-videos/${videoId}/watchers?${params.toString()}`);
+        const result = await response.json();
+        if (!response.ok || result.status !== 'success') {
+            throw new Error(result && result.message ? result.message : '視聴者の取得に失敗しました。');
+        }
+        if (panel.dataset.requestId !== requestId) return;
+
+        if (reset) {
+            tbody.innerHTML = '';
+        }
+        result.data.forEach(watcher => tbody.appendChild(buildWatcherRow(watcher)));
+        panel.dataset.nextCursor = result.meta.next_cursor || '';
+        if (moreButton) moreButton.hidden = !result.meta.next_cursor;
+    } catch (error) {
+        console.error(error);
+        alert(error.message || '視聴者の取得に失敗しました。');
+    } finally {
+        if (moreButton) moreButton.disabled = false;
+    }
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('.watchers-panel[data-video-id]').forEach(panel => {
+        const moreButton = panel.querySelector('.watchers-more');
+        if (moreButton) {
+            moreButton.addEventListener('click', () => loadWatcherPage(panel));
+        }
+
+        const searchInput = panel.querySelector('.watchers-search');
+        if (searchInput) {
+            let timer = null;
+            searchInput.addEventListener('input', () => {
+                clearTimeout(timer);
+                timer = setTimeout(() => loadWatcherPage(panel, { reset: true }), 300);
+            });
+        }
+    });
+});